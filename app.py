@@ -15,7 +15,7 @@ load_dotenv()
 from views.contents import contents_bp
 from views.subscriptions import subscriptions_bp
 from views.status import status_bp
-from database import close_db
+from database import close_db, remember_write
 
 # --- 2. Flask 앱 생성 및 설정 ---
 app = Flask(__name__)
@@ -31,6 +31,11 @@ app.register_blueprint(status_bp)
 def teardown_db(exception):
     close_db(exception)
 
+# 쓰기 요청 응답에 read-your-writes 쿠키를 붙여 다음 조회를 primary로 보냄
+@app.after_request
+def after_request_db(response):
+    return remember_write(response)
+
 # --- 3. 기본 라우트 ---
 @app.route('/')
 def index():
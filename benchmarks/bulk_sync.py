@@ -0,0 +1,220 @@
+# benchmarks/bulk_sync.py
+"""
+contents 동기화 경로의 DB 왕복(round trip) 수, 소요 시간과 WAL 기록량을 비교합니다.
+
+- legacy: 이전 synchronize_database. 기존 작품마다 UPDATE, 신규 작품마다 INSERT (executemany)
+- bulk  : ContentSyncPipeline(COPY 스테이징) + content_hash가 바뀐 행만 INSERT ... ON CONFLICT DO UPDATE
+
+시나리오마다 같은 데이터로 두 방식을 실행합니다.
+- initial: 빈 테이블에 전체 적재
+- nightly: 이미 적재된 상태에서 --change-rate 비율의 작품만 상태가 바뀐 일일 실행
+
+실제 데이터에 영향을 주지 않도록 별도 스키마(bench_bulk_sync)에 contents 테이블을 만들어 측정하고 삭제합니다.
+DATABASE_URL(또는 DB_* 환경 변수)이 필요합니다.
+
+사용법 (프로젝트 루트에서):
+    python -m benchmarks.bulk_sync
+    python -m benchmarks.bulk_sync --rows 10000 --rows 50000 --change-rate 0.05
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+from database import content_hash_sql, create_standalone_connection, get_cursor
+from crawlers.content_record import ContentRecord, WEEKDAY_ORDER, encode_weekdays
+from crawlers.pipeline import ContentSyncPipeline, SEEN_ONGOING, SEEN_HIATUS, SEEN_FINISHED, merge_staging_into_contents
+
+SCHEMA = 'bench_bulk_sync'
+SOURCE = 'naver_webtoon'
+FLAG_STATUS = {SEEN_ONGOING: '연재중', SEEN_HIATUS: '휴재', SEEN_FINISHED: '완결'}
+
+
+class _CountingCursor:
+    def __init__(self, cursor, counter):
+        self._cursor = cursor
+        self._counter = counter
+
+    def execute(self, *args, **kwargs):
+        self._counter.round_trips += 1
+        return self._cursor.execute(*args, **kwargs)
+
+    def executemany(self, query, params):
+        params = list(params)
+        # psycopg2의 executemany는 파라미터 한 세트마다 문장을 한 번씩 보냄
+        self._counter.round_trips += len(params)
+        return self._cursor.executemany(query, params)
+
+    def copy_expert(self, *args, **kwargs):
+        self._counter.round_trips += 1
+        return self._cursor.copy_expert(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class RoundTripCounter:
+    """연결을 감싸 execute/executemany/COPY/commit 왕복 수를 셉니다."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.round_trips = 0
+
+    def cursor(self, *args, **kwargs):
+        return _CountingCursor(self._conn.cursor(*args, **kwargs), self)
+
+    def commit(self):
+        self.round_trips += 1
+        self._conn.commit()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def resolve_status(flags):
+    return FLAG_STATUS[flags]
+
+
+def make_records(rows, seed, source=SOURCE):
+    rng = random.Random(seed)
+    records = []
+    for i in range(rows):
+        record = ContentRecord(
+            str(100000 + i), source, f"벤치마크 작품 {i}",
+            authors=[f"작가{i % 997}"], thumbnail_url=f"https://example.com/thumb/{i}.jpg",
+            weekdays=encode_weekdays([rng.choice(WEEKDAY_ORDER[:7])]),
+        )
+        records.append((record, rng.choice((SEEN_ONGOING, SEEN_ONGOING, SEEN_HIATUS, SEEN_FINISHED))))
+    return records
+
+
+def mutate(records, change_rate, seed):
+    """change_rate 비율의 작품을 '완결'로 바꾼 새 목록"""
+    rng = random.Random(seed)
+    return [(record, SEEN_FINISHED if rng.random() < change_rate else flag) for record, flag in records]
+
+
+def sync_legacy(conn, records):
+    cursor = get_cursor(conn)
+    cursor.execute("SELECT content_id FROM contents WHERE source = %s", (SOURCE,))
+    db_existing_ids = {row['content_id'] for row in cursor.fetchall()}
+    updates, inserts = [], []
+    for record, flag in records:
+        meta = {'common': {'authors': record.authors, 'thumbnail_url': record.thumbnail_url},
+                'attributes': {'weekdays': record.weekday_names}}
+        if record.content_id in db_existing_ids:
+            updates.append(('webtoon', record.title, resolve_status(flag), json.dumps(meta), record.content_id, SOURCE))
+        else:
+            inserts.append((record.content_id, SOURCE, 'webtoon', record.title, resolve_status(flag), json.dumps(meta)))
+    if updates:
+        cursor.executemany("UPDATE contents SET content_type=%s, title=%s, status=%s, meta=%s WHERE content_id=%s AND source=%s", updates)
+    if inserts:
+        cursor.executemany("INSERT INTO contents (content_id, source, content_type, title, status, meta) VALUES (%s, %s, %s, %s, %s, %s)", inserts)
+    conn.commit()
+    cursor.close()
+    return len(inserts), len(updates)
+
+
+async def sync_bulk(conn, records, source=SOURCE):
+    async with ContentSyncPipeline(conn, source, resolve_status) as pipeline:
+        for record, flag in records:
+            await pipeline.put(record, flag)
+        await pipeline.finish()
+    inserted, updated, _ = merge_staging_into_contents(conn, source, 'webtoon')
+    return inserted, updated
+
+
+def reset(conn, seed_records=None):
+    cursor = conn.cursor()
+    cursor.execute("TRUNCATE contents")
+    conn.commit()
+    cursor.close()
+    if seed_records:
+        asyncio.run(sync_bulk(conn, seed_records))
+
+
+def _wal_lsn(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT pg_current_wal_insert_lsn()")
+    lsn = cursor.fetchone()[0]
+    cursor.close()
+    return lsn
+
+
+def _wal_bytes_since(conn, lsn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT pg_wal_lsn_diff(pg_current_wal_insert_lsn(), %s)", (lsn,))
+    wal_bytes = int(cursor.fetchone()[0])
+    cursor.close()
+    return wal_bytes
+
+
+def measure(conn, method, records):
+    counter = RoundTripCounter(conn)
+    wal_start = _wal_lsn(conn)
+    started = time.perf_counter()
+    if method == 'legacy':
+        inserted, updated = sync_legacy(counter, records)
+    else:
+        inserted, updated = asyncio.run(sync_bulk(counter, records))
+    return {'seconds': time.perf_counter() - started, 'round_trips': counter.round_trips,
+            'wal_bytes': _wal_bytes_since(conn, wal_start), 'inserted': inserted, 'updated': updated}
+
+
+def main(args):
+    load_dotenv()
+    conn = create_standalone_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    cursor.execute(f"CREATE SCHEMA {SCHEMA}")
+    cursor.execute(f"SET search_path TO {SCHEMA}")
+    cursor.execute(f"""
+        CREATE TABLE contents (
+            content_id TEXT NOT NULL,
+            source TEXT NOT NULL,
+            content_type TEXT NOT NULL,
+            title TEXT NOT NULL,
+            status TEXT NOT NULL,
+            meta JSONB,
+            content_hash TEXT GENERATED ALWAYS AS ({content_hash_sql('content_type', 'title', 'status', 'meta')}) STORED,
+            PRIMARY KEY (content_id, source)
+        )""")
+    conn.commit()
+    cursor.close()
+
+    print(f"\n=== contents 동기화 비교 (nightly 변경 비율 {args.change_rate:.0%}) ===")
+    try:
+        for rows in args.rows or [10000, 50000, 200000]:
+            records = make_records(rows, args.seed)
+            nightly = mutate(records, args.change_rate, args.seed + 1)
+            for scenario, seed_records, today in (('initial', None, records), ('nightly', records, nightly)):
+                results = {}
+                for method in ('legacy', 'bulk'):
+                    reset(conn, seed_records)
+                    results[method] = r = measure(conn, method, today)
+                    print(f"[{rows:>6}행 {scenario:7s}] {method:6s} {r['seconds']:7.2f}초 | 왕복 {r['round_trips']:>7}회 | "
+                          f"WAL {r['wal_bytes'] / 2**20:7.1f}MiB | 신규 {r['inserted']} / 갱신 {r['updated']}")
+                legacy, bulk = results['legacy'], results['bulk']
+                print(f"[{rows:>6}행 {scenario:7s}] 왕복 {legacy['round_trips'] / max(bulk['round_trips'], 1):.0f}배 감소, "
+                      f"{legacy['seconds'] / bulk['seconds'] if bulk['seconds'] else 0:.1f}배 빠름")
+    finally:
+        conn.rollback()
+        cursor = conn.cursor()
+        cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.commit()
+        conn.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='행 단위 동기화와 COPY + ON CONFLICT 동기화의 왕복 수/시간 비교')
+    parser.add_argument('--rows', type=int, action='append', help='측정할 행 수 (여러 번 지정 가능, 기본 10000/50000/200000)')
+    parser.add_argument('--change-rate', type=float, default=0.01, help='nightly 시나리오에서 상태가 바뀌는 작품 비율')
+    parser.add_argument('--seed', type=int, default=0)
+    main(parser.parse_args())
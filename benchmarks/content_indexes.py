@@ -0,0 +1,150 @@
+# benchmarks/content_indexes.py
+"""
+/api/contents/* 목록 쿼리가 database.CONTENT_INDEXES를 사용하는지 EXPLAIN으로 확인합니다.
+
+별도 스키마(bench_content_indexes)에 합성 카탈로그(기본 200,000행)를 만들고, 인덱스 생성 전/후에
+services/catalog.py의 목록 쿼리를 EXPLAIN (ANALYZE, BUFFERS)로 실행해 플랜 노드와 실행 시간을 비교합니다.
+인덱스 생성 후에도 인덱스를 쓰지 않는 쿼리가 있으면 종료 코드 1로 끝납니다.
+DATABASE_URL(또는 DB_* 환경 변수)이 필요합니다.
+
+사용법 (프로젝트 루트에서):
+    python -m benchmarks.content_indexes
+    python -m benchmarks.content_indexes --rows 500000
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+from database import CONTENT_INDEXES, create_standalone_connection, ensure_content_indexes
+from services.catalog import ongoing_query, status_page_query
+
+SCHEMA = 'bench_content_indexes'
+
+# idx_contents_weekdays(요일 GIN 인덱스)를 확인하는 포함 검색
+WEEKDAY_QUERY = (
+    "SELECT content_id, title FROM contents "
+    "WHERE status IN ('연재중', '휴재') AND meta->'attributes'->'weekdays' @> %s::jsonb",
+    ['["mon"]']
+)
+
+
+def build_catalog(cursor, rows, seed):
+    """상태 비율(완결 65% / 연재중 30% / 휴재 5%)과 요일 분포가 실제 카탈로그와 비슷한 합성 데이터"""
+    cursor.execute("SELECT setseed(%s)", (seed,))
+    cursor.execute("""
+        CREATE TABLE contents (
+            content_id TEXT NOT NULL,
+            source TEXT NOT NULL,
+            content_type TEXT NOT NULL,
+            title TEXT NOT NULL,
+            status TEXT NOT NULL,
+            meta JSONB,
+            PRIMARY KEY (content_id, source)
+        )""")
+    cursor.execute(
+        """
+        INSERT INTO contents (content_id, source, content_type, title, status, meta)
+        SELECT i::text,
+               CASE WHEN i %% 2 = 0 THEN 'naver_webtoon' ELSE 'kakaopage' END,
+               CASE WHEN i %% 20 = 0 THEN 'novel' ELSE 'webtoon' END,
+               '작품 ' || md5(i::text),
+               CASE WHEN r < 0.65 THEN '완결' WHEN r < 0.95 THEN '연재중' ELSE '휴재' END,
+               jsonb_build_object(
+                   'common', jsonb_build_object('authors', jsonb_build_array('작가' || (i %% 5000)),
+                                                'thumbnail_url', 'https://example.com/' || i || '.jpg'),
+                   'attributes', jsonb_build_object('weekdays', CASE WHEN r < 0.65 THEN '[]'::jsonb
+                       ELSE jsonb_build_array((ARRAY['mon','tue','wed','thu','fri','sat','sun','daily'])[1 + (i %% 8)]) END))
+        FROM (SELECT i, random() AS r FROM generate_series(1, %s) AS i) AS g
+        """,
+        (rows,)
+    )
+
+
+def sample_title(cursor, status):
+    """키셋 다음 페이지 쿼리에 쓸 중간 title"""
+    cursor.execute(
+        "SELECT title FROM contents WHERE status = %s AND content_type = 'webtoon' ORDER BY title OFFSET 1000 LIMIT 1",
+        (status,)
+    )
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def _plan_nodes(plan):
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from _plan_nodes(child)
+
+
+def explain(cursor, sql, params):
+    cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}", params)
+    result = cursor.fetchone()[0][0]
+    nodes = list(_plan_nodes(result['Plan']))
+    indexes = sorted({n['Index Name'] for n in nodes if 'Index Name' in n})
+    return {
+        'nodes': " > ".join(n['Node Type'] for n in nodes),
+        'indexes': indexes,
+        'ms': result['Execution Time'],
+        'buffers': result['Plan'].get('Shared Hit Blocks', 0) + result['Plan'].get('Shared Read Blocks', 0),
+    }
+
+
+def workload(hiatus_title, completed_title):
+    return [
+        ('ongoing', ongoing_query('webtoon')),
+        ('weekday containment', WEEKDAY_QUERY),
+        ('hiatus page 1', status_page_query('휴재', 'webtoon')),
+        ('hiatus next page', status_page_query('휴재', 'webtoon', hiatus_title)),
+        ('completed page 1', status_page_query('완결', 'webtoon')),
+        ('completed next page', status_page_query('완결', 'webtoon', completed_title)),
+    ]
+
+
+def main(args):
+    load_dotenv()
+    conn = create_standalone_connection()
+    conn.autocommit = True  # VACUUM은 트랜잭션 밖에서 실행해야 함
+    cursor = conn.cursor()
+    cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    cursor.execute(f"CREATE SCHEMA {SCHEMA}")
+    cursor.execute(f"SET search_path TO {SCHEMA}, public")
+    failures = []
+    try:
+        print(f"LOG: 합성 카탈로그 {args.rows}행 생성 중...")
+        build_catalog(cursor, args.rows, args.seed)
+        cursor.execute("VACUUM ANALYZE contents")
+        queries = workload(sample_title(cursor, '휴재'), sample_title(cursor, '완결'))
+
+        before = {name: explain(cursor, sql, params) for name, (sql, params) in queries}
+        ensure_content_indexes(cursor)
+        cursor.execute("VACUUM ANALYZE contents")
+        after = {name: explain(cursor, sql, params) for name, (sql, params) in queries}
+
+        print(f"\n=== 목록 쿼리 플랜 ({args.rows}행, 인덱스 {len(CONTENT_INDEXES)}개) ===")
+        for name, _ in queries:
+            b, a = before[name], after[name]
+            used = bool(a['indexes']) and any(i in dict(CONTENT_INDEXES) for i in a['indexes'])
+            if not used:
+                failures.append(name)
+            print(f"[{name}] {b['ms']:.1f}ms ({b['buffers']} buf) -> {a['ms']:.1f}ms ({a['buffers']} buf) "
+                  f"{'OK' if used else 'NO INDEX'}")
+            print(f"    before: {b['nodes']}")
+            print(f"    after : {a['nodes']} {a['indexes']}")
+    finally:
+        cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.close()
+
+    if failures:
+        print(f"\nFATAL: 인덱스를 사용하지 않는 쿼리: {', '.join(failures)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='목록 쿼리의 인덱스 사용 여부를 EXPLAIN으로 확인')
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--seed', type=float, default=0.42)
+    main(parser.parse_args())
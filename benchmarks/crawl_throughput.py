@@ -0,0 +1,92 @@
+# benchmarks/crawl_throughput.py
+"""
+로컬 스텁 업스트림(benchmarks/stub_upstream.py)을 같은 프로세스에서 띄우고
+각 크롤러의 fetch_all_data()를 실행해 end-to-end 수집 처리량을 측정합니다.
+DB 없이(conn=None 파이프라인) 네트워크 수집 단계만 측정합니다.
+
+사용법 (프로젝트 루트에서):
+    python -m benchmarks.crawl_throughput --titles 100000 --latency-ms 80 --jitter-ms 40 --error-rate 0.01
+    python -m benchmarks.crawl_throughput --titles 20000 --latency-ms 40 --slow-rate 0.03 --slow-ms 1500 --hedge
+    python -m benchmarks.crawl_throughput --fixture benchmarks/fixtures/naver_webtoon.json --crawler naver_webtoon
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from crawlers.http_session import create_client_session
+from crawlers.naver_webtoon_crawler import NaverWebtoonCrawler
+from crawlers.kakaopage_crawler import KakaopageCrawler
+from crawlers.pipeline import ContentSyncPipeline
+from benchmarks.stub_upstream import add_stub_arguments, build_app_from_args, start_stub_server, stub_urls
+
+CRAWLERS = {
+    'naver_webtoon': NaverWebtoonCrawler,
+    'kakaopage': KakaopageCrawler,
+}
+
+
+async def measure(crawler_class, session, stats):
+    crawler = crawler_class(session=session)
+    requests_before = sum(stats.values())
+    start = time.perf_counter()
+    async with ContentSyncPipeline(None, crawler.source_name, crawler._resolve_status) as pipeline:
+        await crawler.fetch_all_data(pipeline)
+        await pipeline.finish()
+    elapsed = time.perf_counter() - start
+    counts = pipeline.status_counts()
+    requests = sum(stats.values()) - requests_before
+    return {
+        'crawler': crawler.source_name,
+        'seconds': elapsed,
+        'requests': requests,
+        'requests_per_sec': requests / elapsed if elapsed else 0.0,
+        'titles': len(pipeline.index),
+        'titles_per_sec': len(pipeline.index) / elapsed if elapsed else 0.0,
+        'ongoing': counts.get('연재중', 0),
+        'hiatus': counts.get('휴재', 0),
+        'finished': counts.get('완결', 0),
+        'http_hosts': crawler.controller.stats(),
+        'hedging': crawler.hedging.stats() if crawler.hedging.enabled else None,
+    }
+
+
+async def run(args):
+    app = build_app_from_args(args)
+    runner = await start_stub_server(app, args.host, args.port)
+    config.NAVER_API_URL, config.KAKAO_GRAPHQL_URL = stub_urls(args.host, args.port)
+    config.KAKAO_FINISHED_MAX_ITEMS = args.kakao_max_items
+    config.CRAWLER_HEDGE = args.hedge
+    results = []
+    try:
+        async with create_client_session() as session:
+            for name in args.crawler or list(CRAWLERS):
+                for _ in range(args.repeat):
+                    results.append(await measure(CRAWLERS[name], session, app['stats']))
+    finally:
+        await runner.cleanup()
+
+    print("\n=== 크롤러 수집 처리량 (스텁 업스트림) ===")
+    for r in results:
+        print(f"[{r['crawler']}] {r['seconds']:.2f}초 | 요청 {r['requests']}회 ({r['requests_per_sec']:.1f}/s) | "
+              f"작품 {r['titles']}개 ({r['titles_per_sec']:.0f}/s) | 연재 {r['ongoing']} / 휴재 {r['hiatus']} / 완결 {r['finished']}")
+        for host, host_stats in r['http_hosts'].items():
+            print(f"    {host}: limit={host_stats['limit']} rtt={host_stats['rtt_ms']}ms error_rate={host_stats['error_rate']}")
+        if r['hedging']:
+            h = r['hedging']
+            print(f"    헤징: 헤지 {h['hedges']}회 / 먼저 도착 {h['wins']}회 / 예산 초과 {h['denied']}회")
+    print("상태 코드별 요청 수:", dict(app['stats']))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='스텁 업스트림 대상 크롤러 처리량 벤치마크')
+    add_stub_arguments(parser)
+    parser.add_argument('--crawler', action='append', choices=sorted(CRAWLERS), help='측정할 크롤러 (기본: 전체)')
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--hedge', action='store_true', help='느린 요청 헤징 사용 (CRAWLER_HEDGE)')
+    parser.add_argument('--kakao-max-items', type=int, default=0, help='KAKAO_FINISHED_MAX_ITEMS 재정의 (0 = 제한 없음)')
+    asyncio.run(run(parser.parse_args()))
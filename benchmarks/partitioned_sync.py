@@ -0,0 +1,159 @@
+# benchmarks/partitioned_sync.py
+"""
+source 수가 늘어날 때 크롤러 하나의 동기화 비용을 일반 테이블(heap)과 source LIST 파티션 테이블로 비교합니다.
+
+source를 --sources 단계(기본 1/2/4/8개)까지 --rows-per-source행씩 적재해 가며, 단계마다 첫 번째 크롤러 기준으로
+- 상태 읽기: 크롤러 시작 시의 완결 작품 조회 (SELECT content_id FROM contents WHERE source = ... AND status = '완결')
+- 스테이징/반영: --change-rate 비율만 바뀐 일일 실행의 COPY 스테이징과 INSERT ... ON CONFLICT 반영
+  (스테이징은 source 수와 무관한 Python 쪽 비용이므로 반영 시간을 따로 비교)
+- VACUUM: heap은 contents 전체, 파티션은 해당 source 파티션만
+의 소요 시간을 측정합니다. 두 테이블 모두 database.CONTENT_INDEXES를 갖습니다.
+
+실제 데이터에 영향을 주지 않도록 별도 스키마(bench_partitioned_sync)에서 측정하고 삭제합니다.
+DATABASE_URL(또는 DB_* 환경 변수)이 필요합니다.
+
+사용법 (프로젝트 루트에서):
+    python -m benchmarks.partitioned_sync
+    python -m benchmarks.partitioned_sync --rows-per-source 50000 --sources 1 --sources 4 --sources 16
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+from database import (
+    content_hash_sql, create_contents_table, create_standalone_connection, ensure_content_indexes,
+    source_partition_name,
+)
+from crawlers.pipeline import ContentSyncPipeline, merge_staging_into_contents
+from benchmarks.bulk_sync import make_records, mutate, resolve_status, sync_bulk
+
+SCHEMA = 'bench_partitioned_sync'
+LAYOUTS = ('heap', 'partitioned')
+
+
+def bench_source(index):
+    return f"bench_source_{index}"
+
+
+def create_table(cursor, layout):
+    cursor.execute("DROP TABLE IF EXISTS contents CASCADE")
+    if layout == 'partitioned':
+        create_contents_table(cursor)
+    else:
+        cursor.execute(f"""
+            CREATE TABLE contents (
+                content_id TEXT NOT NULL,
+                source TEXT NOT NULL,
+                content_type TEXT NOT NULL,
+                title TEXT NOT NULL,
+                status TEXT NOT NULL,
+                meta JSONB,
+                content_hash TEXT GENERATED ALWAYS AS ({content_hash_sql('content_type', 'title', 'status', 'meta')}) STORED,
+                PRIMARY KEY (content_id, source)
+            )""")
+    ensure_content_indexes(cursor)
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def _execute_autocommit(conn, sql):
+    conn.autocommit = True
+    try:
+        cursor = conn.cursor()
+        cursor.execute(sql)
+        cursor.close()
+    finally:
+        conn.autocommit = False
+
+
+def read_state(conn, source):
+    cursor = conn.cursor()
+    cursor.execute("SELECT content_id FROM contents WHERE source = %s AND status = '완결'", (source,))
+    count = len(cursor.fetchall())
+    conn.commit()
+    cursor.close()
+    return count
+
+
+async def stage(conn, records, source):
+    async with ContentSyncPipeline(conn, source, resolve_status) as pipeline:
+        for record, flag in records:
+            await pipeline.put(record, flag)
+        await pipeline.finish()
+
+
+def run_layout(conn, layout, args):
+    cursor = conn.cursor()
+    create_table(cursor, layout)
+    conn.commit()
+    cursor.close()
+
+    target = bench_source(0)
+    base_records = make_records(args.rows_per_source, args.seed, target)
+    loaded, results = 0, []
+    for step, sources in enumerate(sorted(set(args.sources or [1, 2, 4, 8]))):
+        for index in range(loaded, sources):
+            source = bench_source(index)
+            records = base_records if index == 0 else make_records(args.rows_per_source, args.seed + index, source)
+            asyncio.run(sync_bulk(conn, records, source))
+        loaded = sources
+        _execute_autocommit(conn, "VACUUM ANALYZE contents")
+
+        read_seconds, _ = _timed(lambda: read_state(conn, target))
+        nightly = mutate(base_records, args.change_rate, args.seed + 1000 + step)
+        stage_seconds, _ = _timed(lambda: asyncio.run(stage(conn, nightly, target)))
+        merge_seconds, (inserted, updated, _) = _timed(lambda: merge_staging_into_contents(conn, target, 'webtoon'))
+        vacuum_table = source_partition_name(target) if layout == 'partitioned' else 'contents'
+        vacuum_seconds, _ = _timed(lambda: _execute_autocommit(conn, f"VACUUM {vacuum_table}"))
+        results.append({'sources': sources, 'rows': sources * args.rows_per_source, 'read': read_seconds,
+                        'stage': stage_seconds, 'merge': merge_seconds, 'vacuum': vacuum_seconds})
+        print(f"[{layout:11s} source {sources:>2}개 / {sources * args.rows_per_source:>7}행] "
+              f"상태 읽기 {read_seconds * 1000:7.1f}ms | 스테이징 {stage_seconds:5.2f}초 | "
+              f"반영 {merge_seconds * 1000:7.1f}ms (갱신 {updated + inserted}) | "
+              f"VACUUM {vacuum_seconds:6.2f}초")
+    return results
+
+
+def main(args):
+    load_dotenv()
+    conn = create_standalone_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    cursor.execute(f"CREATE SCHEMA {SCHEMA}")
+    cursor.execute(f"SET search_path TO {SCHEMA}")
+    conn.commit()
+    cursor.close()
+
+    print(f"\n=== 크롤러 1개의 동기화 비용 (source당 {args.rows_per_source}행, 변경 비율 {args.change_rate:.0%}) ===")
+    try:
+        results = {layout: run_layout(conn, layout, args) for layout in LAYOUTS}
+        print()
+        for heap, part in zip(results['heap'], results['partitioned']):
+            print(f"[source {heap['sources']:>2}개] 상태 읽기 {heap['read'] / max(part['read'], 1e-9):5.1f}배, "
+                  f"반영 {heap['merge'] / max(part['merge'], 1e-9):5.1f}배, "
+                  f"VACUUM {heap['vacuum'] / max(part['vacuum'], 1e-9):5.1f}배 (heap 대비 파티션)")
+    finally:
+        conn.rollback()
+        cursor = conn.cursor()
+        cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.commit()
+        conn.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='source 수 증가에 따른 일반 테이블/파티션 테이블의 크롤러별 동기화 비용 비교')
+    parser.add_argument('--rows-per-source', type=int, default=20000)
+    parser.add_argument('--sources', type=int, action='append', help='측정할 source 수 (여러 번 지정 가능, 기본 1/2/4/8)')
+    parser.add_argument('--change-rate', type=float, default=0.01, help='일일 실행에서 상태가 바뀌는 작품 비율')
+    parser.add_argument('--seed', type=int, default=0)
+    main(parser.parse_args())
@@ -0,0 +1,129 @@
+# benchmarks/record_memory.py
+"""
+합성(또는 픽스처 기반) 카탈로그로 크롤러가 수집 중 메모리에 유지하는 데이터 크기를 비교합니다.
+
+- dict: 이전 방식. 업스트림 응답 dict 전체를 all_content/ongoing/hiatus/finished 맵에 보관하고
+        normalized_weekdays를 항목에 직접 추가
+- record: crawlers.content_record.ContentRecord (__slots__ + 요일 비트마스크)
+
+각 방식은 JSON 응답을 새로 파싱한 객체에서 시작하며, 페이지 응답은 처리 후 버려집니다.
+tracemalloc으로 구성 후 남아 있는 메모리를 측정합니다.
+
+사용법 (프로젝트 루트에서):
+    python -m benchmarks.record_memory --titles 100000
+    python -m benchmarks.record_memory --fixture benchmarks/fixtures/kakaopage.json --titles 50000
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from crawlers.naver_webtoon_crawler import NaverWebtoonCrawler
+from crawlers.kakaopage_crawler import KakaopageCrawler, DAY_TAB_UIDS
+from benchmarks.stub_upstream import StubCatalog
+
+PAGE_SIZE = 100
+
+
+def _pages(listing):
+    """listing을 페이지 단위 JSON으로 직렬화했다가 파싱해, 매번 새 응답 객체를 만듭니다."""
+    for start in range(0, len(listing), PAGE_SIZE):
+        yield json.loads(json.dumps(listing[start:start + PAGE_SIZE], ensure_ascii=False))
+
+
+def _listings(catalog, source):
+    """(요일 키, 항목 리스트) 목록. 완결 목록의 요일 키는 None"""
+    if source == 'naver_webtoon':
+        for api_day, weekday in config.WEEKDAYS.items():
+            yield weekday, catalog.naver.get(f"weekday:{api_day}", [])
+        yield None, catalog.naver.get('finished', [])
+    else:
+        for day_key, uid in DAY_TAB_UIDS.items():
+            yield day_key, catalog.kakao.get(f"day:{uid}", [])
+        yield None, catalog.kakao.get('finished', [])
+
+
+def _item_id(source, item):
+    return str(item['titleId'] if source == 'naver_webtoon' else item.get('seriesId'))
+
+
+def _is_hiatus(source, item):
+    if source == 'naver_webtoon':
+        return item.get('rest', False)
+    return '휴재' in (item.get('statusBadge') or '')
+
+
+def build_dict_maps(catalog, source):
+    maps = {'all_content_today': {}, 'ongoing_today': {}, 'hiatus_today': {}, 'finished_today': {}}
+    for weekday, listing in _listings(catalog, source):
+        for page in _pages(listing):
+            for item in page:
+                content_id = _item_id(source, item)
+                if content_id not in maps['all_content_today']:
+                    maps['all_content_today'][content_id] = item
+                    item['normalized_weekdays'] = set()
+                if weekday is None:
+                    maps['finished_today'][content_id] = item
+                    continue
+                maps['all_content_today'][content_id]['normalized_weekdays'].add(weekday)
+                target = 'hiatus_today' if _is_hiatus(source, item) else 'ongoing_today'
+                maps[target][content_id] = item
+    for content in maps['all_content_today'].values():
+        content['normalized_weekdays'] = list(content['normalized_weekdays'])
+    return maps
+
+
+def build_records(catalog, source):
+    crawler = NaverWebtoonCrawler() if source == 'naver_webtoon' else KakaopageCrawler()
+    records = {}
+    for weekday, listing in _listings(catalog, source):
+        for page in _pages(listing):
+            for item in page:
+                record = crawler._normalize(item, weekday)
+                existing = records.get(record.content_id)
+                if existing is None:
+                    records[record.content_id] = record
+                else:
+                    existing.weekdays |= record.weekdays
+    return records
+
+
+def measure(build, catalog, source):
+    gc.collect()
+    tracemalloc.start()
+    result = build(catalog, source)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    titles = len(result['all_content_today']) if isinstance(result, dict) and 'all_content_today' in result else len(result)
+    del result
+    return {'titles': titles, 'retained': current, 'peak': peak}
+
+
+def main(args):
+    templates = StubCatalog.from_fixtures(args.fixture) if args.fixture else None
+    catalog = StubCatalog.synthetic(args.titles, templates=templates, seed=args.seed)
+
+    print(f"\n=== 수집 데이터 메모리 비교 (소스별 {args.titles}개 작품) ===")
+    for source in args.source or ['naver_webtoon', 'kakaopage']:
+        dict_result = measure(build_dict_maps, catalog, source)
+        record_result = measure(build_records, catalog, source)
+        ratio = dict_result['retained'] / record_result['retained'] if record_result['retained'] else 0.0
+        for name, r in (('dict', dict_result), ('record', record_result)):
+            print(f"[{source}] {name:6s} 작품 {r['titles']}개 | 유지 {r['retained'] / 2**20:.1f}MiB "
+                  f"({r['retained'] / max(r['titles'], 1):.0f}B/작품) | 최대 {r['peak'] / 2**20:.1f}MiB")
+        print(f"[{source}] ContentRecord가 {ratio:.1f}배 작음")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='dict 기반 수집 맵과 ContentRecord의 메모리 사용량 비교')
+    parser.add_argument('--titles', type=int, default=100000, help='소스별 합성 작품 수')
+    parser.add_argument('--fixture', action='append', default=[], help='항목 템플릿으로 사용할 픽스처 파일')
+    parser.add_argument('--source', action='append', choices=['naver_webtoon', 'kakaopage'])
+    parser.add_argument('--seed', type=int, default=0)
+    main(parser.parse_args())
@@ -0,0 +1,100 @@
+# benchmarks/recorder.py
+"""
+실제 네이버 웹툰 titlelist / 카카오페이지 GraphQL 응답을 픽스처 파일로 기록합니다.
+기록된 픽스처는 benchmarks/stub_upstream.py가 그대로 재생(replay)하거나,
+합성 카탈로그를 만들 때 항목 템플릿으로 사용합니다.
+
+사용법 (프로젝트 루트에서):
+    python -m benchmarks.recorder --source naver_webtoon --max-pages 3
+    python -m benchmarks.recorder --source kakaopage --max-pages 3 --out benchmarks/fixtures/kakaopage.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from crawlers.http_session import create_client_session
+from crawlers.naver_webtoon_crawler import NaverWebtoonCrawler
+from crawlers.kakaopage_crawler import KakaopageCrawler, DAY_TAB_UIDS
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+async def _record_listing(fetch_page, max_pages):
+    items = []
+    for page in range(1, max_pages + 1):
+        page_items = await fetch_page(page)
+        if not page_items:
+            break
+        items.extend(page_items)
+    return items
+
+
+async def record_naver(session, max_pages):
+    crawler = NaverWebtoonCrawler(session=session)
+    listings = {}
+    for api_day in config.WEEKDAYS:
+        url = f"{config.NAVER_API_URL}/weekday?week={api_day}&page={{page}}&pageSize=100"
+        listings[f"weekday:{api_day}"] = await _record_listing(
+            lambda page, url=url: crawler._fetch_from_api(session, url.format(page=page)), max_pages)
+        print(f"LOG: [Recorder] weekday:{api_day} {len(listings[f'weekday:{api_day}'])}개 기록")
+    url = f"{config.NAVER_API_URL}/finished?order=UPDATE&page={{page}}&pageSize=100"
+    listings['finished'] = await _record_listing(
+        lambda page: crawler._fetch_from_api(session, url.format(page=page)), max_pages)
+    print(f"LOG: [Recorder] finished {len(listings['finished'])}개 기록")
+    return listings
+
+
+async def record_kakaopage(session, max_pages):
+    crawler = KakaopageCrawler(session=session)
+    listings = {}
+
+    async def items_only(**kwargs):
+        items, _, _ = await crawler._fetch_page_data(session, **kwargs)
+        return items
+
+    for day_key, uid in DAY_TAB_UIDS.items():
+        listings[f"day:{uid}"] = await _record_listing(
+            lambda page, uid=uid: items_only(page=page, day_tab_uid=uid), max_pages)
+        print(f"LOG: [Recorder] day:{uid} ({day_key}) {len(listings[f'day:{uid}'])}개 기록")
+    listings['finished'] = await _record_listing(
+        lambda page: items_only(page=page, is_complete=True), max_pages)
+    print(f"LOG: [Recorder] finished {len(listings['finished'])}개 기록")
+    return listings
+
+
+RECORDERS = {
+    'naver_webtoon': record_naver,
+    'kakaopage': record_kakaopage,
+}
+
+
+async def record(source, max_pages, out_path):
+    async with create_client_session() as session:
+        listings = await RECORDERS[source](session, max_pages)
+    fixture = {
+        'source': source,
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'page_size': 100,
+        'listings': listings,
+    }
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump(fixture, f, ensure_ascii=False)
+    print(f"LOG: [Recorder] 픽스처 저장 완료: {out_path}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='실제 업스트림 응답을 픽스처로 기록합니다.')
+    parser.add_argument('--source', choices=sorted(RECORDERS), required=True)
+    parser.add_argument('--max-pages', type=int, default=3, help='목록(요일/완결)별 최대 기록 페이지 수')
+    parser.add_argument('--out', help='저장 경로 (기본: benchmarks/fixtures/<source>.json)')
+    args = parser.parse_args()
+
+    out_path = args.out or os.path.join(FIXTURE_DIR, f"{args.source}.json")
+    asyncio.run(record(args.source, args.max_pages, out_path))
@@ -0,0 +1,224 @@
+# benchmarks/stub_upstream.py
+"""
+네이버 웹툰 titlelist API와 카카오페이지 GraphQL을 흉내 내는 로컬 aiohttp 스텁 서버입니다.
+기록된 픽스처(benchmarks/recorder.py)를 재생하거나, 합성 카탈로그를 10만 개 이상으로 확장해
+실제 사이트에 접속하지 않고 크롤러 처리량을 측정/회귀 테스트할 수 있습니다.
+
+사용법 (프로젝트 루트에서):
+    python -m benchmarks.stub_upstream --titles 100000 --latency-ms 50 --jitter-ms 20 --error-rate 0.01
+
+    # 다른 터미널에서 크롤러가 스텁을 바라보도록 설정
+    export NAVER_API_URL=http://127.0.0.1:8089/api/webtoon/titlelist
+    export KAKAO_GRAPHQL_URL=http://127.0.0.1:8089/graphql
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+from collections import Counter
+
+from aiohttp import web
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+NAVER_WEEKDAYS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun', 'daily', 'dailyPlus']
+KAKAO_DAY_UIDS = ['1', '2', '3', '4', '5', '6', '7']
+KAKAO_HIATUS_UID = '8'
+
+DEFAULT_NAVER_TEMPLATE = {'titleId': 0, 'titleName': '', 'author': '합성 작가', 'rest': False,
+                          'thumbnailUrl': 'https://example.invalid/thumb.jpg', 'up': False, 'adult': False}
+DEFAULT_KAKAO_TEMPLATE = {'id': '', 'seriesId': 0, 'title': '', 'thumbnail': 'https://example.invalid/thumb.jpg',
+                          'badgeList': [], 'statusBadge': None, 'ageGrade': 'All',
+                          'authors': [{'name': '합성 작가', 'type': 'AUTHOR'}]}
+
+
+class StubCatalog:
+    """소스별 목록(listing) 이름 -> 항목 리스트. 페이지 단위로 잘라서 응답합니다."""
+
+    def __init__(self, naver_listings=None, kakao_listings=None):
+        self.naver = naver_listings or {}
+        self.kakao = kakao_listings or {}
+
+    @classmethod
+    def from_fixtures(cls, paths):
+        catalog = cls()
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                fixture = json.load(f)
+            if fixture['source'] == 'naver_webtoon':
+                catalog.naver.update(fixture['listings'])
+            elif fixture['source'] == 'kakaopage':
+                catalog.kakao.update(fixture['listings'])
+        return catalog
+
+    @classmethod
+    def synthetic(cls, titles, templates=None, seed=0, ongoing_ratio=0.3, rest_ratio=0.05):
+        """
+        소스별로 `titles`개의 작품을 가진 합성 카탈로그를 만듭니다.
+        templates(픽스처 카탈로그)가 주어지면 실제 응답 항목을 복제해 필드 구성을 그대로 유지합니다.
+        """
+        rng = random.Random(seed)
+        naver_templates = [item for items in (templates.naver.values() if templates else []) for item in items] or [DEFAULT_NAVER_TEMPLATE]
+        kakao_templates = [item for items in (templates.kakao.values() if templates else []) for item in items] or [DEFAULT_KAKAO_TEMPLATE]
+
+        naver = {f"weekday:{day}": [] for day in NAVER_WEEKDAYS}
+        naver['finished'] = []
+        kakao = {f"day:{uid}": [] for uid in KAKAO_DAY_UIDS + [KAKAO_HIATUS_UID]}
+        kakao['finished'] = []
+
+        for i in range(titles):
+            is_ongoing = rng.random() < ongoing_ratio
+            is_rest = rng.random() < rest_ratio
+
+            webtoon = dict(rng.choice(naver_templates))
+            webtoon.update({'titleId': 100000 + i, 'titleName': f"합성 웹툰 {i}", 'rest': is_rest})
+            if is_ongoing:
+                naver[f"weekday:{rng.choice(NAVER_WEEKDAYS)}"].append(webtoon)
+            else:
+                naver['finished'].append(webtoon)
+
+            series = dict(rng.choice(kakao_templates))
+            series.update({'id': str(5000000 + i), 'seriesId': 5000000 + i, 'title': f"합성 작품 {i}",
+                           'statusBadge': 'BadgeRestStatic 휴재' if is_rest else None})
+            if is_ongoing:
+                uid = KAKAO_HIATUS_UID if is_rest else rng.choice(KAKAO_DAY_UIDS)
+                kakao[f"day:{uid}"].append(series)
+            else:
+                kakao['finished'].append(series)
+
+        return cls(naver, kakao)
+
+
+def _page(items, page, size, max_pages):
+    if max_pages and page > max_pages:
+        return []
+    start = (page - 1) * size
+    return items[start:start + size]
+
+
+def make_app(catalog, latency_ms=0, jitter_ms=0, error_rate=0.0, throttle_rate=0.0, max_pages=None, seed=None,
+             slow_rate=0.0, slow_ms=0):
+    """
+    스텁 aiohttp 애플리케이션을 생성합니다.
+    - latency_ms/jitter_ms: 요청마다 latency ± jitter(ms)만큼 지연
+    - error_rate: 이 확률로 500 응답
+    - throttle_rate: 이 확률로 429 + Retry-After: 1 응답
+    - max_pages: 목록별로 응답할 최대 페이지 수 (이후 페이지는 빈 목록)
+    - slow_rate/slow_ms: 이 확률로 slow_ms(ms)만큼 추가 지연 (꼬리 지연 재현, 헤징 측정용)
+    app['stats']에 경로/상태 코드별 요청 수를 기록합니다.
+    """
+    rng = random.Random(seed)
+    stats = Counter()
+
+    @web.middleware
+    async def chaos(request, handler):
+        delay = (latency_ms + rng.uniform(-jitter_ms, jitter_ms)) / 1000
+        if rng.random() < slow_rate:
+            delay += slow_ms / 1000
+        if delay > 0:
+            await asyncio.sleep(delay)
+        roll = rng.random()
+        if roll < throttle_rate:
+            stats[(request.path, 429)] += 1
+            return web.json_response({'error': 'throttled'}, status=429, headers={'Retry-After': '1'})
+        if roll < throttle_rate + error_rate:
+            stats[(request.path, 500)] += 1
+            return web.json_response({'error': 'injected'}, status=500)
+        response = await handler(request)
+        stats[(request.path, response.status)] += 1
+        return response
+
+    def naver_response(listing, request):
+        page = int(request.query.get('page', 1))
+        size = int(request.query.get('pageSize', 100))
+        items = catalog.naver.get(listing, [])
+        return web.json_response({
+            'titleList': _page(items, page, size, max_pages),
+            'pageInfo': {'totalRows': len(items), 'page': page, 'pageSize': size},
+        })
+
+    async def naver_weekday(request):
+        return naver_response(f"weekday:{request.query.get('week')}", request)
+
+    async def naver_finished(request):
+        return naver_response('finished', request)
+
+    async def kakao_graphql(request):
+        body = await request.json()
+        variables = body.get('variables', {})
+        if 'sectionId' in variables:
+            param = variables.get('param', {})
+            listing, page, size = 'finished', param.get('page', 1), param.get('size', 100)
+        else:
+            query_input = variables.get('queryInput', {})
+            listing = f"day:{query_input.get('dayTabUid')}"
+            page, size = query_input.get('page', 1), query_input.get('size', 100)
+
+        items = catalog.kakao.get(listing, [])
+        page_items = _page(items, page, size, max_pages)
+        total = len(items) if not max_pages else min(len(items), max_pages * size)
+        section = {'isEnd': page * size >= total, 'totalCount': total, 'items': [{'items': page_items}]}
+        if listing == 'finished':
+            data = {'staticLandingGenreSection': section}
+        else:
+            data = {'staticLandingDayOfWeekLayout': {'sections': [section]}}
+        return web.json_response({'data': data}, content_type='application/graphql+json')
+
+    app = web.Application(middlewares=[chaos])
+    app['stats'] = stats
+    app.router.add_get('/api/webtoon/titlelist/weekday', naver_weekday)
+    app.router.add_get('/api/webtoon/titlelist/finished', naver_finished)
+    app.router.add_post('/graphql', kakao_graphql)
+    return app
+
+
+async def start_stub_server(app, host='127.0.0.1', port=8089):
+    """같은 이벤트 루프 안에서 스텁 서버를 띄웁니다. 반환된 runner.cleanup()으로 종료합니다."""
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+def stub_urls(host, port):
+    """크롤러가 스텁을 바라보게 할 (NAVER_API_URL, KAKAO_GRAPHQL_URL)."""
+    base = f"http://{host}:{port}"
+    return f"{base}/api/webtoon/titlelist", f"{base}/graphql"
+
+
+def add_stub_arguments(parser):
+    parser.add_argument('--fixture', action='append', default=[], help='재생할 픽스처 파일 (여러 번 지정 가능)')
+    parser.add_argument('--titles', type=int, default=0, help='소스별 합성 작품 수 (0이면 픽스처를 그대로 재생)')
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--max-pages', type=int, default=None)
+    parser.add_argument('--slow-rate', type=float, default=0.0, help='꼬리 지연을 줄 요청 비율')
+    parser.add_argument('--slow-ms', type=float, default=0, help='꼬리 지연 요청에 더할 지연(ms)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+
+
+def build_app_from_args(args):
+    templates = StubCatalog.from_fixtures(args.fixture) if args.fixture else None
+    if args.titles or templates is None:
+        catalog = StubCatalog.synthetic(args.titles or 1000, templates=templates, seed=args.seed)
+    else:
+        catalog = templates
+    return make_app(catalog, args.latency_ms, args.jitter_ms, args.error_rate,
+                    args.throttle_rate, args.max_pages, args.seed, args.slow_rate, args.slow_ms)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='크롤러 벤치마크용 로컬 스텁 업스트림 서버')
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    naver_url, kakao_url = stub_urls(args.host, args.port)
+    print(f"NAVER_API_URL={naver_url}")
+    print(f"KAKAO_GRAPHQL_URL={kakao_url}")
+    web.run_app(build_app_from_args(args), host=args.host, port=args.port)
@@ -5,9 +5,107 @@ import os
 CRAWLER_HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36'
 }
+# 크롤러 실행 방식: 'async'(하나의 이벤트 루프에서 동시 실행) 또는 'process'(크롤러별 독립 워커 프로세스)
+CRAWLER_EXECUTION_MODE = os.getenv('CRAWLER_EXECUTION_MODE', 'async').lower()
+CRAWLER_WORKERS = int(os.getenv('CRAWLER_WORKERS', 0))  # 0이면 min(크롤러 수, CPU 코어 수)
+# 블로킹 DB/알림 단계를 실행할 스레드 풀 크기
+CRAWLER_DB_THREADS = int(os.getenv('CRAWLER_DB_THREADS', 4))
+
+# 페이지네이션 수집 시 동시에 요청할 최대 페이지 수
+CRAWLER_PAGE_WINDOW = int(os.getenv('CRAWLER_PAGE_WINDOW', 8))
+
+# 수집-DB 스트리밍 파이프라인: 스테이징 테이블에 한 번에 기록할 행 수 / 대기열 최대 크기
+CRAWLER_SYNC_BATCH_SIZE = int(os.getenv('CRAWLER_SYNC_BATCH_SIZE', 1000))
+CRAWLER_SYNC_QUEUE_SIZE = int(os.getenv('CRAWLER_SYNC_QUEUE_SIZE', 5000))
+
+# 호스트별 적응형 동시성 제어 (AIMD)
+CRAWLER_INITIAL_CONCURRENCY = int(os.getenv('CRAWLER_INITIAL_CONCURRENCY', 4))
+CRAWLER_MIN_CONCURRENCY = int(os.getenv('CRAWLER_MIN_CONCURRENCY', 1))
+CRAWLER_MAX_CONCURRENCY = int(os.getenv('CRAWLER_MAX_CONCURRENCY', 32))
+CRAWLER_LATENCY_TOLERANCE = float(os.getenv('CRAWLER_LATENCY_TOLERANCE', 2.0))   # 최저 RTT 대비 허용 배수
+CRAWLER_ERROR_RATE_THRESHOLD = float(os.getenv('CRAWLER_ERROR_RATE_THRESHOLD', 0.05))
+CRAWLER_BACKOFF_FACTOR = float(os.getenv('CRAWLER_BACKOFF_FACTOR', 0.5))
+CRAWLER_MAX_RETRY_AFTER = float(os.getenv('CRAWLER_MAX_RETRY_AFTER', 120))      # Retry-After 최대 대기(초)
+
+# '완결' 목록 증분 수집 (crawlers/watermark.py)
+CRAWLER_INCREMENTAL = os.getenv('CRAWLER_INCREMENTAL', 'true').lower() == 'true'
+CRAWLER_FORCE_FULL_SWEEP = os.getenv('CRAWLER_FORCE_FULL_SWEEP', 'false').lower() == 'true'
+CRAWLER_INCREMENTAL_STOP_AFTER_PAGES = int(os.getenv('CRAWLER_INCREMENTAL_STOP_AFTER_PAGES', 3))  # 이미 아는 '완결' 페이지가 N번 연속이면 중단
+CRAWLER_FULL_SWEEP_INTERVAL_DAYS = int(os.getenv('CRAWLER_FULL_SWEEP_INTERVAL_DAYS', 7))          # 전체 수집(안전망) 주기
+
+# 페이지 단위 체크포인트: 실패/중단된 수집을 다음 실행에서 빠진 페이지만 이어서 수집
+CRAWLER_CHECKPOINT = os.getenv('CRAWLER_CHECKPOINT', 'true').lower() == 'true'
+CRAWLER_CHECKPOINT_MAX_AGE_HOURS = int(os.getenv('CRAWLER_CHECKPOINT_MAX_AGE_HOURS', 12))  # 이보다 오래된 미완료 실행은 버리고 새로 수집
+
+# 여러 러너에 나눠서 수집 (crawlers/work_queue.py)
+# CRAWLER_ROLE: all(기본, 한 작업에서 전부 실행) | plan(작업 단위 등록) | worker(작업 단위 수집) | reduce(결과 취합/동기화)
+CRAWLER_ROLE = os.getenv('CRAWLER_ROLE', 'all').lower()
+CRAWLER_BATCH_ID = int(os.getenv('CRAWLER_BATCH_ID', 0))                     # 0이면 가장 최근의 미완료 배치
+CRAWLER_WORK_UNIT_PAGES = int(os.getenv('CRAWLER_WORK_UNIT_PAGES', 10))      # '완결' 목록 작업 단위 하나의 페이지 수
+CRAWLER_WORK_LEASE_SECONDS = int(os.getenv('CRAWLER_WORK_LEASE_SECONDS', 120))
+CRAWLER_WORK_MAX_ATTEMPTS = int(os.getenv('CRAWLER_WORK_MAX_ATTEMPTS', 3))
+CRAWLER_WORKER_CONCURRENCY = int(os.getenv('CRAWLER_WORKER_CONCURRENCY', 4))  # 워커 하나가 동시에 처리할 작업 단위 수
+CRAWLER_REDUCE_TIMEOUT_SECONDS = int(os.getenv('CRAWLER_REDUCE_TIMEOUT_SECONDS', 3600))
+
+# 크롤러 공용 HTTP 연결 풀 (crawlers/http_session.py)
+HTTP_POOL_LIMIT = int(os.getenv('HTTP_POOL_LIMIT', 100))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', 32))
+HTTP_DNS_CACHE_TTL = int(os.getenv('HTTP_DNS_CACHE_TTL', 600))          # 초
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', 30))  # 초
+HTTP_TOTAL_TIMEOUT = float(os.getenv('HTTP_TOTAL_TIMEOUT', 60))
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 10))
+HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 30))
+
+# 느린 요청 헤징 (crawlers/hedging.py): 관측 지연 분위수를 넘긴 요청은 한 번 더 보내고 먼저 온 응답을 사용
+CRAWLER_HEDGE = os.getenv('CRAWLER_HEDGE', 'false').lower() == 'true'
+CRAWLER_HEDGE_PERCENTILE = float(os.getenv('CRAWLER_HEDGE_PERCENTILE', 95))
+CRAWLER_HEDGE_MIN_SAMPLES = int(os.getenv('CRAWLER_HEDGE_MIN_SAMPLES', 20))       # 이보다 표본이 적으면 고정 지연 사용
+CRAWLER_HEDGE_DELAY_MS = float(os.getenv('CRAWLER_HEDGE_DELAY_MS', 2000))         # 고정 지연 (표본 부족 시)
+CRAWLER_HEDGE_MIN_DELAY_MS = float(os.getenv('CRAWLER_HEDGE_MIN_DELAY_MS', 100))  # 분위수 기반 지연의 하한
+CRAWLER_HEDGE_MAX_RATIO = float(os.getenv('CRAWLER_HEDGE_MAX_RATIO', 0.05))       # 전체 요청 대비 헤지 요청 비율 상한
+
+# 크롤러 실행 이력 (crawlers/run_history.py): 월 단위 파티션으로 보관하고 일별 집계로 추세를 비교
+CRAWL_HISTORY_RETENTION_MONTHS = int(os.getenv('CRAWL_HISTORY_RETENTION_MONTHS', 12))  # 이보다 오래된 월 파티션은 삭제
+CRAWL_TREND_BASELINE_DAYS = int(os.getenv('CRAWL_TREND_BASELINE_DAYS', 14))            # 기준선으로 쓸 직전 일수
+CRAWL_TREND_MIN_DAYS = int(os.getenv('CRAWL_TREND_MIN_DAYS', 3))                       # 기준선 계산에 필요한 최소 일수
+CRAWL_TREND_SLOW_RATIO = float(os.getenv('CRAWL_TREND_SLOW_RATIO', 1.5))               # 기준선 대비 이 배수보다 느리면 표시
+CRAWL_TREND_DAYS_SHOWN = int(os.getenv('CRAWL_TREND_DAYS_SHOWN', 7))                   # 보고서에 보여줄 일별 집계 일수
+
+# --- Database (Flask API 연결 풀, database.py) ---
+DB_POOL_ENABLED = os.getenv('DB_POOL_ENABLED', 'true').lower() == 'true'
+DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', 1))
+DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', 10))                            # 프로세스(gunicorn 워커)당 최대 연결 수
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))                  # 연결이 모두 사용 중일 때 기다릴 시간(초)
+DB_POOL_MAX_LIFETIME = float(os.getenv('DB_POOL_MAX_LIFETIME', 1800))      # 이보다 오래된 연결은 폐기(초, 0 = 제한 없음)
+DB_POOL_HEALTHCHECK_IDLE = float(os.getenv('DB_POOL_HEALTHCHECK_IDLE', 30))  # 이만큼 쉬었던 연결은 꺼낼 때 SELECT 1로 확인(초)
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 0))    # 0 = 서버 기본값
+# 읽기 복제본 (쉼표로 구분한 DSN 목록). /api/contents/*, /api/status 조회를 라운드 로빈으로 분산
+DB_REPLICA_URLS = [url.strip() for url in os.getenv('DB_REPLICA_URLS', '').split(',') if url.strip()]
+DB_REPLICA_RETRY_SECONDS = float(os.getenv('DB_REPLICA_RETRY_SECONDS', 30))        # 장애 복제본을 제외하는 시간
+DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv('DB_REPLICA_MAX_LAG_SECONDS', 0))     # 0 = 복제 지연 확인 안 함
+DB_REPLICA_LAG_CHECK_SECONDS = float(os.getenv('DB_REPLICA_LAG_CHECK_SECONDS', 5))
+DB_READ_PRIMARY_AFTER_WRITE_SECONDS = int(os.getenv('DB_READ_PRIMARY_AFTER_WRITE_SECONDS', 5))  # 쓰기 후 읽기를 primary로
+# PgBouncer(transaction pooling) 뒤에서 실행: 세션 상태(시작 파라미터 options 등)를 쓰지 않음
+DB_PGBOUNCER = os.getenv('DB_PGBOUNCER', 'false').lower() == 'true'
+
+# --- API 응답 캐시 (services/response_cache.py) ---
+# /api/contents 목록 응답을 워커 프로세스 메모리에 (엔드포인트, 파라미터, 카탈로그 세대) 키로 보관.
+# 크롤러가 동기화 후 catalog_generation을 올리면 이전 세대 항목은 더 이상 쓰이지 않고 정리됨
+API_CACHE_ENABLED = os.getenv('API_CACHE_ENABLED', 'true').lower() == 'true'
+API_CACHE_MAX_ENTRIES = int(os.getenv('API_CACHE_MAX_ENTRIES', 512))
+API_CACHE_MAX_BYTES = int(os.getenv('API_CACHE_MAX_BYTES', 64 * 2**20))
+API_CACHE_GENERATION_CHECK_SECONDS = float(os.getenv('API_CACHE_GENERATION_CHECK_SECONDS', 1.0))  # 세대 번호를 DB에서 다시 읽는 간격 (0이면 매 요청)
+
+# --- 카탈로그 스냅샷 (crawlers/snapshots.py) ---
+# 크롤러가 동기화 후 목록 응답을 미리 직렬화/압축해 catalog_snapshots에 게시하고, API는 그 바이트를 그대로 응답.
+# brotli 패키지가 없으면 gzip 압축본만 만듦
+CATALOG_SNAPSHOTS_ENABLED = os.getenv('CATALOG_SNAPSHOTS_ENABLED', 'true').lower() == 'true'
+CATALOG_SNAPSHOT_GZIP_LEVEL = int(os.getenv('CATALOG_SNAPSHOT_GZIP_LEVEL', 9))
+CATALOG_SNAPSHOT_BROTLI_QUALITY = int(os.getenv('CATALOG_SNAPSHOT_BROTLI_QUALITY', 11))
 
 # --- Webtoon API ---
-NAVER_API_URL = "https://comic.naver.com/api/webtoon/titlelist"
+# 벤치마크/회귀 테스트 시 로컬 스텁 서버(benchmarks/stub_upstream.py)로 바꿀 수 있도록 환경 변수 우선
+NAVER_API_URL = os.getenv('NAVER_API_URL', "https://comic.naver.com/api/webtoon/titlelist")
 WEEKDAYS = {
     'mon': 'mon',
     'tue': 'tue',
@@ -20,6 +118,11 @@ WEEKDAYS = {
     'dailyPlus': 'daily'
 }
 
+# --- Kakaopage API ---
+KAKAO_GRAPHQL_URL = os.getenv('KAKAO_GRAPHQL_URL', 'https://page.kakao.com/graphql')
+# '완결' 목록 최대 수집 개수 (0이면 totalCount 전체를 수집)
+KAKAO_FINISHED_MAX_ITEMS = int(os.getenv('KAKAO_FINISHED_MAX_ITEMS', 2000))
+
 # --- Email ---
 # 🚨 [신규] 어떤 이메일 서비스를 사용할지 결정 (smtp 또는 sendgrid)
 EMAIL_PROVIDER = os.getenv('EMAIL_PROVIDER', 'smtp').lower()
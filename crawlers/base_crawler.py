@@ -1,6 +1,23 @@
 # crawlers/base_crawler.py
 
+import asyncio
+import functools
+import time
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager, contextmanager
+
+import config
+from database import bump_catalog_generation, get_cursor
+from services.notification_service import send_completion_notifications
+from .checkpoint import CrawlCheckpoint
+from .concurrency import AdaptiveConcurrencyController
+from .http_session import create_client_session
+from .hedging import HedgePolicy
+from .telemetry import CrawlTelemetry
+from .pipeline import ContentSyncPipeline, merge_staging_into_contents
+from .snapshots import catalog_snapshots_exist, discard_catalog_snapshots, publish_catalog_snapshots
+from .status_history import find_unnotified_completions, mark_completion_notified, next_crawl_run_id
+from .watermark import IncrementalStopPolicy, load_watermark, is_full_sweep_due, save_watermark
 
 class ContentCrawler(ABC):
     """
@@ -9,26 +26,458 @@ class ContentCrawler(ABC):
     데이터 수집, 동기화, 점검 로직을 구현해야 합니다.
     """
 
-    def __init__(self, source_name):
+    content_type = 'webtoon'
+    # '완결' 목록이 최근 완결/갱신 순으로 정렬되어 새 완결작이 앞쪽 페이지에 나오는 소스만 증분 수집이 가능함
+    # (인기순 등으로 정렬된 목록은 새 완결작이 뒤쪽 페이지에 있을 수 있어 항상 전체 수집)
+    FINISHED_LISTING_BY_RECENCY = False
+
+    def __init__(self, source_name, controller=None, session=None, executor=None):
         self.source_name = source_name
+        # 여러 크롤러가 같은 컨트롤러를 공유하면 호스트별 동시성 한도도 함께 적용됩니다.
+        self.controller = controller or AdaptiveConcurrencyController()
+        # 실행 스크립트가 주입한 공용 세션 (없으면 수집할 때마다 자체 세션을 생성)
+        self.session = session
+        # 블로킹 DB/알림 작업을 실행할 스레드 풀 (None이면 이벤트 루프 기본 executor)
+        self.executor = executor
+        # 단계별 실행 시각/소요 시간 (보고서에 저장되어 크롤러 간 겹침을 확인하는 데 사용)
+        self.stage_timings = []
+        # 페이지 단위 체크포인트 (run_daily_check에서 열림, 없으면 매번 새로 요청)
+        self.checkpoint = None
+        # 재시도 후에도 최종 실패한 페이지 목록. 하나라도 있으면 이번 실행은 부분 수집으로 처리
+        self.page_failures = []
+        # 엔드포인트별 요청/지연/재시도/수신 바이트와 단계별 페이지 수 (보고서에 저장)
+        self.telemetry = CrawlTelemetry()
+        # 느린 요청 헤징 정책과 헤지 예산 (CRAWLER_HEDGE가 꺼져 있으면 요청을 그대로 보냄)
+        self.hedging = HedgePolicy()
+        # content_status_history에 기록되는 이번 동기화의 실행 id (동기화 직전에 발급)
+        self.crawl_run_id = None
+        # 이번 동기화에서 기록된 상태 변화 건수 {transition: 건수}
+        self.transitions = {}
+        # 이번 동기화에서 contents에 실제로 쓴 행 수 (신규 + 갱신)
+        self.rows_written = 0
+
+    @contextmanager
+    def _timed_stage(self, stage):
+        """with 블록의 실행 시각과 소요 시간을 stage_timings에 기록합니다."""
+        started_at = time.time()
+        try:
+            yield
+        finally:
+            finished_at = time.time()
+            self.stage_timings.append({
+                'stage': stage,
+                'started_at': started_at,
+                'finished_at': finished_at,
+                'duration': finished_at - started_at,
+            })
+            print(f"LOG: [{self.source_name}] '{stage}' 단계 {finished_at - started_at:.2f}초")
+
+    async def _run_blocking(self, stage, func, *args, **kwargs):
+        """
+        psycopg2/SMTP 같은 블로킹 작업을 스레드 풀에서 실행합니다.
+        이벤트 루프는 그동안 다른 크롤러의 네트워크 수집을 계속 진행합니다.
+        """
+        loop = asyncio.get_running_loop()
+        with self._timed_stage(stage):
+            return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    def _load_known_finished_ids(self, conn):
+        """동기화 전 DB에 '완결'로 저장된 이 소스의 content_id 집합을 조회합니다."""
+        cursor = get_cursor(conn)
+        cursor.execute("SELECT content_id FROM contents WHERE source = %s AND status = '완결'", (self.source_name,))
+        known_finished_ids = {row['content_id'] for row in cursor.fetchall()}
+        cursor.close()
+        return known_finished_ids
+
+    @asynccontextmanager
+    async def _session_scope(self):
+        """주입된 공용 세션을 사용하고, 없을 때만 자체 세션을 만들어 수집이 끝나면 닫습니다."""
+        if self.session is not None:
+            yield self.session
+        else:
+            async with create_client_session() as session:
+                yield session
+
+    async def _request_json(self, session, method, url, **kwargs):
+        """
+        호스트별 적응형 동시성 제어를 거쳐 HTTP 요청을 보내고 JSON 응답을 반환합니다.
+        429/5xx 응답은 컨트롤러에 반영된 뒤 예외로 올라가므로 호출 측의 재시도 로직이 그대로 동작합니다.
+        요청마다 지연 시간/수신 바이트/성공 여부를 telemetry에 기록합니다.
+
+        헤징이 켜져 있으면(CRAWLER_HEDGE) 엔드포인트의 관측 지연 분위수를 넘긴 요청을 한 번 더 보내고
+        먼저 성공한 응답을 사용하며 나머지 요청은 취소합니다.
+        """
+        endpoint = self.telemetry.begin_request(url)
+        self.hedging.requests += 1
+        if not self.hedging.enabled:
+            return await self._send_request_json(session, method, url, endpoint, **kwargs)
+
+        primary = asyncio.ensure_future(self._send_request_json(session, method, url, endpoint, **kwargs))
+        hedge = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.hedging.delay_for(self.telemetry, endpoint))
+            if done or not self.hedging.try_acquire():
+                return await primary
+
+            hedge = asyncio.ensure_future(self._send_request_json(session, method, url, endpoint, **kwargs))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        won = task is hedge
+                        if won:
+                            self.hedging.wins += 1
+                        self.telemetry.record_hedge(endpoint, won)
+                        return task.result()
+            # 두 요청 모두 실패하면 원래 요청의 예외를 그대로 올려 재시도 로직에 맡김
+            self.telemetry.record_hedge(endpoint, False)
+            return primary.result()
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+            await asyncio.gather(*(t for t in (primary, hedge) if t is not None), return_exceptions=True)
+
+    async def _send_request_json(self, session, method, url, endpoint, **kwargs):
+        async with self.controller.request(url) as slot:
+            started = time.perf_counter()
+            ok, received = False, 0
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    slot.observe(response)
+                    response.raise_for_status()
+                    body = await response.read()
+                    received = len(body)
+                    # content_type=None : 'application/graphql+json' 등도 json으로 인식 (이미 읽은 본문을 재사용)
+                    data = await response.json(content_type=None)
+                    ok = True
+                    return data
+            except asyncio.CancelledError:
+                # 조기 종료나 헤징으로 취소된 요청은 오류/지연 통계에 포함하지 않음
+                started = None
+                raise
+            finally:
+                if started is not None:
+                    self.telemetry.record_request(endpoint, time.perf_counter() - started, ok, received)
+
+    async def _fetch_page_checkpointed(self, listing, page, fetch):
+        """
+        체크포인트에 저장된 페이지가 있으면 그대로 반환하고, 없으면 `await fetch()`로 받아와 저장합니다.
+        반환값은 JSON으로 저장 가능한 값이어야 합니다.
+        """
+        if self.checkpoint is not None:
+            payload = self.checkpoint.get(listing, page)
+            if payload is not None:
+                self.telemetry.record_page(listing, from_checkpoint=True)
+                return payload
+        payload = await fetch()
+        self.telemetry.record_page(listing)
+        if self.checkpoint is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.executor, self.checkpoint.save, listing, page, payload)
+        return payload
+
+    def _record_page_failure(self, listing, page, error):
+        """재시도 후에도 실패한 페이지를 기록합니다. 이번 실행은 부분 수집으로 처리됩니다."""
+        self.page_failures.append({'listing': listing, 'page': page, 'error': str(error)})
+
+    def _is_known_finished_item(self, item, known_finished_ids):
+        """
+        API 항목이 이미 DB에 '완결'로 저장되어 있고 오늘도 그대로 '완결'인지 판단합니다.
+        증분 수집의 조기 종료 판단에 사용되며, 각 크롤러가 소스 형식에 맞게 재정의합니다.
+        """
+        return False
+
+    def _plan_finished_crawl(self, conn, known_finished_ids):
+        """
+        워터마크를 확인해 이번 '완결' 목록 수집을 증분/전체 중 어느 모드로 할지 정하고,
+        페이지 순서대로 호출할 조기 종료 정책을 반환합니다.
+        """
+        if self.FINISHED_LISTING_BY_RECENCY:
+            incremental = not is_full_sweep_due(load_watermark(conn, self.source_name))
+            print(f"LOG: [{self.source_name}] '완결' 목록 수집 모드: {'증분' if incremental else '전체'}")
+        else:
+            incremental = False
+            print(f"LOG: [{self.source_name}] '완결' 목록 수집 모드: 전체 (최근순 목록이 없어 증분 수집 미지원)")
+        return IncrementalStopPolicy(
+            known_finished_ids,
+            self._is_known_finished_item,
+            config.CRAWLER_INCREMENTAL_STOP_AFTER_PAGES,
+            incremental=incremental,
+        )
+
+    async def _fetch_pages_windowed(self, fetch_page, max_pages, window, listing, on_page, stop_when=None):
+        """
+        1페이지부터 최대 `window`개의 페이지를 동시에 요청하며 수집합니다.
+        빈 페이지(또는 최종 실패한 페이지)를 만나면 그 뒤의 페이지는 더 이상 요청하지 않고,
+        이미 요청 중인 뒤쪽 페이지는 취소합니다. 수집이 끊긴 지점의 페이지가 실패한 것이면
+        `listing` 이름으로 실패를 기록합니다.
+        도착한 페이지는 페이지 순서대로 `await on_page(page, items)`로 바로 넘겨지며,
+        `stop_when(page, items)`가 True를 반환하면 그 페이지까지만 수집합니다.
+
+        Returns:
+            int: 1페이지부터 끊김 없이 수집된 페이지 수
+        """
+        results = {}
+        failures = {}
+        stopped_by_policy = False
+        in_flight = {}
+        cancelled = []
+        next_page = 1
+        next_to_deliver = 1
+        stop_page = max_pages + 1
+
+        try:
+            while in_flight or next_page < stop_page:
+                while next_page < stop_page and len(in_flight) < window:
+                    in_flight[asyncio.ensure_future(fetch_page(next_page))] = next_page
+                    next_page += 1
+
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    page = in_flight.pop(task)
+                    try:
+                        items = task.result()
+                    except Exception as e:
+                        print(f"  -> [{self.source_name} {listing}] {page} 페이지 수집 중 오류 발생: {e}")
+                        failures[page] = e
+                        items = None
+
+                    if items:
+                        results[page] = items
+                    else:
+                        stop_page = min(stop_page, page)
+
+                # 전달과 조기 종료 판단은 도착 순서가 아닌 페이지 순서대로 수행
+                while next_to_deliver < stop_page and next_to_deliver in results:
+                    items = results.pop(next_to_deliver)
+                    await on_page(next_to_deliver, items)
+                    if stop_when and stop_when(next_to_deliver, items):
+                        stop_page = next_to_deliver + 1
+                        stopped_by_policy = True
+                    next_to_deliver += 1
+
+                # 종료 지점 이후로 이미 요청한 페이지는 결과를 쓰지 않으므로 취소
+                for task, page in list(in_flight.items()):
+                    if page >= stop_page:
+                        task.cancel()
+                        del in_flight[task]
+                        cancelled.append(task)
+        finally:
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, *cancelled, return_exceptions=True)
+
+        # 끝 페이지 뒤쪽에서 난 오류는 무시하고, 수집을 끊은 페이지의 실패만 기록
+        if not stopped_by_policy and next_to_deliver in failures:
+            self._record_page_failure(listing, next_to_deliver, failures[next_to_deliver])
+        return next_to_deliver - 1
 
     @abstractmethod
-    async def fetch_all_data(self):
+    async def fetch_all_data(self, pipeline, finished_stop_policy=None):
         """
         소스에서 모든 콘텐츠 데이터를 비동기적으로 가져옵니다.
+        페이지가 도착하는 대로 ContentRecord(crawlers.content_record)를 `pipeline.put(record, flag)`으로 넘겨야 합니다.
+        finished_stop_policy가 주어지면 '완결' 목록 페이지네이션에 조기 종료 정책으로 적용합니다.
         """
         pass
 
     @abstractmethod
-    def synchronize_database(self, conn, all_content_today, ongoing_today, hiatus_today, finished_today):
+    async def _fetch_listing_page(self, session, listing, page):
         """
-        데이터베이스를 최신 상태로 동기화합니다.
+        목록(listing: 'weekday:mon', 'day:1', 'finished' ...)의 한 페이지를 요청합니다.
+        Returns: (items, is_end) - is_end가 True이면 마지막 페이지
         """
         pass
 
     @abstractmethod
+    async def _put_listing_items(self, pipeline, listing, items):
+        """목록 한 페이지의 API 항목을 목록에 맞는 관찰 플래그와 함께 파이프라인에 넘깁니다."""
+        pass
+
+    @abstractmethod
+    async def plan_work_units(self, session):
+        """
+        분산 수집용 작업 단위 목록을 만듭니다. (crawlers/work_queue.py)
+        Returns: [(listing, page_start, page_end), ...]
+        """
+        pass
+
+    async def fetch_work_unit(self, session, listing, page_start, page_end):
+        """작업 단위 하나를 페이지 순서대로 수집합니다. 빈 페이지나 마지막 페이지에서 멈춥니다."""
+        pages = []
+        for page in range(page_start, page_end + 1):
+            items, is_end = await self._fetch_listing_page(session, listing, page)
+            self.telemetry.record_page(listing)
+            pages.append({'page': page, 'items': items})
+            if not items or is_end:
+                break
+        return pages
+
+    @abstractmethod
+    def _resolve_status(self, flags):
+        """
+        수집 중 누적된 관찰 플래그(crawlers.pipeline.SEEN_*)를 '연재중'/'휴재'/'완결'로 해석합니다.
+        """
+        pass
+
+    def synchronize_database(self, conn, pipeline):
+        """
+        스테이징된 오늘 데이터로 데이터베이스를 최신 상태로 동기화하고 상태 변화를 이력에 남깁니다.
+        Returns: 신규 추가된 콘텐츠 수
+        """
+        print(f"\n[{self.source_name}] DB 동기화를 시작합니다... (crawl_run_id={self.crawl_run_id})")
+        inserted, updated, self.transitions = merge_staging_into_contents(
+            conn, self.source_name, self.content_type, self.crawl_run_id)
+        self.rows_written = inserted + updated
+        if self.checkpoint is not None:
+            # 동기화가 커밋된 뒤에는 (알림/워터마크/스냅샷이 실패하더라도) 저장된 페이지를 다음 실행에서
+            # 재생하면 안 되므로 곧바로 완료로 표시
+            self.checkpoint.complete()
+        unchanged = len(pipeline.index) - inserted - updated
+        print(f"[{self.source_name}] {updated}개 콘텐츠 정보 업데이트, {inserted}개 신규 콘텐츠 추가 완료. (변경 없음 {unchanged}개)")
+        print(f"LOG: [{self.source_name}] 상태 변화: {self.transitions or '없음'}")
+        return inserted
+
+    def refresh_catalog(self, conn):
+        """
+        바뀐 행이 있으면 카탈로그 세대를 올려 API 워커의 응답 캐시를 무효화하고,
+        스냅샷을 켠 경우에는 이 크롤러의 content_type 목록 응답 스냅샷을 다시 게시합니다.
+        (아직 스냅샷이 하나도 없으면 바뀐 행이 없어도 모든 content_type을 게시)
+        """
+        if config.CATALOG_SNAPSHOTS_ENABLED:
+            if catalog_snapshots_exist(conn):
+                # 게시 실패로 이 content_type의 스냅샷이 지워졌으면 바뀐 행이 없어도 다시 게시
+                if not self.rows_written and catalog_snapshots_exist(conn, self.content_type):
+                    return
+                content_types = [self.content_type]
+            else:
+                content_types = None
+            result = publish_catalog_snapshots(conn, content_types)
+            print(f"LOG: [{self.source_name}] 카탈로그 세대 -> {result['generation']}, "
+                  f"스냅샷 {result['snapshots']}개 게시 ({result['bytes']} bytes, gzip {result['gzip_bytes']} bytes, "
+                  f"br {result['br_bytes']} bytes, 렌더링 {result['renders']}회, {result['seconds']}초)")
+        elif self.rows_written:
+            cursor = conn.cursor()
+            generation = bump_catalog_generation(cursor)
+            conn.commit()
+            cursor.close()
+            print(f"LOG: [{self.source_name}] 카탈로그 세대 -> {generation}")
+
+    def _refresh_catalog_or_discard(self, conn):
+        """
+        동기화/알림이 끝난 뒤 카탈로그를 갱신합니다. 실패해도 크롤러 실행은 실패로 보지 않고,
+        이 content_type의 (이제 오래된) 스냅샷을 지워 API가 실시간 조회로 응답하도록 합니다.
+        """
+        try:
+            self.refresh_catalog(conn)
+        except Exception as e:
+            conn.rollback()
+            print(f"경고: [{self.source_name}] 카탈로그 스냅샷 게시 실패: {e}")
+            try:
+                discard_catalog_snapshots(conn, [self.content_type])
+                print(f"LOG: [{self.source_name}] {self.content_type} 스냅샷을 삭제했습니다. (실시간 조회로 응답)")
+            except Exception as discard_error:
+                conn.rollback()
+                print(f"경고: [{self.source_name}] 스냅샷 삭제 실패: {discard_error}")
+
     async def run_daily_check(self, conn):
         """
         일일 데이터 점검 및 완결 알림 프로세스를 실행합니다.
+        수집된 페이지는 파이프라인을 통해 곧바로 스테이징 테이블에 기록되어
+        네트워크 수집과 DB 기록이 겹쳐서 진행됩니다.
+        받아온 페이지는 체크포인트에 저장되며, 최종 실패한 페이지가 있으면 부분 수집으로 보고
+        DB 동기화/알림을 건너뜁니다. 다음 실행은 저장된 페이지를 재사용해 빠진 페이지만 수집합니다.
         """
-        pass
+        print(f"=== [{self.source_name}] 일일 점검 시작 ===")
+        if config.CRAWLER_CHECKPOINT:
+            self.checkpoint = await self._run_blocking('checkpoint', CrawlCheckpoint.open, self.source_name)
+        try:
+            known_finished_ids = await self._run_blocking('load_db_state', self._load_known_finished_ids, conn)
+            finished_stop_policy = await self._run_blocking('plan_finished', self._plan_finished_crawl, conn, known_finished_ids)
+
+            with self._timed_stage('fetch'):
+                async with ContentSyncPipeline(conn, self.source_name, self._resolve_status, executor=self.executor) as pipeline:
+                    await self.fetch_all_data(pipeline, finished_stop_policy)
+                    await pipeline.finish()
+            print(f"LOG: [{self.source_name}] 수집 완료: {len(pipeline.index)}개 고유 콘텐츠 {pipeline.status_counts()}, "
+                  f"스테이징 {pipeline.staged_count}개 ({pipeline.flush_count}회 기록, {pipeline.flush_seconds:.2f}초)")
+            if self.checkpoint is not None and self.checkpoint.reused_pages:
+                print(f"LOG: [{self.source_name}] 체크포인트에서 {self.checkpoint.reused_pages}개 페이지를 재사용했습니다.")
+
+            if self.page_failures:
+                # 일부 목록이 빠진 카탈로그로 DB를 덮어쓰지 않도록 동기화/알림/워터마크 저장을 건너뜀
+                print(f"경고: [{self.source_name}] {len(self.page_failures)}개 페이지 수집 실패. "
+                      f"부분 수집으로 기록하고 DB 동기화를 건너뜁니다. (다음 실행에서 이어서 수집)")
+                if self.checkpoint is not None:
+                    await self._run_blocking('checkpoint', self.checkpoint.mark_partial, self.page_failures)
+                return 0, [], 0
+
+            added, details, notified = await self._sync_and_notify(conn, pipeline, finished_stop_policy)
+        finally:
+            if self.checkpoint is not None:
+                self.checkpoint.close()
+
+        print(f"=== [{self.source_name}] 일일 점검 완료 ===")
+        return added, details, notified
+
+    async def _sync_and_notify(self, conn, pipeline, finished_stop_policy):
+        """
+        스테이징이 끝난 오늘 데이터로 DB 동기화(상태 변화 이력 기록 포함), 이번 실행의 신규 완결 조회,
+        알림 발송, 워터마크 저장, 카탈로그 갱신(스냅샷 게시)을 수행합니다.
+        스냅샷 게시는 마지막에 하므로 게시가 실패해도 알림과 워터마크 저장은 끝난 상태입니다.
+        """
+        self.crawl_run_id = await self._run_blocking('run_id', next_crawl_run_id, conn)
+        added = await self._run_blocking('sync', self.synchronize_database, conn, pipeline)
+
+        # 이번 실행의 완결과 이전 실행에서 알림을 보내지 못한 완결 (발송한 작품은 notified_at으로 표시)
+        newly_completed = await self._run_blocking(
+            'find_completed', find_unnotified_completions, conn, self.source_name)
+        print(f"LOG: [{self.source_name}] {len(newly_completed)}개 신규 완결 콘텐츠 발견.")
+
+        details, notified = [], 0
+        if newly_completed:
+            try:
+                details, notified = await self._run_blocking(
+                    'notify', lambda: send_completion_notifications(
+                        get_cursor(conn), newly_completed, self.source_name,
+                        on_notified=lambda record: mark_completion_notified(conn, self.source_name, record.content_id)))
+            except Exception as e:
+                # 동기화는 이미 커밋되었으므로 실행은 실패로 보지 않음. 표시되지 않은 완결은 다음 실행에서 재발송
+                conn.rollback()
+                print(f"경고: [{self.source_name}] 알림 발송 실패: {e}")
+                details = [f"오류: 알림 발송 실패 ({e}) - 다음 실행에서 재발송"]
+
+        await self._run_blocking('save_watermark', save_watermark, conn, self.source_name, finished_stop_policy)
+        await self._run_blocking('publish', self._refresh_catalog_or_discard, conn)
+        return added, details, notified
+
+    async def run_reduce(self, conn, unit_results, failed_units):
+        """
+        분산 워커들이 수집한 작업 단위 결과를 파이프라인에 재생한 뒤 동기화합니다.
+        unit_results: [(listing, [{'page', 'items'}, ...]), ...]
+        실패한 작업 단위가 있으면 부분 수집으로 보고 동기화를 건너뜁니다.
+        """
+        print(f"=== [{self.source_name}] 분산 수집 결과 취합 시작 ===")
+        if failed_units:
+            self.page_failures.extend(failed_units)
+            print(f"경고: [{self.source_name}] {len(failed_units)}개 작업 단위 실패. 부분 수집으로 기록하고 DB 동기화를 건너뜁니다.")
+            return 0, [], 0
+
+        # 작업 단위는 '완결' 목록 전체를 나눠 수집하므로 워터마크에는 전체 수집으로 기록
+        finished_stop_policy = IncrementalStopPolicy(
+            set(), self._is_known_finished_item, config.CRAWLER_INCREMENTAL_STOP_AFTER_PAGES, incremental=False)
+        with self._timed_stage('replay'):
+            async with ContentSyncPipeline(conn, self.source_name, self._resolve_status, executor=self.executor) as pipeline:
+                for listing, pages in unit_results:
+                    for entry in pages:
+                        await self._put_listing_items(pipeline, listing, entry['items'])
+                        if listing == 'finished' and entry['items']:
+                            finished_stop_policy.pages_seen = max(finished_stop_policy.pages_seen, entry['page'])
+                await pipeline.finish()
+        print(f"LOG: [{self.source_name}] 취합 완료: {len(pipeline.index)}개 고유 콘텐츠 {pipeline.status_counts()}")
+
+        added, details, notified = await self._sync_and_notify(conn, pipeline, finished_stop_policy)
+        print(f"=== [{self.source_name}] 분산 수집 결과 취합 완료 ===")
+        return added, details, notified
@@ -0,0 +1,79 @@
+# crawlers/bulk_sync.py
+"""
+대량 동기화 공용 경로입니다.
+
+- copy_rows: 행 목록을 COPY ... FROM STDIN으로 한 번에 전송 (행마다 INSERT/UPDATE를 보내지 않음)
+- upsert_contents: 스테이징 테이블을 INSERT ... ON CONFLICT DO UPDATE ... WHERE 한 문장으로 contents에 반영.
+  content_hash(내용 지문)가 DB와 같은 행은 아예 쓰지 않고, 신규/갱신 건수를 (xmax = 0) 여부로 구분해 반환
+"""
+import io
+
+from database import content_hash_sql
+
+
+def _copy_value(value):
+    """COPY text 형식의 필드 하나 (NULL은 \\N, 구분자/개행/역슬래시는 이스케이프)"""
+    if value is None:
+        return '\\N'
+    return (str(value)
+            .replace('\\', '\\\\')
+            .replace('\t', '\\t')
+            .replace('\n', '\\n')
+            .replace('\r', '\\r'))
+
+
+def copy_rows(cursor, table, columns, rows):
+    """rows(튜플 목록)를 table의 columns에 COPY로 기록하고 기록한 행 수를 반환합니다."""
+    buffer = io.StringIO()
+    count = 0
+    for row in rows:
+        buffer.write('\t'.join(_copy_value(value) for value in row))
+        buffer.write('\n')
+        count += 1
+    if count:
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+    return count
+
+
+# 스테이징 행(s)으로부터 표준 meta 구조를 만드는 SQL 식
+STAGED_META_SQL = """jsonb_build_object(
+    'common', jsonb_build_object('authors', s.authors, 'thumbnail_url', s.thumbnail_url),
+    'attributes', jsonb_build_object('weekdays', s.weekdays)
+)"""
+
+
+def upsert_contents(cursor, staging_table, source, content_type, target_table='contents'):
+    """
+    스테이징 테이블(content_id, title, authors, thumbnail_url, status, weekdays)을 contents에 반영합니다.
+    스테이징 행의 지문을 DB의 content_hash와 비교해, 지문이 같은 작품은 INSERT 대상에서 제외합니다.
+    (ON CONFLICT ... WHERE false로 걸러도 행 잠금은 기록되므로, 변경 없는 행은 미리 빼서 쓰기를 0으로 만듦)
+    target_table은 contents 또는 source의 파티션입니다. (파티션 부모에는 RETURNING xmax를 쓸 수 없음)
+    Returns: (inserted, updated)
+    """
+    staged_hash = content_hash_sql('%(content_type)s', 's.title', 's.status', STAGED_META_SQL)
+    cursor.execute(
+        f"""
+        WITH upserted AS (
+            INSERT INTO {target_table} AS c (content_id, source, content_type, title, status, meta)
+            SELECT s.content_id, %(source)s, %(content_type)s, s.title, s.status, {STAGED_META_SQL}
+            FROM {staging_table} s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM {target_table} d
+                WHERE d.source = %(source)s AND d.content_id = s.content_id AND d.content_hash = {staged_hash}
+            )
+            ON CONFLICT (content_id, source) DO UPDATE
+            SET content_type = EXCLUDED.content_type, title = EXCLUDED.title,
+                status = EXCLUDED.status, meta = EXCLUDED.meta
+            WHERE c.content_hash IS DISTINCT FROM
+                  {content_hash_sql('EXCLUDED.content_type', 'EXCLUDED.title', 'EXCLUDED.status', 'EXCLUDED.meta')}
+            RETURNING (xmax = 0) AS inserted
+        )
+        SELECT COUNT(*) FILTER (WHERE inserted) AS inserted,
+               COUNT(*) FILTER (WHERE NOT inserted) AS updated
+        FROM upserted
+        """,
+        {'source': source, 'content_type': content_type}
+    )
+    row = cursor.fetchone()
+    return row['inserted'], row['updated']
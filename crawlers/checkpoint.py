@@ -0,0 +1,112 @@
+# crawlers/checkpoint.py
+
+import json
+
+import config
+from database import create_standalone_connection, get_cursor
+
+
+class CrawlCheckpoint:
+    """
+    소스별 수집 실행의 페이지 단위 진행 상황을 DB(crawl_checkpoints, crawl_checkpoint_pages)에 저장합니다.
+
+    - 페이지를 받아오는 즉시 응답 내용을 저장하므로, 실행이 중간에 실패하거나 강제 종료되어도
+      다음 실행은 저장된 페이지를 DB에서 읽고 빠진 페이지만 다시 요청합니다.
+    - 일부 페이지가 최종 실패하면 실행은 'partial'로 남고, 모든 페이지를 받은 실행만 'complete'가 되며
+      그때 저장된 페이지를 삭제합니다.
+    - 스테이징/동기화 트랜잭션과 섞이지 않도록 autocommit 전용 연결을 사용합니다.
+    """
+
+    def __init__(self, conn, source, checkpoint_id, pages, resumed):
+        self.conn = conn
+        self.source = source
+        self.checkpoint_id = checkpoint_id
+        self.pages = pages
+        self.resumed = resumed
+        self.reused_pages = 0
+
+    @classmethod
+    def open(cls, source):
+        """
+        CRAWLER_CHECKPOINT_MAX_AGE_HOURS 안에 완료되지 않은 실행이 있으면 이어서 사용하고,
+        없으면 새 실행을 시작합니다. 오래된 미완료 실행은 삭제합니다.
+        """
+        conn = create_standalone_connection()
+        conn.autocommit = True
+        cursor = get_cursor(conn)
+        cursor.execute(
+            """
+            DELETE FROM crawl_checkpoints
+            WHERE source = %s AND updated_at < NOW() - make_interval(hours => %s)
+            """,
+            (source, config.CRAWLER_CHECKPOINT_MAX_AGE_HOURS)
+        )
+        cursor.execute(
+            """
+            SELECT id FROM crawl_checkpoints
+            WHERE source = %s AND status IN ('running', 'partial')
+            ORDER BY id DESC LIMIT 1
+            """,
+            (source,)
+        )
+        row = cursor.fetchone()
+        pages = {}
+        if row:
+            checkpoint_id = row['id']
+            cursor.execute(
+                "SELECT listing, page, payload FROM crawl_checkpoint_pages WHERE checkpoint_id = %s",
+                (checkpoint_id,)
+            )
+            pages = {(r['listing'], r['page']): r['payload'] for r in cursor.fetchall()}
+            cursor.execute(
+                "UPDATE crawl_checkpoints SET status = 'running', updated_at = NOW() WHERE id = %s",
+                (checkpoint_id,)
+            )
+            print(f"LOG: [{source}] 미완료 수집 실행(#{checkpoint_id})을 이어서 진행합니다. (저장된 페이지 {len(pages)}개)")
+        else:
+            cursor.execute("INSERT INTO crawl_checkpoints (source) VALUES (%s) RETURNING id", (source,))
+            checkpoint_id = cursor.fetchone()['id']
+        cursor.close()
+        return cls(conn, source, checkpoint_id, pages, resumed=bool(row))
+
+    def get(self, listing, page):
+        """저장된 페이지 응답을 반환합니다. 없으면 None."""
+        payload = self.pages.get((listing, page))
+        if payload is not None:
+            self.reused_pages += 1
+        return payload
+
+    def save(self, listing, page, payload):
+        cursor = get_cursor(self.conn)
+        cursor.execute(
+            """
+            INSERT INTO crawl_checkpoint_pages (checkpoint_id, listing, page, payload)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (checkpoint_id, listing, page) DO UPDATE SET payload = EXCLUDED.payload, fetched_at = NOW()
+            """,
+            (self.checkpoint_id, listing, page, json.dumps(payload))
+        )
+        cursor.execute("UPDATE crawl_checkpoints SET updated_at = NOW() WHERE id = %s", (self.checkpoint_id,))
+        cursor.close()
+
+    def mark_partial(self, failures):
+        """최종 실패한 페이지 목록과 함께 실행을 'partial'로 남깁니다. 저장된 페이지는 다음 실행에서 재사용됩니다."""
+        cursor = get_cursor(self.conn)
+        cursor.execute(
+            "UPDATE crawl_checkpoints SET status = 'partial', failed_pages = %s, updated_at = NOW() WHERE id = %s",
+            (json.dumps(failures), self.checkpoint_id)
+        )
+        cursor.close()
+
+    def complete(self):
+        """모든 페이지를 받아 동기화까지 끝난 실행을 'complete'로 표시하고 저장된 페이지를 삭제합니다."""
+        cursor = get_cursor(self.conn)
+        cursor.execute("DELETE FROM crawl_checkpoint_pages WHERE checkpoint_id = %s", (self.checkpoint_id,))
+        cursor.execute(
+            "UPDATE crawl_checkpoints SET status = 'complete', failed_pages = NULL, updated_at = NOW() WHERE id = %s",
+            (self.checkpoint_id,)
+        )
+        cursor.close()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,206 @@
+# crawlers/concurrency.py
+
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import config
+
+# 업스트림이 "속도를 줄여라"라는 의미로 돌려주는 상태 코드
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value, max_seconds):
+    """
+    Retry-After 헤더 값(초 단위 숫자 또는 HTTP-date)을 대기 시간(초)으로 변환합니다.
+    해석할 수 없는 값이면 None을 반환합니다.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        seconds = float(value)
+    else:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    return max(0.0, min(seconds, max_seconds))
+
+
+class HostLimiter:
+    """
+    단일 호스트에 대한 AIMD(Additive Increase / Multiplicative Decrease) 동시성 제한기입니다.
+    - 지연 시간과 오류율이 낮게 유지되면 동시 요청 한도를 천천히 올리고,
+    - 429/5xx/네트워크 오류가 발생하면 한도를 절반으로 줄이며 Retry-After 동안 새 요청을 보류합니다.
+    """
+
+    def __init__(self, host, initial_limit, min_limit, max_limit,
+                 latency_tolerance, error_threshold, backoff_factor, max_retry_after):
+        self.host = host
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.error_threshold = error_threshold
+        self.backoff_factor = backoff_factor
+        self.max_retry_after = max_retry_after
+
+        self.in_flight = 0
+        self.rtt_ewma = None
+        self.min_rtt = None
+        self.total_requests = 0
+        self.total_throttled = 0
+        self._outcomes = deque(maxlen=50)  # True = 오류/스로틀
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+
+    @property
+    def current_limit(self):
+        return max(1, int(self.limit))
+
+    @property
+    def error_rate(self):
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def retry_after_remaining(self):
+        return max(0.0, self._blocked_until - time.monotonic())
+
+    async def acquire(self):
+        delay = self.retry_after_remaining()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self.retry_after_remaining()
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < self.current_limit)
+            self.in_flight += 1
+
+    async def release(self, rtt=None, failed=False, throttled=False, retry_after=None):
+        async with self._cond:
+            self.in_flight -= 1
+            if rtt is not None:
+                self._record(rtt, failed, throttled, retry_after)
+            self._cond.notify_all()
+
+    def _record(self, rtt, failed, throttled, retry_after):
+        now = time.monotonic()
+        self.total_requests += 1
+        self._outcomes.append(failed or throttled)
+
+        if throttled:
+            self.total_throttled += 1
+            if retry_after is not None:
+                self._blocked_until = max(self._blocked_until, now + min(retry_after, self.max_retry_after))
+
+        if failed or throttled or self.error_rate > self.error_threshold:
+            # 동시에 실패한 여러 요청이 한도를 연쇄적으로 깎지 않도록 RTT당 한 번만 감소
+            cooldown = max(self.rtt_ewma or 0.0, 1.0)
+            if now - self._last_decrease >= cooldown:
+                self.limit = max(float(self.min_limit), self.limit * self.backoff_factor)
+                self._last_decrease = now
+            return
+
+        self.rtt_ewma = rtt if self.rtt_ewma is None else 0.8 * self.rtt_ewma + 0.2 * rtt
+        self.min_rtt = rtt if self.min_rtt is None else min(self.min_rtt, rtt)
+
+        # 지연 시간이 최저치 대비 허용 범위 안일 때만 한도를 약 1/limit씩 증가 (RTT당 +1 수준)
+        if self.rtt_ewma <= self.min_rtt * self.latency_tolerance:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+    def stats(self):
+        return {
+            'limit': self.current_limit,
+            'in_flight': self.in_flight,
+            'rtt_ms': round(self.rtt_ewma * 1000, 1) if self.rtt_ewma is not None else None,
+            'min_rtt_ms': round(self.min_rtt * 1000, 1) if self.min_rtt is not None else None,
+            'error_rate': round(self.error_rate, 3),
+            'requests': self.total_requests,
+            'throttled': self.total_throttled,
+            'retry_after_remaining': round(self.retry_after_remaining(), 1),
+        }
+
+
+class _RequestSlot:
+    """controller.request(url)이 반환하는 컨텍스트. 응답 상태를 관찰해 제한기에 반영합니다."""
+
+    def __init__(self, limiter):
+        self._limiter = limiter
+        self._started = None
+        self.status = None
+        self.retry_after = None
+
+    def observe(self, response):
+        """aiohttp 응답의 상태 코드와 Retry-After 헤더를 기록합니다."""
+        self.status = response.status
+        if response.status in THROTTLE_STATUSES:
+            self.retry_after = parse_retry_after(response.headers.get('Retry-After'), self._limiter.max_retry_after)
+
+    async def __aenter__(self):
+        await self._limiter.acquire()
+        self._started = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is not None and not issubclass(exc_type, Exception):
+            # 취소(CancelledError) 등은 업스트림 상태와 무관하므로 통계에 반영하지 않음
+            await self._limiter.release()
+            return False
+
+        rtt = time.monotonic() - self._started
+        throttled = self.status in THROTTLE_STATUSES
+        if self.status is not None:
+            failed = self.status >= 500 and not throttled
+        else:
+            failed = exc_type is not None  # 응답을 받지 못한 네트워크 오류/타임아웃
+        await self._limiter.release(rtt, failed, throttled, self.retry_after)
+        return False
+
+
+class AdaptiveConcurrencyController:
+    """
+    호스트별 HostLimiter를 관리하는 컨트롤러입니다.
+    여러 크롤러가 하나의 인스턴스를 공유하면 같은 호스트에 대한 요청이 함께 제어됩니다.
+
+    사용 예:
+        async with controller.request(url) as slot:
+            async with session.get(url) as response:
+                slot.observe(response)
+                ...
+    """
+
+    def __init__(self, initial_limit=None, min_limit=None, max_limit=None):
+        self.initial_limit = initial_limit or config.CRAWLER_INITIAL_CONCURRENCY
+        self.min_limit = min_limit or config.CRAWLER_MIN_CONCURRENCY
+        self.max_limit = max_limit or config.CRAWLER_MAX_CONCURRENCY
+        self._hosts = {}
+
+    def limiter_for(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._hosts:
+            self._hosts[host] = HostLimiter(
+                host,
+                initial_limit=self.initial_limit,
+                min_limit=self.min_limit,
+                max_limit=self.max_limit,
+                latency_tolerance=config.CRAWLER_LATENCY_TOLERANCE,
+                error_threshold=config.CRAWLER_ERROR_RATE_THRESHOLD,
+                backoff_factor=config.CRAWLER_BACKOFF_FACTOR,
+                max_retry_after=config.CRAWLER_MAX_RETRY_AFTER,
+            )
+        return self._hosts[host]
+
+    def request(self, url):
+        return _RequestSlot(self.limiter_for(url))
+
+    def stats(self):
+        """호스트별 현재 동시성 한도, 관측 RTT, 오류율을 반환합니다."""
+        return {host: limiter.stats() for host, limiter in self._hosts.items()}
@@ -0,0 +1,64 @@
+# crawlers/content_record.py
+
+# meta.attributes.weekdays에 저장되는 요일 값 (비트마스크 순서)
+WEEKDAY_ORDER = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun', 'daily', 'hiatus']
+WEEKDAY_BITS = {day: 1 << i for i, day in enumerate(WEEKDAY_ORDER)}
+
+
+def encode_weekdays(days):
+    bits = 0
+    for day in days or ():
+        bits |= WEEKDAY_BITS.get(day, 0)
+    return bits
+
+
+def decode_weekdays(bits):
+    return [day for day in WEEKDAY_ORDER if bits & WEEKDAY_BITS[day]]
+
+
+class ContentRecord:
+    """
+    크롤러가 만들고 DB 동기화/알림 단계가 소비하는 작품 한 건의 압축 표현입니다.
+    업스트림 응답 dict 전체 대신 DB에 저장하는 필드만 __slots__로 보관하고,
+    요일은 WEEKDAY_BITS 비트마스크로 저장합니다.
+    """
+    __slots__ = ('content_id', 'source', 'title', 'status', 'authors', 'thumbnail_url', 'weekdays')
+
+    def __init__(self, content_id, source, title, authors=(), thumbnail_url=None, status=None, weekdays=0):
+        self.content_id = content_id
+        self.source = source
+        self.title = title
+        self.status = status
+        self.authors = tuple(authors)
+        self.thumbnail_url = thumbnail_url
+        self.weekdays = weekdays
+
+    @classmethod
+    def from_row(cls, row, source):
+        """contents(또는 스테이징) 테이블 행에서 레코드를 만듭니다."""
+        meta = row.get('meta') or {}
+        common = meta.get('common', {})
+        weekdays = row.get('weekdays')
+        if weekdays is None:
+            weekdays = meta.get('attributes', {}).get('weekdays', [])
+        return cls(
+            row['content_id'], source, row['title'],
+            authors=row.get('authors', common.get('authors', ())),
+            thumbnail_url=row.get('thumbnail_url', common.get('thumbnail_url')),
+            status=row.get('status'),
+            weekdays=encode_weekdays(weekdays),
+        )
+
+    @property
+    def weekday_names(self):
+        return decode_weekdays(self.weekdays)
+
+    def meta(self):
+        """contents.meta에 저장되는 표준 meta 구조"""
+        return {
+            'common': {'authors': list(self.authors), 'thumbnail_url': self.thumbnail_url},
+            'attributes': {'weekdays': self.weekday_names},
+        }
+
+    def __repr__(self):
+        return f"ContentRecord({self.source}:{self.content_id} '{self.title}' {self.status} {self.weekday_names})"
@@ -0,0 +1,44 @@
+# crawlers/hedging.py
+
+import config
+
+
+class HedgePolicy:
+    """
+    지연 요청 헤징(hedged request) 정책입니다.
+
+    요청이 엔드포인트의 관측 지연 분위수(기본 p95)보다 오래 걸리면 같은 요청을 한 번 더 보내고
+    먼저 도착한 응답을 사용합니다. 추가 요청은 전체 요청 수의 `max_ratio` 비율(+1)까지만 허용해
+    업스트림에 주는 추가 부하를 제한합니다.
+    """
+
+    def __init__(self, enabled=None, percentile=None, min_samples=None, fallback_delay=None,
+                 min_delay=None, max_ratio=None):
+        self.enabled = config.CRAWLER_HEDGE if enabled is None else enabled
+        self.percentile = percentile or config.CRAWLER_HEDGE_PERCENTILE
+        self.min_samples = min_samples or config.CRAWLER_HEDGE_MIN_SAMPLES
+        self.fallback_delay = (fallback_delay or config.CRAWLER_HEDGE_DELAY_MS) / 1000
+        self.min_delay = (min_delay or config.CRAWLER_HEDGE_MIN_DELAY_MS) / 1000
+        self.max_ratio = config.CRAWLER_HEDGE_MAX_RATIO if max_ratio is None else max_ratio
+        self.requests = 0
+        self.hedges = 0
+        self.wins = 0
+        self.denied = 0
+
+    def delay_for(self, telemetry, endpoint):
+        """헤지 요청을 보내기 전까지 기다릴 시간(초). 관측치가 부족하면 고정 지연을 사용합니다."""
+        observed = telemetry.latency_percentile(endpoint, self.percentile, self.min_samples)
+        if observed is None:
+            return self.fallback_delay
+        return max(self.min_delay, observed)
+
+    def try_acquire(self):
+        """헤지 예산이 남아 있으면 사용하고 True를 반환합니다."""
+        if self.hedges + 1 > self.max_ratio * self.requests + 1:
+            self.denied += 1
+            return False
+        self.hedges += 1
+        return True
+
+    def stats(self):
+        return {'requests': self.requests, 'hedges': self.hedges, 'wins': self.wins, 'denied': self.denied}
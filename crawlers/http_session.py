@@ -0,0 +1,43 @@
+# crawlers/http_session.py
+
+import importlib.util
+
+import aiohttp
+
+import config
+
+
+def accepted_encodings():
+    """설치된 디코더에 맞춰 협상할 Accept-Encoding 값을 반환합니다. (br은 Brotli 패키지가 있을 때만)"""
+    encodings = ['gzip', 'deflate']
+    if importlib.util.find_spec('brotli') or importlib.util.find_spec('brotlicffi'):
+        encodings.append('br')
+    return ', '.join(encodings)
+
+
+def create_client_session(**overrides):
+    """
+    크롤러들이 공유할 aiohttp.ClientSession을 생성합니다.
+    - 호스트별 연결 수 제한과 keep-alive로 TLS 핸드셰이크/연결 수립 비용을 호스트당 한 번만 지불하고,
+    - DNS 조회 결과를 TTL 동안 캐시하며,
+    - 전체/연결/읽기 타임아웃과 압축 협상(gzip, deflate, br)을 기본으로 설정합니다.
+    실행 스크립트(run_all_crawlers)가 소유하고 닫아야 합니다.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=overrides.get('limit', config.HTTP_POOL_LIMIT),
+        limit_per_host=overrides.get('limit_per_host', config.HTTP_POOL_LIMIT_PER_HOST),
+        ttl_dns_cache=overrides.get('ttl_dns_cache', config.HTTP_DNS_CACHE_TTL),
+        keepalive_timeout=overrides.get('keepalive_timeout', config.HTTP_KEEPALIVE_TIMEOUT),
+        enable_cleanup_closed=True,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=overrides.get('total_timeout', config.HTTP_TOTAL_TIMEOUT),
+        connect=overrides.get('connect_timeout', config.HTTP_CONNECT_TIMEOUT),
+        sock_read=overrides.get('read_timeout', config.HTTP_READ_TIMEOUT),
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        headers={'Accept-Encoding': accepted_encodings()},
+        auto_decompress=True,
+    )
@@ -1,12 +1,14 @@
 # crawlers/kakaopage_crawler.py
 # ... (파일 상단은 이전과 동일) ...
 import asyncio
-import aiohttp
-import json
+import math
 import config
 from tenacity import retry, stop_after_attempt, wait_exponential
 from .base_crawler import ContentCrawler
-from database import get_cursor
+from .telemetry import record_retry
+from .content_record import ContentRecord, WEEKDAY_BITS
+from .pipeline import SEEN_ONGOING, SEEN_HIATUS, SEEN_FINISHED
+from .work_queue import split_page_range
 
 GRAPHQL_QUERY_ONGOING = """
 query staticLandingDayOfWeekLayout($queryInput: StaticLandingDayOfWeekParamInput!) {
@@ -52,10 +54,16 @@ DAY_TAB_UIDS = {
     'hiatus': '8' # 👈 '휴재' 탭에서 찾은 UID 값으로 '8'을 대체하세요.
 }
 
+DAY_KEYS_BY_UID = {uid: day_key for day_key, uid in DAY_TAB_UIDS.items()}
+
 class KakaopageCrawler(ContentCrawler):
-    def __init__(self):
-        super().__init__('kakaopage')
-        self.GRAPHQL_URL = 'https://page.kakao.com/graphql'
+    FINISHED_PAGE_SIZE = 100
+    FINISHED_MAX_PAGES = 249 # 최대 24900개 (totalCount를 알 수 없을 때의 상한)
+    ONGOING_MAX_PAGES = 100  # 작업 단위 계획 시 요일 목록 하나의 최대 페이지 수
+
+    def __init__(self, **kwargs):
+        super().__init__('kakaopage', **kwargs)
+        self.GRAPHQL_URL = config.KAKAO_GRAPHQL_URL
         self.HEADERS = {
             'User-Agent': config.CRAWLER_HEADERS['User-Agent'],
             'Content-Type': 'application/json',
@@ -63,7 +71,7 @@ class KakaopageCrawler(ContentCrawler):
             'Referer': 'https://page.kakao.com/',
         }
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10), before_sleep=record_retry)
     async def _fetch_page_data(self, session, page, size=100, day_tab_uid=None, is_complete=False):
         if is_complete:
             query = GRAPHQL_QUERY_FINISHED
@@ -74,160 +82,150 @@ class KakaopageCrawler(ContentCrawler):
 
         payload = {"query": query, "variables": variables}
         try:
-            async with session.post(self.GRAPHQL_URL, headers=self.HEADERS, json=payload, timeout=30) as response:
-                response.raise_for_status()
-
-                # 👈 2. aiohttp 내장 json 파서 사용
-                # content_type=None : 'application/graphql+json'을 json으로 인식시킴
-                data = await response.json(content_type=None)
-
-                data_root = data.get('data', {})
-                if is_complete:
-                    # 완결 탭: data.staticLandingGenreSection.items[0].items
-                    section = data_root.get('staticLandingGenreSection', {})
-                    groups = section.get('items', [])
-                else:
-                    # 요일별 탭: data.staticLandingDayOfWeekLayout.sections[0].items[0].items
-                    layout = data_root.get('staticLandingDayOfWeekLayout', {})
-                    sections = layout.get('sections', [])
-                    groups = sections[0].get('items', []) if sections else [] # 👈 1. sections[0] 안전하게 접근
-
-                # 👈 2. groups[0] 안전하게 접근
-                items = groups[0].get('items', []) if groups else []
-                return items
+            # 호스트별 동시성 제어 + aiohttp 내장 json 파서 사용 (base_crawler._request_json)
+            data = await self._request_json(session, 'POST', self.GRAPHQL_URL, headers=self.HEADERS, json=payload, timeout=30)
+
+            data_root = data.get('data', {})
+            if is_complete:
+                # 완결 탭: data.staticLandingGenreSection.items[0].items
+                section = data_root.get('staticLandingGenreSection') or {}
+            else:
+                # 요일별 탭: data.staticLandingDayOfWeekLayout.sections[0].items[0].items
+                layout = data_root.get('staticLandingDayOfWeekLayout', {})
+                sections = layout.get('sections', [])
+                section = sections[0] if sections else {} # 👈 1. sections[0] 안전하게 접근
+            groups = section.get('items', [])
+
+            # 👈 2. groups[0] 안전하게 접근
+            items = groups[0].get('items', []) if groups else []
+            # 섹션 메타데이터(totalCount, isEnd)도 함께 반환하여 페이지 계획/종료 판단에 사용
+            return items, section.get('totalCount'), bool(section.get('isEnd'))
         except Exception as e:
             print(f"[{self.source_name}] Page {page} (day: {day_tab_uid}, complete: {is_complete}) 로드 실패: {e}")
             raise
 
-    async def _fetch_ongoing_category(self, session, day_key, day_tab_uid, data_maps):
+    def _is_known_finished_item(self, item, known_finished_ids):
+        return str(item.get('seriesId')) in known_finished_ids
+
+    def _resolve_status(self, flags):
+        # 완결 목록 > 요일 목록의 휴재 배지 > 연재중
+        if flags & SEEN_FINISHED: return '완결'
+        if flags & SEEN_HIATUS: return '휴재'
+        return '연재중'
+
+    def _normalize(self, item, day_key=None):
+        """GraphQL 응답 항목에서 DB에 저장하는 필드만 뽑아 ContentRecord를 만듭니다."""
+        return ContentRecord(
+            str(item.get('seriesId')), self.source_name, item.get('title', '제목 없음'),
+            authors=[a.get('name') for a in item.get('authors') or [] if a.get('name')],
+            thumbnail_url=item.get('thumbnail'),
+            weekdays=WEEKDAY_BITS.get(day_key, 0),
+        )
+
+    async def _fetch_listing_page(self, session, listing, page):
+        if listing == 'finished':
+            items, _, is_end = await self._fetch_page_data(session, page=page, size=self.FINISHED_PAGE_SIZE, is_complete=True)
+        else:
+            items, _, is_end = await self._fetch_page_data(session, page=page, day_tab_uid=listing.split(':', 1)[1])
+        return items, is_end
+
+    async def _put_listing_items(self, pipeline, listing, items):
+        if listing == 'finished':
+            # 👈 '연재중'이었다가 완결된 작품도 완결 플래그가 누적되어 '완결'로 해석됨
+            for item in items:
+                await pipeline.put(self._normalize(item), SEEN_FINISHED)
+        else:
+            day_key = DAY_KEYS_BY_UID[listing.split(':', 1)[1]]
+            for item in items:
+                flag = SEEN_HIATUS if '휴재' in (item.get('statusBadge') or '') else SEEN_ONGOING
+                await pipeline.put(self._normalize(item, day_key), flag)
+
+    def _plan_finished_pages(self, total_count, is_end):
+        """1페이지 응답의 totalCount/isEnd와 수집 개수 상한으로 '완결' 목록의 페이지 수를 정합니다."""
+        planned_pages = math.ceil(total_count / self.FINISHED_PAGE_SIZE) if total_count else self.FINISHED_MAX_PAGES
+        if is_end:
+            planned_pages = 1
+        if config.KAKAO_FINISHED_MAX_ITEMS: # 수집 개수 상한 (0이면 제한 없음)
+            planned_pages = min(planned_pages, math.ceil(config.KAKAO_FINISHED_MAX_ITEMS / self.FINISHED_PAGE_SIZE))
+        return planned_pages
+
+    async def plan_work_units(self, session):
+        units = [(f"day:{uid}", 1, self.ONGOING_MAX_PAGES) for uid in DAY_TAB_UIDS.values()]
+        _, total_count, is_end = await self._fetch_page_data(session, page=1, size=self.FINISHED_PAGE_SIZE, is_complete=True)
+        planned_pages = self._plan_finished_pages(total_count, is_end)
+        print(f"[{self.source_name}] '완결' totalCount={total_count} -> {planned_pages} 페이지 작업 계획")
+        units += split_page_range('finished', 1, planned_pages, config.CRAWLER_WORK_UNIT_PAGES)
+        return units
+
+    async def _fetch_ongoing_category(self, session, day_key, day_tab_uid, pipeline):
         print(f"[{self.source_name}] '{day_key}' (TabUID:{day_tab_uid}) 목록 수집 시작...")
+        listing = f"day:{day_tab_uid}"
         page = 1
         while True:
             try:
-                items = await self._fetch_page_data(session, page=page, day_tab_uid=day_tab_uid)
+                # (items, totalCount, isEnd)를 그대로 체크포인트에 저장
+                items, _, is_end = await self._fetch_page_checkpointed(
+                    listing, page, lambda: self._fetch_page_data(session, page=page, day_tab_uid=day_tab_uid))
                 if not items: break
-                for item in items:
-                    content_id = str(item.get('seriesId'))
-                    if content_id not in data_maps['all_content_today']:
-                        data_maps['all_content_today'][content_id] = item
-                        item['normalized_weekdays'] = set()
-                    data_maps['all_content_today'][content_id]['normalized_weekdays'].add(day_key)
-                    if '휴재' in (item.get('statusBadge') or ''): data_maps['hiatus_today'][content_id] = item
-                    else: data_maps['ongoing_today'][content_id] = item
+                await self._put_listing_items(pipeline, listing, items)
+                if is_end: break # 마지막 페이지면 빈 페이지를 한 번 더 요청하지 않음
                 page += 1
-                await asyncio.sleep(0.1)
-            except Exception:
+            except Exception as e:
                 print(f"[{self.source_name}] '{day_key}' 페이지 {page}에서 최종 실패.")
+                self._record_page_failure(listing, page, e)
                 break
         print(f"[{self.source_name}] '{day_key}' 목록 수집 완료.")
 
-    async def fetch_all_data(self):
+    async def _fetch_finished_category(self, session, pipeline, stop_policy=None):
+        """
+        1페이지 응답의 totalCount로 전체 페이지 범위를 미리 계획한 뒤,
+        나머지 페이지를 동시에(최대 CRAWLER_PAGE_WINDOW개) 요청하고 페이지 순서대로 처리합니다.
+        """
+        PAGE_SIZE = self.FINISHED_PAGE_SIZE
+        print(f"[{self.source_name}] '완결' 목록 수집 시작...")
+
+        def fetch_checkpointed(page):
+            return self._fetch_page_checkpointed(
+                'finished', page, lambda: self._fetch_page_data(session, page=page, size=PAGE_SIZE, is_complete=True))
+
+        try:
+            first_items, total_count, is_end = await fetch_checkpointed(1)
+        except Exception as e:
+            print(f"[{self.source_name}] '완결' 페이지 1에서 최종 실패.")
+            self._record_page_failure('finished', 1, e)
+            return
+
+        planned_pages = self._plan_finished_pages(total_count, is_end)
+        print(f"[{self.source_name}] '완결' totalCount={total_count} -> {planned_pages} 페이지 수집 계획")
+
+        async def fetch_page(page):
+            if page == 1:
+                return first_items
+            items, _, _ = await fetch_checkpointed(page)
+            return items
+
+        total_finished_found = 0 # 👈 1. 수집한 완결작 총 개수
+
+        async def on_page(page, items):
+            nonlocal total_finished_found
+            total_finished_found += len(items)
+            await self._put_listing_items(pipeline, 'finished', items)
+
+        pages = await self._fetch_pages_windowed(fetch_page, planned_pages, config.CRAWLER_PAGE_WINDOW, 'finished', on_page, stop_when=stop_policy)
+
+        if stop_policy and stop_policy.stopped_at_page:
+            print(f"[{self.source_name}] 이미 저장된 완결작만 있는 페이지가 연속되어 {pages} 페이지에서 증분 수집 종료.")
+        print(f"[{self.source_name}] '완결' 목록 {pages}/{planned_pages} 페이지 수집 완료 (누적 {total_finished_found}개)")
+
+    async def fetch_all_data(self, pipeline, finished_stop_policy=None):
         print(f"[{self.source_name}] 서버에서 최신 데이터를 가져옵니다...")
-        data_maps = {'all_content_today': {}, 'ongoing_today': {}, 'hiatus_today': {}, 'finished_today': {}}
-        async with aiohttp.ClientSession() as session:
-            await asyncio.gather(*[self._fetch_ongoing_category(session, day, uid, data_maps) for day, uid in DAY_TAB_UIDS.items()])
-            print(f"[{self.source_name}] '완결' 목록 수집 시작...")
-            total_finished_found = 0 # 👈 1. 수집한 완결작 총 개수
-            for page in range(1, 250): # 최대 25000개 (100 * 250)
-                try:
-                    items = await self._fetch_page_data(session, page=page, size=100, is_complete=True)
-                    if not items:
-                        print(f"[{self.source_name}] '완결' 목록 {page-1} 페이지에서 수집 종료.")
-                        break # 👈 2. 데이터 없으면 루프 탈출
-
-                    for item in items:
-                        content_id = str(item.get('seriesId'))
-                        total_finished_found += 1 # 👈 3. DB 저장 여부와 관계없이 무조건 카운트
-
-                        # (1) 전체 목록에 추가 (신규인 경우)
-                        if content_id not in data_maps['all_content_today']:
-                            data_maps['all_content_today'][content_id] = item
-
-                        # (2) 'finished_today' 맵에 무조건 추가 (가장 중요)
-                        # 👈 4. '연재중'이었다가 완결된 작품도 여기에 포함되어야 함
-                        data_maps['finished_today'][content_id] = item
-
-                    print(f"[{self.source_name}] '완결' {page} 페이지 수집 완료 (누적 {total_finished_found}개)")
-
-                    if total_finished_found >= 2000: # 👈 5. 총 수집 개수로 2000개 돌파 확인
-                        print(f"[{self.source_name}] 목표 수량({total_finished_found}개) 달성. 수집 종료.")
-                        break
-                except Exception:
-                    print(f"[{self.source_name}] '완결' 페이지 {page}에서 최종 실패.")
-                    break
-            for content in data_maps['all_content_today'].values():
-                if 'normalized_weekdays' in content: content['normalized_weekdays'] = list(content['normalized_weekdays'])
-        print(f"[{self.source_name}] 데이터 수집 완료: 총 {len(data_maps['all_content_today'])}개 고유 콘텐츠 확인")
-        return (data_maps['ongoing_today'], data_maps['hiatus_today'], data_maps['finished_today'], data_maps['all_content_today'])
-
-    def synchronize_database(self, conn, all_content_today, ongoing_today, hiatus_today, finished_today):
-        print(f"\n[{self.source_name}] DB 동기화를 시작합니다...")
-        cursor = get_cursor(conn)
-        # [BUG FIX] 업데이트 로직 강화를 위해 status와 meta도 함께 조회
-        cursor.execute("SELECT content_id, title, status, meta FROM contents WHERE source = %s", (self.source_name,))
-        db_data = {row['content_id']: {'title': row['title'], 'status': row['status'], 'meta': row['meta']} for row in cursor.fetchall()}
-
-        updates, inserts, unique_inserts_count = [], [], 0
-
-        for cid, cdata in all_content_today.items():
-            status = '완결' if cid in finished_today else '휴재' if cid in hiatus_today else '연재중'
-            title = cdata.get('title', '제목 없음')
-
-            # [수정] naver_webtoon_crawler.py와 동일한 표준 meta 구조로 변경
-            meta = {
-                "common": {
-                    "authors": [a.get('name') for a in cdata.get('authors', []) if a.get('name')],
-                    "thumbnail_url": cdata.get('thumbnail')
-                },
-                "attributes": {
-                    "weekdays": cdata.get('normalized_weekdays', [])
-                }
-            }
-
-            if cid in db_data:
-                # [BUG FIX] 제목, 상태, 메타데이터 중 하나라도 변경되면 업데이트
-                db_item = db_data[cid]
-                if db_item['title'] != title or db_item['status'] != status or db_item['meta'] != meta:
-                    updates.append(('webtoon', title, status, json.dumps(meta), cid, self.source_name))
-            else:
-                inserts.append((cid, self.source_name, 'webtoon', title, status, json.dumps(meta)))
-
-        if updates:
-            cursor.executemany("UPDATE contents SET content_type=%s, title=%s, status=%s, meta=%s WHERE content_id=%s AND source=%s", updates)
-            print(f"[{self.source_name}] {len(updates)}개 콘텐츠 정보 업데이트 완료.")
-        if inserts:
-            seen, u_inserts = set(), []
-            for i in inserts:
-                k = (i[0], i[1])
-                if k not in seen: u_inserts.append(i); seen.add(k)
-            cursor.executemany("INSERT INTO contents (content_id, source, content_type, title, status, meta) VALUES (%s, %s, %s, %s, %s, %s)", u_inserts)
-            unique_inserts_count = len(u_inserts)
-            print(f"[{self.source_name}] {unique_inserts_count}개 신규 콘텐츠 DB 추가 완료.")
-        conn.commit(); cursor.close(); print(f"[{self.source_name}] DB 동기화 완료.")
-        return unique_inserts_count
-
-    async def run_daily_check(self, conn):
-        from services.notification_service import send_completion_notifications
-        print(f"LOG: [{self.source_name}] 일일 점검 시작...")
-        cursor = get_cursor(conn)
-        cursor.execute("SELECT content_id, status FROM contents WHERE source = %s", (self.source_name,))
-        db_state = {row['content_id']: row['status'] for row in cursor.fetchall()}
-        cursor.close()
-        ongoing, hiatus, finished, all_content = await self.fetch_all_data()
-        newly_completed = {cid for cid, s in db_state.items() if s != '완결' and cid in finished}
-        print(f"LOG: [{self.source_name}] {len(newly_completed)}개 신규 완결 콘텐츠 발견.")
-        details, notified = [], 0
-        if newly_completed:
-            for cid in newly_completed:
-                if cid in all_content and 'title' in all_content[cid]:
-                    all_content[cid]['titleName'] = all_content[cid]['title']
-            try:
-                details, notified = send_completion_notifications(get_cursor(conn), newly_completed, all_content, self.source_name)
-            except ValueError as e:
-                print(f"경고: [{self.source_name}] 알림 발송 불가: {e}")
-        added = self.synchronize_database(conn, all_content, ongoing, hiatus, finished)
-        print(f"LOG: [{self.source_name}] 일일 점검 완료.")
-        return added, details, notified
+        async with self._session_scope() as session:
+            # 상태는 파이프라인 인덱스에서 마지막에 해석되므로 요일/완결 목록을 동시에 수집
+            await asyncio.gather(
+                *[self._fetch_ongoing_category(session, day, uid, pipeline) for day, uid in DAY_TAB_UIDS.items()],
+                self._fetch_finished_category(session, pipeline, finished_stop_policy),
+            )
+        print(f"[{self.source_name}] 데이터 수집 완료: 총 {len(pipeline.index)}개 고유 콘텐츠 확인")
 
 if __name__ == '__main__':
     print("KakaopageCrawler 구현 파일입니다. 직접 실행 시 별도 동작은 없습니다.")
@@ -4,15 +4,17 @@ import os
 import time
 import traceback
 import asyncio
-import aiohttp
-import json
 import sys
 from tenacity import retry, stop_after_attempt, wait_exponential
 from dotenv import load_dotenv
 
 import config
-from services.notification_service import send_completion_notifications
 from .base_crawler import ContentCrawler
+from .telemetry import record_retry
+from .content_record import ContentRecord, WEEKDAY_BITS
+from .pipeline import SEEN_ONGOING, SEEN_HIATUS, SEEN_FINISHED, SEEN_FINISHED_HIATUS
+from .work_queue import split_page_range
+from .run_history import record_crawl_run
 from database import get_cursor, create_standalone_connection, setup_database_standalone
 
 load_dotenv()
@@ -23,187 +25,115 @@ WEEKDAYS = config.WEEKDAYS
 class NaverWebtoonCrawler(ContentCrawler):
     """네이버 웹툰 크롤러"""
 
-    def __init__(self):
-        super().__init__('naver_webtoon')
+    FINISHED_MAX_PAGES = 150
+    FINISHED_LISTING_BY_RECENCY = True  # '완결' 목록을 order=UPDATE(최근 갱신순)로 요청
+    WEEKDAY_MAX_PAGES = 50  # You can adjust this if needed
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-    async def _fetch_from_api(self, session, url):
-        async with session.get(url, headers=HEADERS) as response:
-            response.raise_for_status()
-            data = await response.json()
-            return data.get('titleList', data.get('list', []))
+    def __init__(self, **kwargs):
+        super().__init__('naver_webtoon', **kwargs)
 
-    async def _fetch_paginated_finished_candidates(self, session):
-        all_candidates = {}
-        page = 1
-        MAX_PAGES = 150
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10), before_sleep=record_retry)
+    async def _fetch_from_api(self, session, url):
+        data = await self._request_json(session, 'GET', url, headers=HEADERS)
+        return data.get('titleList', data.get('list', []))
+
+    def _is_known_finished_item(self, webtoon, known_finished_ids):
+        return str(webtoon['titleId']) in known_finished_ids and not webtoon.get('rest', False)
+
+    def _resolve_status(self, flags):
+        # 요일 목록의 휴재 > 요일 목록의 연재중 > 완결 목록의 휴재(rest) > 완결
+        if flags & SEEN_HIATUS: return '휴재'
+        if flags & SEEN_ONGOING: return '연재중'
+        if flags & SEEN_FINISHED_HIATUS: return '휴재'
+        return '완결'
+
+    def _normalize(self, webtoon, weekday=None):
+        """API 응답 항목에서 DB에 저장하는 필드만 뽑아 ContentRecord를 만듭니다."""
+        author = webtoon.get('author')
+        return ContentRecord(
+            str(webtoon['titleId']), self.source_name, webtoon['titleName'],
+            authors=(author,) if author else (),
+            weekdays=WEEKDAY_BITS.get(weekday, 0),
+        )
+
+    def _listing_url(self, listing, page):
+        if listing == 'finished':
+            return f"{config.NAVER_API_URL}/finished?order=UPDATE&page={page}&pageSize=100"
+        api_day = listing.split(':', 1)[1]
+        return f"{config.NAVER_API_URL}/weekday?week={api_day}&page={page}&pageSize=100"
+
+    async def _fetch_listing_page(self, session, listing, page):
+        # 네이버 API는 마지막 페이지 여부를 알려주지 않으므로 빈 페이지로 종료를 판단
+        return await self._fetch_from_api(session, self._listing_url(listing, page)), False
+
+    async def _put_listing_items(self, pipeline, listing, webtoons):
+        if listing == 'finished':
+            for webtoon in webtoons:
+                flag = SEEN_FINISHED_HIATUS if webtoon.get('rest', False) else SEEN_FINISHED
+                await pipeline.put(self._normalize(webtoon), flag)
+        else:
+            weekday = WEEKDAYS[listing.split(':', 1)[1]]
+            for webtoon in webtoons:
+                flag = SEEN_HIATUS if webtoon.get('rest', False) else SEEN_ONGOING
+                await pipeline.put(self._normalize(webtoon, weekday), flag)
+
+    async def plan_work_units(self, session):
+        units = [(f"weekday:{api_day}", 1, self.WEEKDAY_MAX_PAGES) for api_day in WEEKDAYS]
+        units += split_page_range('finished', 1, self.FINISHED_MAX_PAGES, config.CRAWLER_WORK_UNIT_PAGES)
+        return units
+
+    async def _fetch_paginated_finished_candidates(self, session, pipeline, stop_policy=None):
+        MAX_PAGES = self.FINISHED_MAX_PAGES
         print("\n'완결/장기 휴재 후보' 목록 확보를 위해 페이지네이션 수집 시작...")
-        while page <= MAX_PAGES:
-            try:
-                api_url = f"{config.NAVER_API_URL}/finished?order=UPDATE&page={page}&pageSize=100"
-                webtoons_on_page = await self._fetch_from_api(session, api_url)
-                if not webtoons_on_page:
-                    print(f"  -> {page-1} 페이지에서 수집 종료 (데이터 없음).")
-                    break
-                for webtoon in webtoons_on_page:
-                    if webtoon['titleId'] not in all_candidates:
-                        all_candidates[webtoon['titleId']] = webtoon
-                print(f"  -> {page} 페이지 수집 완료. (현재 후보군: {len(all_candidates)}개)")
-                page += 1
-                await asyncio.sleep(0.1)
-            except Exception as e:
-                print(f"  -> {page} 페이지 수집 중 오류 발생: {e}")
-                break
-        if page > MAX_PAGES:
+
+        async def fetch_page(page):
+            api_url = self._listing_url('finished', page)
+            return await self._fetch_page_checkpointed('finished', page, lambda: self._fetch_from_api(session, api_url))
+
+        async def on_page(page, webtoons_on_page):
+            await self._put_listing_items(pipeline, 'finished', webtoons_on_page)
+            print(f"  -> {page} 페이지 수집 완료. (현재 누적 작품: {len(pipeline.index)}개)")
+
+        # 페이지를 하나씩 순차 요청하는 대신, 최대 N개의 페이지를 동시에 요청하며 도착 순서와 무관하게 페이지 순서대로 처리
+        pages = await self._fetch_pages_windowed(fetch_page, MAX_PAGES, config.CRAWLER_PAGE_WINDOW, 'finished', on_page, stop_when=stop_policy)
+
+        if stop_policy and stop_policy.stopped_at_page:
+            print(f"  -> 이미 저장된 완결작만 있는 페이지가 {stop_policy.known_streak}번 연속되어 {pages} 페이지에서 증분 수집 종료.")
+        elif pages >= MAX_PAGES:
             print(f"  -> 최대 {MAX_PAGES} 페이지까지 수집하여 종료합니다.")
-        return all_candidates
+        else:
+            print(f"  -> {pages} 페이지에서 수집 종료 (데이터 없음).")
 
-    async def _fetch_paginated_weekday_data(self, session, api_day):
-        all_candidates = {}
+    async def _fetch_paginated_weekday_data(self, session, api_day, pipeline):
         page = 1
-        MAX_PAGES = 50  # You can adjust this if needed
+        listing = f"weekday:{api_day}"
         # print(f"\n'{api_day}' 요일 웹툰 목록 확보를 위해 페이지네이션 수집 시작...")
-        while page <= MAX_PAGES:
+        while page <= self.WEEKDAY_MAX_PAGES:
             try:
-                api_url = f"{config.NAVER_API_URL}/weekday?week={api_day}&page={page}&pageSize=100"
-                webtoons_on_page = await self._fetch_from_api(session, api_url)
+                api_url = self._listing_url(listing, page)
+                webtoons_on_page = await self._fetch_page_checkpointed(listing, page, lambda: self._fetch_from_api(session, api_url))
                 if not webtoons_on_page:
                     # print(f"  -> {api_day}: {page-1} 페이지에서 수집 종료 (데이터 없음).")
                     break
-                for webtoon in webtoons_on_page:
-                    if webtoon['titleId'] not in all_candidates:
-                        all_candidates[webtoon['titleId']] = webtoon
-                # print(f"  -> {api_day}: {page} 페이지 수집 완료. (현재 후보군: {len(all_candidates)}개)")
+                await self._put_listing_items(pipeline, listing, webtoons_on_page)
                 page += 1
-                await asyncio.sleep(0.1)
             except Exception as e:
-                # print(f"  -> {api_day}: {page} 페이지 수집 중 오류 발생: {e}")
+                print(f"❌ '{api_day}'요일 {page} 페이지 수집 실패: {e}")
+                self._record_page_failure(listing, page, e)
                 break
-        # if page > MAX_PAGES:
-        #     print(f"  -> {api_day}: 최대 {MAX_PAGES} 페이지까지 수집하여 종료합니다.")
-        return all_candidates
 
-    async def fetch_all_data(self):
+    async def fetch_all_data(self, pipeline, finished_stop_policy=None):
         print("네이버 웹툰 서버에서 오늘의 최신 데이터를 가져옵니다...")
-        async with aiohttp.ClientSession() as session:
-            ongoing_tasks = [self._fetch_paginated_weekday_data(session, api_day) for api_day in WEEKDAYS.keys()]
-            ongoing_results = await asyncio.gather(*ongoing_tasks, return_exceptions=True)
-            finished_candidates = await self._fetch_paginated_finished_candidates(session)
-
-        print("\n--- 데이터 수집 결과 ---")
-        naver_ongoing_today, naver_hiatus_today, naver_finished_today = {}, {}, {}
-        api_days = list(WEEKDAYS.keys())
-        for i, result in enumerate(ongoing_results):
-            day_key = api_days[i]
+        async with self._session_scope() as session:
+            ongoing_tasks = [self._fetch_paginated_weekday_data(session, api_day, pipeline) for api_day in WEEKDAYS.keys()]
+            # '완결' 목록 수집을 요일별 수집과 동시에 진행
+            finished_task = self._fetch_paginated_finished_candidates(session, pipeline, finished_stop_policy)
+            results = await asyncio.gather(*ongoing_tasks, finished_task, return_exceptions=True)
+
+        for result in results:
             if isinstance(result, Exception):
-                print(f"❌ '{day_key}'요일 데이터 수집 실패: {result}")
-                continue
-
-            for webtoon in result.values():
-                titleId = webtoon['titleId']
-
-                if titleId not in naver_ongoing_today:
-                    naver_ongoing_today[titleId] = webtoon
-                    naver_ongoing_today[titleId]['normalized_weekdays'] = set()
-
-                naver_ongoing_today[titleId]['normalized_weekdays'].add(WEEKDAYS[day_key])
-
-                if webtoon.get('rest', False):
-                    naver_hiatus_today[titleId] = webtoon
-
-        print("  -> 수집된 요일 정보를 list로 변환합니다...")
-        for webtoon in naver_ongoing_today.values():
-            webtoon['normalized_weekdays'] = list(webtoon['normalized_weekdays'])
-
-        for tid, data in finished_candidates.items():
-            if tid not in naver_ongoing_today and tid not in naver_hiatus_today:
-                if data.get('rest', False):
-                    naver_hiatus_today[tid] = data
-                else:
-                    naver_finished_today[tid] = data
-
-        all_naver_webtoons_today = {**naver_finished_today, **naver_hiatus_today, **naver_ongoing_today}
-        print(f"오늘자 데이터 수집 완료: 총 {len(all_naver_webtoons_today)}개 고유 웹툰 확인")
-        return naver_ongoing_today, naver_hiatus_today, naver_finished_today, all_naver_webtoons_today
-
-    def synchronize_database(self, conn, all_naver_webtoons_today, naver_ongoing_today, naver_hiatus_today, naver_finished_today):
-        print("\nDB를 오늘의 최신 상태로 전체 동기화를 시작합니다...")
-        cursor = get_cursor(conn)
-        cursor.execute("SELECT content_id FROM contents WHERE source = %s", (self.source_name,))
-        db_existing_ids = {row['content_id'] for row in cursor.fetchall()}
-        updates, inserts = [], []
-
-        for content_id, webtoon_data in all_naver_webtoons_today.items():
-            status = ''
-            if content_id in naver_finished_today: status = '완결'
-            elif content_id in naver_hiatus_today: status = '휴재'
-            elif content_id in naver_ongoing_today: status = '연재중'
-            else: continue
-
-            author = webtoon_data.get('author')
-            meta_data = {
-                "common": {
-                    "authors": [author] if author else [],
-                    "thumbnail_url": None
-                },
-                "attributes": {
-                    "weekdays": webtoon_data.get('normalized_weekdays', [])
-                }
-            }
-
-            if content_id in db_existing_ids:
-                record = ('webtoon', webtoon_data['titleName'], status, json.dumps(meta_data), content_id, self.source_name)
-                updates.append(record)
-            else:
-                record = (content_id, self.source_name, 'webtoon', webtoon_data['titleName'], status, json.dumps(meta_data))
-                inserts.append(record)
-
-        if updates:
-            cursor.executemany("UPDATE contents SET content_type=%s, title=%s, status=%s, meta=%s WHERE content_id=%s AND source=%s", updates)
-            print(f"{len(updates)}개 웹툰 정보 업데이트 완료.")
-
-        if inserts:
-            # === 🚨 [버그 수정] INSERT 리스트의 잠재적 중복 제거 ===
-            seen_keys = set()
-            unique_inserts = []
-            for record in inserts:
-                key = (record[0], record[1]) # (content_id, source)
-                if key not in seen_keys:
-                    unique_inserts.append(record)
-                    seen_keys.add(key)
-            # =======================================================
-
-            cursor.executemany("INSERT INTO contents (content_id, source, content_type, title, status, meta) VALUES (%s, %s, %s, %s, %s, %s)", unique_inserts) # 👈 unique_inserts 사용
-            print(f"{len(unique_inserts)}개 신규 웹툰 DB 추가 완료. (중복 {len(inserts) - len(unique_inserts)}개 제거)")
-
-        conn.commit()
-        cursor.close()
-        print("DB 동기화 완료.")
-        return len(unique_inserts)
-
-    async def run_daily_check(self, conn):
-        print("LOG: run_daily_check started.")
-        cursor = get_cursor(conn)
-        print(f"=== {self.source_name} 일일 점검 시작 ===")
-        cursor.execute("SELECT content_id, status FROM contents WHERE source = %s", (self.source_name,))
-        db_state_before_sync = {row['content_id']: row['status'] for row in cursor.fetchall()}
-        cursor.close()
-        print("LOG: Initial database state loaded.")
-
-        ongoing, hiatus, finished, all_content = await self.fetch_all_data()
-        print("LOG: Data fetched from API.")
-
-        newly_completed_ids = {cid for cid, s in db_state_before_sync.items() if s in ('연재중', '휴재') and cid in finished}
-        print(f"LOG: Found {len(newly_completed_ids)} newly completed items.")
-
-        details, notified = send_completion_notifications(get_cursor(conn), newly_completed_ids, all_content, self.source_name)
-        print("LOG: Notification service executed.")
-
-        added = self.synchronize_database(conn, all_content, ongoing, hiatus, finished)
-        print("LOG: Database synchronization executed.")
-
-        print("\n=== 일일 점검 완료 ===")
-        return added, details, notified
+                print(f"❌ 데이터 수집 실패: {result}")
+        print(f"오늘자 데이터 수집 완료: 총 {len(pipeline.index)}개 고유 웹툰 확인")
 
 if __name__ == '__main__':
     print("==========================================")
@@ -249,17 +179,8 @@ if __name__ == '__main__':
         report_conn = None
         try:
             report_conn = create_standalone_connection()
-            report_cursor = get_cursor(report_conn)
-            print(f"LOG: Saving report to 'daily_crawler_reports' table...")
-            report_cursor.execute(
-                """
-                INSERT INTO daily_crawler_reports (crawler_name, status, report_data)
-                VALUES (%s, %s, %s)
-                """,
-                (CRAWLER_DISPLAY_NAME, report['status'], json.dumps(report))
-            )
-            report_conn.commit()
-            report_cursor.close()
+            print(f"LOG: Saving report to 'crawl_run_history' table...")
+            record_crawl_run(report_conn, CRAWLER_DISPLAY_NAME, report)
             print("LOG: Report saved successfully.")
         except Exception as report_e:
             print(f"FATAL: [실패] 보고서 DB 저장 실패: {report_e}", file=sys.stderr)
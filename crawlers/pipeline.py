@@ -0,0 +1,199 @@
+# crawlers/pipeline.py
+
+import asyncio
+import json
+
+import config
+from database import ensure_source_partition, get_cursor
+from .bulk_sync import copy_rows, upsert_contents
+from .content_record import decode_weekdays
+from .status_history import record_status_transitions
+
+# 수집 중 작품별로 관찰된 상태 플래그 (여러 목록에서 관찰되면 OR로 누적)
+SEEN_ONGOING = 1           # 요일 목록에서 연재중으로 관찰
+SEEN_HIATUS = 2            # 요일 목록에서 휴재로 관찰
+SEEN_FINISHED = 4          # 완결 목록에서 관찰
+SEEN_FINISHED_HIATUS = 8   # 완결 목록에서 휴재(rest)로 관찰
+
+STAGING_TABLE = 'content_sync_staging'
+STATUS_TABLE = 'content_sync_status'
+
+_DONE = object()
+
+
+class ContentSyncPipeline:
+    """
+    수집(producer)과 DB 기록(consumer)을 겹쳐서 진행하는 스트리밍 동기화 파이프라인입니다.
+
+    - 크롤러는 페이지가 도착하는 대로 정규화된 레코드를 put()으로 넘깁니다.
+    - 처음 관찰된 작품의 레코드(제목/작가/썸네일)만 bounded queue를 거쳐
+      CRAWLER_SYNC_BATCH_SIZE 단위로 임시 스테이징 테이블에 COPY됩니다.
+    - 상태와 요일은 여러 목록을 모두 본 뒤에야 확정되므로, 수집 중에는
+      {content_id: [상태 플래그, 요일 비트마스크]} 형태의 작은 인덱스만 메모리에 유지하고
+      finish()에서 한 번에 해석해 스테이징 테이블에 반영합니다.
+
+    conn이 None이면 DB 기록 없이 인덱스만 유지합니다. (벤치마크용)
+    """
+
+    def __init__(self, conn, source, resolve_status, executor=None, batch_size=None, queue_size=None):
+        self.conn = conn
+        self.source = source
+        self.resolve_status = resolve_status
+        self.executor = executor
+        self.batch_size = batch_size or config.CRAWLER_SYNC_BATCH_SIZE
+        self.index = {}
+        self.staged_count = 0
+        self.flush_count = 0
+        self.flush_seconds = 0.0
+        self._queue = asyncio.Queue(maxsize=queue_size or config.CRAWLER_SYNC_QUEUE_SIZE)
+        self._consumer = None
+        self._error = None
+
+    async def __aenter__(self):
+        await self._in_executor(self._create_staging_table)
+        self._consumer = asyncio.ensure_future(self._consume())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._consumer and not self._consumer.done():
+            self._consumer.cancel()
+            await asyncio.gather(self._consumer, return_exceptions=True)
+        return False
+
+    async def _in_executor(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def put(self, record, flag):
+        """
+        ContentRecord 하나를 파이프라인에 넘깁니다.
+        같은 작품이 여러 목록에서 관찰되면 플래그와 요일 비트마스크만 누적됩니다.
+        """
+        if self._error:
+            raise self._error
+        entry = self.index.get(record.content_id)
+        if entry is None:
+            self.index[record.content_id] = [flag, record.weekdays]
+            await self._queue.put(record)
+        else:
+            entry[0] |= flag
+            entry[1] |= record.weekdays
+
+    async def finish(self):
+        """남은 레코드를 모두 기록한 뒤, 인덱스로 상태/요일을 확정해 스테이징 테이블에 반영합니다."""
+        await self._queue.put(_DONE)
+        await self._consumer
+        if self._error:
+            raise self._error
+        statuses = [
+            (content_id, self.resolve_status(flags), json.dumps(decode_weekdays(bits)))
+            for content_id, (flags, bits) in self.index.items()
+        ]
+        await self._in_executor(self._apply_statuses, statuses)
+
+    def status_counts(self):
+        counts = {}
+        for flags, _ in self.index.values():
+            status = self.resolve_status(flags)
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    async def _consume(self):
+        batch = []
+        while True:
+            record = await self._queue.get()
+            if record is _DONE:
+                break
+            if self._error:
+                continue # 기록 실패 후에도 producer가 막히지 않도록 큐는 계속 비움
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                await self._flush(batch)
+                batch = []
+        if batch and not self._error:
+            await self._flush(batch)
+
+    async def _flush(self, batch):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            await self._in_executor(self._write_batch, batch)
+        except Exception as e:
+            print(f"FATAL: [{self.source}] 스테이징 테이블 기록 실패: {e}")
+            self._error = e
+            return
+        self.flush_count += 1
+        self.flush_seconds += loop.time() - started
+        self.staged_count += len(batch)
+
+    # --- 아래 메서드는 executor 스레드에서 실행됩니다 (블로킹 psycopg2) ---
+
+    def _create_staging_table(self):
+        if self.conn is None:
+            return
+        cursor = get_cursor(self.conn)
+        cursor.execute(f"""
+            CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+                content_id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                authors JSONB NOT NULL,
+                thumbnail_url TEXT,
+                status TEXT,
+                weekdays JSONB
+            )""")
+        cursor.execute(f"TRUNCATE {STAGING_TABLE}")
+        self.conn.commit()
+        cursor.close()
+
+    def _write_batch(self, batch):
+        if self.conn is None:
+            return
+        cursor = get_cursor(self.conn)
+        # 한 실행 안에서 content_id는 처음 관찰될 때 한 번만 큐에 들어오므로 중복 없이 COPY 가능
+        copy_rows(
+            cursor, STAGING_TABLE, ('content_id', 'title', 'authors', 'thumbnail_url'),
+            ((r.content_id, r.title, json.dumps(r.authors), r.thumbnail_url) for r in batch)
+        )
+        self.conn.commit()
+        cursor.close()
+
+    def _apply_statuses(self, statuses):
+        if self.conn is None:
+            return
+        cursor = get_cursor(self.conn)
+        cursor.execute(f"""
+            CREATE TEMP TABLE IF NOT EXISTS {STATUS_TABLE} (
+                content_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                weekdays JSONB
+            )""")
+        cursor.execute(f"TRUNCATE {STATUS_TABLE}")
+        copy_rows(cursor, STATUS_TABLE, ('content_id', 'status', 'weekdays'), statuses)
+        cursor.execute(f"""
+            UPDATE {STAGING_TABLE} AS s SET status = v.status, weekdays = v.weekdays
+            FROM {STATUS_TABLE} v
+            WHERE s.content_id = v.content_id
+            """)
+        cursor.execute(f"DROP TABLE {STATUS_TABLE}")
+        self.conn.commit()
+        cursor.close()
+
+
+def merge_staging_into_contents(conn, source, content_type, crawl_run_id=None):
+    """
+    스테이징 테이블을 contents에 한 번의 INSERT ... ON CONFLICT로 반영하고 스테이징 테이블을 정리합니다.
+    crawl_run_id가 있으면 반영 전에 상태 변화를 content_status_history에 기록하며,
+    이력과 contents 반영은 같은 트랜잭션으로 커밋됩니다.
+    새 source면 contents 파티션을 먼저 만들고, 반영은 파티션에 직접 씁니다. (다른 source의 파티션은 건드리지 않음)
+    Returns: (inserted, updated, {transition: 건수})
+    """
+    cursor = get_cursor(conn)
+    target_table = ensure_source_partition(cursor, source)
+    transitions = {}
+    if crawl_run_id is not None:
+        transitions = record_status_transitions(cursor, STAGING_TABLE, source, crawl_run_id)
+    inserted, updated = upsert_contents(cursor, STAGING_TABLE, source, content_type, target_table)
+    cursor.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+    conn.commit()
+    cursor.close()
+    return inserted, updated, transitions
@@ -0,0 +1,154 @@
+# crawlers/run_history.py
+"""
+크롤러 실행 이력(crawl_run_history)과 일별 집계(crawl_run_daily_rollups)입니다.
+
+- 크롤러 실행 결과는 crawl_run_id를 키로 월 단위 RANGE 파티션에 쌓이고, 보고서 발송 후에는 reported_at만 채워
+  (TRUNCATE하지 않음) 실행 시간/페이지 수/쓰기 행 수의 추세를 비교할 수 있게 보관합니다.
+- 기록할 때마다 그날의 크롤러별 집계(p50/p95 실행 시간, 페이지 수, 쓰기 행 수)를 다시 계산합니다.
+- 보관 기간(config.CRAWL_HISTORY_RETENTION_MONTHS)이 지난 월 파티션은 rotate_run_history가 통째로 삭제합니다.
+- 보고서의 '이전' 값은 별도 테이블 없이 이력에서 크롤러별로 직전에 발송된 실행을 읽습니다.
+"""
+import datetime
+import json
+
+import config
+from database import drop_expired_partitions, ensure_monthly_partitions
+
+HISTORY_TABLE = 'crawl_run_history'
+
+
+def _pages_fetched(report):
+    pages = (report.get('telemetry') or {}).get('pages') or {}
+    return sum(counts.get('fetched', 0) for counts in pages.values())
+
+
+def record_crawl_run(conn, crawler_name, report):
+    """
+    크롤러 한 번의 실행 결과를 이력에 기록하고 그날의 집계를 갱신합니다.
+    동기화 전에 실패해 crawl_run_id가 없는 실행은 crawl_run_id_seq에서 새 id를 받습니다.
+    Returns: crawl_run_id
+    """
+    cursor = conn.cursor()
+    ensure_monthly_partitions(cursor, HISTORY_TABLE)
+    cursor.execute(
+        f"""
+        INSERT INTO {HISTORY_TABLE} (crawl_run_id, crawler_name, status, duration, pages, rows_written, report_data)
+        VALUES (COALESCE(%s, nextval('crawl_run_id_seq')), %s, %s, %s, %s, %s, %s)
+        RETURNING crawl_run_id, created_at
+        """,
+        (report.get('crawl_run_id'), crawler_name, report['status'], report.get('duration'),
+         _pages_fetched(report), report.get('rows_written', 0), json.dumps(report))
+    )
+    crawl_run_id, created_at = cursor.fetchone()
+    refresh_daily_rollups(cursor, created_at.date(), crawler_name)
+    conn.commit()
+    cursor.close()
+    return crawl_run_id
+
+
+def refresh_daily_rollups(cursor, day, crawler_name=None):
+    """day(와 crawler_name)의 집계를 원본 이력에서 다시 계산합니다. 실행 시간 분위수는 '성공' 실행만 사용합니다."""
+    cursor.execute(
+        f"""
+        INSERT INTO crawl_run_daily_rollups
+            (day, crawler_name, runs, failures, p50_duration, p95_duration, pages, rows_written, updated_at)
+        SELECT %(day)s::date, crawler_name, COUNT(*), COUNT(*) FILTER (WHERE status = '실패'),
+               percentile_cont(0.5) WITHIN GROUP (ORDER BY duration) FILTER (WHERE status = '성공'),
+               percentile_cont(0.95) WITHIN GROUP (ORDER BY duration) FILTER (WHERE status = '성공'),
+               SUM(pages), SUM(rows_written), NOW()
+        FROM {HISTORY_TABLE}
+        WHERE created_at >= %(day)s::date AND created_at < %(day)s::date + 1
+          AND (%(crawler)s::text IS NULL OR crawler_name = %(crawler)s)
+        GROUP BY crawler_name
+        ON CONFLICT (crawler_name, day) DO UPDATE SET
+            runs = EXCLUDED.runs, failures = EXCLUDED.failures,
+            p50_duration = EXCLUDED.p50_duration, p95_duration = EXCLUDED.p95_duration,
+            pages = EXCLUDED.pages, rows_written = EXCLUDED.rows_written, updated_at = NOW()
+        """,
+        {'day': day, 'crawler': crawler_name}
+    )
+
+
+def rotate_run_history(cursor, today=None):
+    """다음 달 파티션을 미리 만들고 보관 기간이 지난 파티션을 삭제합니다. Returns: 삭제한 파티션 이름 목록"""
+    ensure_monthly_partitions(cursor, HISTORY_TABLE, start=today)
+    return drop_expired_partitions(cursor, HISTORY_TABLE, config.CRAWL_HISTORY_RETENTION_MONTHS, today)
+
+
+def fetch_unreported_runs(cursor):
+    """아직 보고서로 발송되지 않은 실행 (오래된 순)"""
+    cursor.execute(
+        f"""
+        SELECT crawl_run_id, crawler_name, status, duration, report_data, created_at
+        FROM {HISTORY_TABLE} WHERE reported_at IS NULL ORDER BY created_at
+        """
+    )
+    return cursor.fetchall()
+
+
+def fetch_previous_reports(cursor, before):
+    """크롤러별로 직전에 발송된 실행의 report_data (본문의 '이전' 값 비교용)"""
+    cursor.execute(
+        f"""
+        SELECT DISTINCT ON (crawler_name) crawler_name, report_data
+        FROM {HISTORY_TABLE}
+        WHERE reported_at IS NOT NULL AND created_at < %s AND report_data ? 'telemetry'
+        ORDER BY crawler_name, created_at DESC
+        """,
+        (before,)
+    )
+    return {row['crawler_name']: row['report_data'] for row in cursor.fetchall()}
+
+
+def mark_reported(cursor, runs):
+    """발송한 실행에 reported_at을 기록합니다."""
+    if not runs:
+        return
+    cursor.execute(
+        f"""
+        UPDATE {HISTORY_TABLE} SET reported_at = NOW()
+        WHERE reported_at IS NULL AND created_at >= %s AND crawl_run_id = ANY(%s)
+        """,
+        (min(run['created_at'] for run in runs), [run['crawl_run_id'] for run in runs])
+    )
+
+
+def crawl_trends(cursor, runs):
+    """
+    보고할 실행마다 직전 CRAWL_TREND_BASELINE_DAYS일의 일별 p50 실행 시간의 중앙값(기준선)과 비교합니다.
+    기준선 일수가 CRAWL_TREND_MIN_DAYS보다 적거나 '성공'이 아닌 실행은 판정하지 않습니다.
+    Returns: {crawler_name: {'runs': [...], 'daily': [최근 일별 집계]}}
+    """
+    trends = {}
+    for run in runs:
+        name = run['crawler_name']
+        day = run['created_at'].date()
+        cursor.execute(
+            """
+            SELECT percentile_cont(0.5) WITHIN GROUP (ORDER BY p50_duration) AS baseline, COUNT(*) AS days
+            FROM crawl_run_daily_rollups
+            WHERE crawler_name = %s AND day >= %s AND day < %s AND p50_duration IS NOT NULL
+            """,
+            (name, day - datetime.timedelta(days=config.CRAWL_TREND_BASELINE_DAYS), day)
+        )
+        row = cursor.fetchone()
+        baseline = row['baseline'] if row['days'] >= config.CRAWL_TREND_MIN_DAYS else None
+        ratio = run['duration'] / baseline if baseline and run['duration'] is not None and run['status'] == '성공' else None
+        entry = trends.setdefault(name, {'runs': [], 'daily': []})
+        entry['runs'].append({
+            'crawl_run_id': run['crawl_run_id'], 'duration': run['duration'], 'baseline': baseline,
+            'baseline_days': row['days'], 'ratio': ratio,
+            'slow': ratio is not None and ratio >= config.CRAWL_TREND_SLOW_RATIO,
+        })
+
+    for name, entry in trends.items():
+        cursor.execute(
+            """
+            SELECT day, runs, failures, p50_duration, p95_duration, pages, rows_written
+            FROM crawl_run_daily_rollups
+            WHERE crawler_name = %s ORDER BY day DESC LIMIT %s
+            """,
+            (name, config.CRAWL_TREND_DAYS_SHOWN)
+        )
+        entry['daily'] = list(reversed(cursor.fetchall()))
+    return trends
@@ -0,0 +1,141 @@
+# crawlers/snapshots.py
+"""
+카탈로그 스냅샷 게시입니다.
+
+동기화로 카탈로그가 바뀌면 /api/contents/ongoing, /hiatus, /completed 응답을 content_type별,
+페이지(next_cursor 체인)별로 미리 만들어 catalog_snapshots에 저장합니다.
+- 본문은 실시간 조회와 같은 인코더(services.catalog.encode_payload)로 직렬화되고 gzip/brotli 압축본과 함께 저장되며,
+  본문의 sha256이 ETag가 됩니다.
+- Flask 뷰는 스냅샷이 있으면 저장된 바이트를 그대로 보내고, 없을 때(임의의 cursor 등)만 실시간으로 조회합니다.
+- 동기화한 크롤러의 content_type만 다시 렌더링합니다. 렌더링은 잠금 없이 하고, 교체(DELETE/INSERT)와
+  catalog_generation 증가만 한 트랜잭션에서 하므로 응답 캐시(services/response_cache.py)도 함께 무효화됩니다.
+brotli 패키지가 없으면 gzip 압축본만 만듭니다.
+"""
+import gzip
+import time
+
+import psycopg2
+import psycopg2.extras
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+import config
+from database import bump_catalog_generation, get_cursor
+from services.catalog import (
+    PAGED_STATUSES, build_ongoing_payload, build_status_page_payload, encode_payload,
+    payload_etag, snapshot_key,
+)
+
+
+def render_catalog_snapshots(cursor, content_type):
+    """content_type의 게시할 (스냅샷 이름, 응답 payload)를 차례로 만듭니다."""
+    yield snapshot_key('ongoing', content_type), build_ongoing_payload(cursor, content_type)
+    for endpoint, status in PAGED_STATUSES.items():
+        # 클라이언트가 next_cursor를 따라가며 요청하는 페이지를 그대로 만듦
+        last_title = None
+        while True:
+            payload = build_status_page_payload(cursor, status, content_type, last_title)
+            yield snapshot_key(endpoint, content_type, last_title=last_title), payload
+            last_title = payload['next_cursor']
+            if not last_title:
+                break
+
+
+def _snapshot_row(content_type, key, payload):
+    body = encode_payload(payload)
+    body_gzip = gzip.compress(body, compresslevel=config.CATALOG_SNAPSHOT_GZIP_LEVEL, mtime=0)
+    body_br = brotli.compress(body, quality=config.CATALOG_SNAPSHOT_BROTLI_QUALITY) if brotli else None
+    return key, content_type, payload_etag(body), body, body_gzip, body_br
+
+
+def _published_versions(cursor, content_types):
+    """content_type별 마지막으로 게시된 세대 (교체 전후 비교용)"""
+    cursor.execute(
+        "SELECT content_type, MAX(generation) AS generation FROM catalog_snapshots "
+        "WHERE content_type = ANY(%s) GROUP BY content_type",
+        (list(content_types),)
+    )
+    return {row['content_type']: row['generation'] for row in cursor.fetchall()}
+
+
+def publish_catalog_snapshots(conn, content_types=None):
+    """
+    content_types(None이면 contents의 모든 content_type)의 스냅샷을 다시 만들어 교체하고 카탈로그 세대를 올립니다.
+    렌더링은 잠금 없이 하고, 세대 행을 잠근 뒤 교체합니다. 렌더링하는 동안 다른 크롤러가 같은 content_type을
+    먼저 교체했으면 그 크롤러의 렌더링에 이번 동기화가 빠졌을 수 있으므로 다시 렌더링합니다.
+    (마지막으로 교체한 렌더링은 그 전에 커밋된 모든 동기화를 포함함)
+    Returns: {'generation', 'snapshots', 'bytes', 'gzip_bytes', 'br_bytes', 'renders', 'seconds'}
+    """
+    started = time.monotonic()
+    cursor = get_cursor(conn)
+    if content_types is None:
+        cursor.execute("SELECT DISTINCT content_type FROM contents ORDER BY content_type")
+        content_types = [row['content_type'] for row in cursor.fetchall()]
+    content_types = sorted(set(content_types))
+
+    renders = 0
+    while True:
+        renders += 1
+        versions = _published_versions(cursor, content_types)
+        rows = [
+            _snapshot_row(content_type, key, payload)
+            for content_type in content_types
+            for key, payload in render_catalog_snapshots(cursor, content_type)
+        ]
+        conn.commit()
+
+        generation = bump_catalog_generation(cursor)
+        if _published_versions(cursor, content_types) == versions:
+            break
+        conn.rollback()
+        print(f"LOG: [Snapshots] 렌더링 중 다른 게시가 {content_types} 스냅샷을 교체했습니다. 다시 렌더링합니다.")
+
+    cursor.execute("DELETE FROM catalog_snapshots WHERE content_type = ANY(%s)", (content_types,))
+    psycopg2.extras.execute_values(
+        cursor,
+        "INSERT INTO catalog_snapshots (snapshot_key, content_type, generation, etag, body, body_gzip, body_br) VALUES %s",
+        [(key, content_type, generation, etag, psycopg2.Binary(body), psycopg2.Binary(body_gzip),
+          psycopg2.Binary(body_br) if body_br is not None else None)
+         for key, content_type, etag, body, body_gzip, body_br in rows],
+        page_size=50
+    )
+    conn.commit()
+    cursor.close()
+    return {
+        'generation': generation,
+        'snapshots': len(rows),
+        'bytes': sum(len(row[3]) for row in rows),
+        'gzip_bytes': sum(len(row[4]) for row in rows),
+        'br_bytes': sum(len(row[5]) for row in rows if row[5] is not None),
+        'renders': renders,
+        'seconds': round(time.monotonic() - started, 3),
+    }
+
+
+def discard_catalog_snapshots(conn, content_types):
+    """
+    content_types의 스냅샷을 지우고 카탈로그 세대를 올립니다. (게시에 실패했을 때 오래된 스냅샷 대신
+    실시간 조회로 응답하도록 함)
+    """
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM catalog_snapshots WHERE content_type = ANY(%s)", (list(content_types),))
+    bump_catalog_generation(cursor)
+    conn.commit()
+    cursor.close()
+
+
+def catalog_snapshots_exist(conn, content_type=None):
+    """게시된 스냅샷이 있는지 (content_type을 지정하면 그 content_type만 확인)"""
+    cursor = conn.cursor()
+    if content_type is None:
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM catalog_snapshots) AS present")
+    else:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM catalog_snapshots WHERE content_type = %s) AS present", (content_type,))
+    present = cursor.fetchone()[0]
+    conn.commit()
+    cursor.close()
+    return present
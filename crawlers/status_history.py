@@ -0,0 +1,97 @@
+# crawlers/status_history.py
+"""
+작품 상태 변화 이력(content_status_history)입니다.
+
+동기화 직전에 스테이징된 오늘 데이터와 contents를 SQL로 비교해 상태가 바뀐 작품만 이력에 남깁니다.
+- new        : contents에 없던 작품
+- hiatus     : 연재중 → 휴재
+- resumed    : 휴재 → 연재중
+- completed  : 연재중/휴재 → 완결
+- unfinished : 완결 → 연재중/휴재
+각 행에는 크롤러 실행 단위의 crawl_run_id가 붙으며, 완결 알림과 /api/contents/changes는 이 이력을 읽습니다.
+완결 이력은 알림을 보낸 뒤 notified_at이 채워지며, 알림 전에 실행이 중단되거나 발송이 실패하면
+다음 실행에서 다시 발송합니다.
+"""
+from database import ensure_monthly_partitions, get_cursor
+from .content_record import ContentRecord
+
+TRANSITION_SQL = """CASE
+    WHEN c.status IS NULL THEN 'new'
+    WHEN s.status = '완결' THEN 'completed'
+    WHEN c.status = '완결' THEN 'unfinished'
+    WHEN s.status = '휴재' THEN 'hiatus'
+    ELSE 'resumed'
+END"""
+
+
+def next_crawl_run_id(conn):
+    cursor = get_cursor(conn)
+    cursor.execute("SELECT nextval('crawl_run_id_seq') AS id")
+    crawl_run_id = cursor.fetchone()['id']
+    conn.commit()
+    cursor.close()
+    return crawl_run_id
+
+
+def record_status_transitions(cursor, staging_table, source, crawl_run_id):
+    """
+    스테이징 테이블과 contents의 상태가 다른 작품을 이력에 기록합니다. (커밋은 호출 측에서 동기화와 함께)
+    Returns: {transition: 건수}
+    """
+    ensure_monthly_partitions(cursor, 'content_status_history')
+    cursor.execute(
+        f"""
+        WITH recorded AS (
+            INSERT INTO content_status_history (crawl_run_id, source, content_id, transition, old_status, new_status, title)
+            SELECT %(run)s, %(source)s, s.content_id, {TRANSITION_SQL}, c.status, s.status, s.title
+            FROM {staging_table} s
+            LEFT JOIN contents c ON c.content_id = s.content_id AND c.source = %(source)s
+            WHERE c.status IS DISTINCT FROM s.status
+            RETURNING transition
+        )
+        SELECT transition, COUNT(*) AS count FROM recorded GROUP BY transition
+        """,
+        {'run': crawl_run_id, 'source': source}
+    )
+    return {row['transition']: row['count'] for row in cursor.fetchall()}
+
+
+def find_unnotified_completions(conn, source):
+    """
+    '연재중/휴재' → '완결'로 바뀌었지만 아직 알림을 보내지 않은 작품을 이력에서 읽어옵니다. (동기화 이후 호출)
+    이번 실행의 완결뿐 아니라 이전 실행에서 발송하지 못한 완결도 포함합니다.
+    Returns: [ContentRecord] (이력 순)
+    """
+    cursor = get_cursor(conn)
+    cursor.execute(
+        """
+        SELECT c.content_id, c.title, c.status, c.meta
+        FROM (
+            SELECT content_id, MIN(id) AS first_id
+            FROM content_status_history
+            WHERE source = %(source)s AND transition = 'completed' AND notified_at IS NULL
+            GROUP BY content_id
+        ) h
+        JOIN contents c ON c.content_id = h.content_id AND c.source = %(source)s
+        ORDER BY h.first_id
+        """,
+        {'source': source}
+    )
+    completed = [ContentRecord.from_row(row, source) for row in cursor.fetchall()]
+    conn.commit()
+    cursor.close()
+    return completed
+
+
+def mark_completion_notified(conn, source, content_id):
+    """작품의 완결 이력을 알림 발송 완료로 표시하고 커밋합니다. (발송이 중간에 실패해도 보낸 작품은 재발송하지 않음)"""
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        UPDATE content_status_history SET notified_at = NOW()
+        WHERE source = %s AND content_id = %s AND transition = 'completed' AND notified_at IS NULL
+        """,
+        (source, content_id)
+    )
+    conn.commit()
+    cursor.close()
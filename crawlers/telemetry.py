@@ -0,0 +1,141 @@
+# crawlers/telemetry.py
+
+import contextvars
+from urllib.parse import urlsplit
+
+# 현재 태스크가 마지막으로 요청한 엔드포인트. tenacity 재시도 콜백은 재시도 대상 코루틴과 같은
+# 태스크(컨텍스트)에서 실행되므로, 이 값으로 어느 엔드포인트의 재시도인지 알 수 있습니다.
+_current_endpoint = contextvars.ContextVar('crawler_current_endpoint', default='unknown')
+
+
+def endpoint_key(url):
+    """'호스트/경로' 형태의 엔드포인트 키 (쿼리 문자열 제외)"""
+    parts = urlsplit(str(url))
+    return f"{parts.netloc}{parts.path}"
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class _EndpointStats:
+    __slots__ = ('requests', 'errors', 'retries', 'hedges', 'hedge_wins', 'bytes', 'latencies', '_sorted')
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.bytes = 0
+        self.latencies = []
+        self._sorted = []
+
+    def sorted_latencies(self):
+        # 매 요청마다 정렬하지 않도록 표본이 10% 이상 늘었을 때만 다시 정렬합니다.
+        if len(self.latencies) - len(self._sorted) > max(1, len(self._sorted) // 10):
+            self._sorted = sorted(self.latencies)
+        return self._sorted
+
+    def summary(self):
+        latencies = sorted(self.latencies)
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'hedges': self.hedges,
+            'hedge_wins': self.hedge_wins,
+            'bytes': self.bytes,
+            'latency_ms': {
+                'p50': _ms(_percentile(latencies, 50)),
+                'p90': _ms(_percentile(latencies, 90)),
+                'p99': _ms(_percentile(latencies, 99)),
+                'max': _ms(latencies[-1] if latencies else None),
+            },
+        }
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+class CrawlTelemetry:
+    """
+    크롤러 한 번의 실행 동안 엔드포인트별 요청 수, 지연 시간 분위수, 재시도 수, 수신 바이트와
+    단계(목록)별 페이지 수를 모읍니다. summary()는 crawl_run_history.report_data에 저장됩니다.
+    """
+
+    def __init__(self):
+        self.endpoints = {}
+        self.pages = {}
+
+    def _endpoint(self, key):
+        stats = self.endpoints.get(key)
+        if stats is None:
+            stats = self.endpoints[key] = _EndpointStats()
+        return stats
+
+    def begin_request(self, url):
+        """요청 직전에 호출해 엔드포인트 키를 반환하고, 재시도 콜백이 참조할 현재 엔드포인트로 설정합니다."""
+        key = endpoint_key(url)
+        _current_endpoint.set(key)
+        return key
+
+    def record_request(self, key, latency, ok, received_bytes=0):
+        stats = self._endpoint(key)
+        stats.requests += 1
+        stats.latencies.append(latency)
+        stats.bytes += received_bytes
+        if not ok:
+            stats.errors += 1
+
+    def record_retry(self, key=None):
+        self._endpoint(key or _current_endpoint.get()).retries += 1
+
+    def record_hedge(self, key, won):
+        stats = self._endpoint(key)
+        stats.hedges += 1
+        if won:
+            stats.hedge_wins += 1
+
+    def latency_percentile(self, key, pct, min_samples=1):
+        """엔드포인트의 관측 지연 분위수(초). 표본이 min_samples보다 적으면 None."""
+        stats = self.endpoints.get(key)
+        if stats is None or len(stats.latencies) < min_samples:
+            return None
+        return _percentile(stats.sorted_latencies(), pct)
+
+    def record_page(self, listing, from_checkpoint=False):
+        """listing('weekday:mon', 'finished' ...)의 접두어를 단계로 보고 페이지 수를 셉니다."""
+        stage = listing.split(':', 1)[0]
+        counts = self.pages.setdefault(stage, {'fetched': 0, 'from_checkpoint': 0})
+        counts['from_checkpoint' if from_checkpoint else 'fetched'] += 1
+
+    def summary(self):
+        endpoints = {key: stats.summary() for key, stats in sorted(self.endpoints.items())}
+        return {
+            'endpoints': endpoints,
+            'pages': self.pages,
+            'totals': {
+                'requests': sum(e['requests'] for e in endpoints.values()),
+                'errors': sum(e['errors'] for e in endpoints.values()),
+                'retries': sum(e['retries'] for e in endpoints.values()),
+                'hedges': sum(e['hedges'] for e in endpoints.values()),
+                'hedge_wins': sum(e['hedge_wins'] for e in endpoints.values()),
+                'bytes': sum(e['bytes'] for e in endpoints.values()),
+            },
+        }
+
+
+def record_retry(retry_state):
+    """
+    tenacity before_sleep 콜백입니다. 재시도 대상 메서드의 크롤러(self)의 telemetry에 재시도를 기록합니다.
+    사용: @retry(..., before_sleep=record_retry)
+    """
+    crawler = retry_state.args[0] if retry_state.args else None
+    telemetry = getattr(crawler, 'telemetry', None)
+    if telemetry is not None:
+        telemetry.record_retry()
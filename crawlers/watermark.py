@@ -0,0 +1,87 @@
+# crawlers/watermark.py
+
+import config
+from database import get_cursor
+
+
+class IncrementalStopPolicy:
+    """
+    '완결' 목록 페이지네이션의 조기 종료 정책입니다.
+    페이지 순서대로 호출되며, 이미 DB에 '완결'로 저장된 작품만 담긴 페이지가
+    `stop_after_pages`번 연속으로 나오면 수집을 멈추도록 True를 반환합니다.
+    incremental=False(전체 수집)이면 멈추지 않고 통계만 기록합니다.
+    """
+
+    def __init__(self, known_finished_ids, is_known_item, stop_after_pages, incremental=True):
+        self.known_finished_ids = known_finished_ids
+        self.is_known_item = is_known_item
+        self.stop_after_pages = stop_after_pages
+        self.incremental = incremental
+        self.known_streak = 0
+        self.pages_seen = 0
+        self.stopped_at_page = None
+
+    def __call__(self, page, items):
+        self.pages_seen = page
+        if all(self.is_known_item(item, self.known_finished_ids) for item in items):
+            self.known_streak += 1
+        else:
+            self.known_streak = 0
+
+        if self.incremental and self.known_streak >= self.stop_after_pages:
+            self.stopped_at_page = page
+            return True
+        return False
+
+
+def load_watermark(conn, source):
+    """
+    소스별 워터마크(마지막 전체 수집 시각 등)를 조회합니다. 없으면 None.
+    전체 수집 주기가 지났는지(full_sweep_overdue)는 DB 시각(NOW()) 기준으로 SQL에서 계산합니다.
+    """
+    cursor = get_cursor(conn)
+    cursor.execute(
+        """
+        SELECT *, last_full_sweep_at <= NOW() - make_interval(days => %s) AS full_sweep_overdue
+        FROM crawler_watermarks WHERE source = %s
+        """,
+        (config.CRAWLER_FULL_SWEEP_INTERVAL_DAYS, source)
+    )
+    row = cursor.fetchone()
+    cursor.close()
+    return dict(row) if row else None
+
+
+def is_full_sweep_due(watermark):
+    """증분 모드가 꺼져 있거나, 전체 수집 주기가 지났으면 True (안전망)."""
+    if not config.CRAWLER_INCREMENTAL or config.CRAWLER_FORCE_FULL_SWEEP:
+        return True
+    if not watermark or not watermark.get('last_full_sweep_at'):
+        return True
+    return bool(watermark.get('full_sweep_overdue'))
+
+
+def save_watermark(conn, source, policy):
+    """이번 실행의 '완결' 목록 수집 결과를 워터마크로 저장합니다."""
+    cursor = get_cursor(conn)
+    cursor.execute(
+        """
+        INSERT INTO crawler_watermarks (source, last_run_at, last_full_sweep_at, last_mode, pages_fetched, stopped_at_page)
+        VALUES (%(source)s, NOW(), CASE WHEN %(full)s THEN NOW() END, %(mode)s, %(pages)s, %(stopped)s)
+        ON CONFLICT (source) DO UPDATE SET
+            last_run_at = EXCLUDED.last_run_at,
+            last_full_sweep_at = COALESCE(EXCLUDED.last_full_sweep_at, crawler_watermarks.last_full_sweep_at),
+            last_mode = EXCLUDED.last_mode,
+            pages_fetched = EXCLUDED.pages_fetched,
+            stopped_at_page = EXCLUDED.stopped_at_page
+        """,
+        {
+            'source': source,
+            'full': not policy.incremental,
+            'mode': 'incremental' if policy.incremental else 'full',
+            'pages': policy.pages_seen,
+            'stopped': policy.stopped_at_page,
+        }
+    )
+    conn.commit()
+    cursor.close()
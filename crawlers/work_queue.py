@@ -0,0 +1,211 @@
+# crawlers/work_queue.py
+"""
+여러 러너(머신/작업)가 크롤링을 나눠서 수행하기 위한 Postgres 작업 큐입니다.
+
+- plan   : 배치(crawl_batches)를 만들고 (source, listing, 페이지 범위) 작업 단위를 crawl_work_units에 등록
+- worker : SELECT ... FOR UPDATE SKIP LOCKED로 작업 단위를 임대(lease)해 수집하고 결과를 기록
+- reduce : 모든 작업 단위가 끝나면 결과를 모아 상태 분류와 DB 동기화를 수행
+
+임대 기간(lease) 안에 결과를 기록하지 못한 워커(중단/강제 종료)의 작업 단위는
+만료 후 다른 워커가 다시 가져갑니다.
+"""
+import json
+
+from database import get_cursor
+
+
+def split_page_range(listing, first_page, last_page, unit_pages):
+    """[first_page, last_page] 범위를 unit_pages 페이지씩 나눈 (listing, 시작, 끝) 작업 단위 목록"""
+    unit_pages = max(1, unit_pages)
+    return [
+        (listing, start, min(start + unit_pages - 1, last_page))
+        for start in range(first_page, last_page + 1, unit_pages)
+    ]
+
+
+def create_batch(conn):
+    cursor = get_cursor(conn)
+    cursor.execute("INSERT INTO crawl_batches DEFAULT VALUES RETURNING id")
+    batch_id = cursor.fetchone()['id']
+    conn.commit()
+    cursor.close()
+    return batch_id
+
+
+def latest_open_batch(conn):
+    """아직 reduce되지 않은 가장 최근 배치 id. 없으면 None."""
+    cursor = get_cursor(conn)
+    cursor.execute("SELECT id FROM crawl_batches WHERE status = 'planned' ORDER BY id DESC LIMIT 1")
+    row = cursor.fetchone()
+    cursor.close()
+    return row['id'] if row else None
+
+
+def enqueue_units(conn, batch_id, source, units):
+    cursor = get_cursor(conn)
+    cursor.executemany(
+        """
+        INSERT INTO crawl_work_units (batch_id, source, listing, page_start, page_end)
+        VALUES (%s, %s, %s, %s, %s)
+        """,
+        [(batch_id, source, listing, page_start, page_end) for listing, page_start, page_end in units]
+    )
+    conn.commit()
+    cursor.close()
+
+
+def claim_unit(conn, batch_id, owner, lease_seconds, max_attempts):
+    """
+    대기 중이거나 임대가 만료된 작업 단위 하나를 임대합니다. 없으면 None.
+    SKIP LOCKED로 다른 워커가 동시에 고르고 있는 행은 건너뛰므로 워커끼리 서로 기다리지 않습니다.
+    """
+    cursor = get_cursor(conn)
+    cursor.execute(
+        """
+        UPDATE crawl_work_units
+        SET status = 'leased', lease_owner = %(owner)s, attempts = attempts + 1,
+            lease_expires_at = NOW() + make_interval(secs => %(lease)s), updated_at = NOW()
+        WHERE id = (
+            SELECT id FROM crawl_work_units
+            WHERE batch_id = %(batch_id)s
+              AND (status = 'pending' OR (status = 'leased' AND lease_expires_at < NOW()))
+              AND attempts < %(max_attempts)s
+            ORDER BY id
+            FOR UPDATE SKIP LOCKED
+            LIMIT 1
+        )
+        RETURNING id, source, listing, page_start, page_end, attempts
+        """,
+        {'batch_id': batch_id, 'owner': owner, 'lease': lease_seconds, 'max_attempts': max_attempts}
+    )
+    row = cursor.fetchone()
+    conn.commit()
+    cursor.close()
+    return dict(row) if row else None
+
+
+def renew_lease(conn, unit_id, owner, lease_seconds):
+    """수집 중인 작업 단위의 임대를 연장합니다. 임대를 이미 잃었으면 False."""
+    cursor = get_cursor(conn)
+    cursor.execute(
+        """
+        UPDATE crawl_work_units SET lease_expires_at = NOW() + make_interval(secs => %s), updated_at = NOW()
+        WHERE id = %s AND lease_owner = %s AND status = 'leased'
+        """,
+        (lease_seconds, unit_id, owner)
+    )
+    renewed = cursor.rowcount == 1
+    conn.commit()
+    cursor.close()
+    return renewed
+
+
+def complete_unit(conn, unit_id, owner, pages):
+    """수집 결과를 기록합니다. 임대를 잃은 뒤(다른 워커가 재임대) 도착한 결과는 버리고 False를 반환합니다."""
+    cursor = get_cursor(conn)
+    cursor.execute(
+        """
+        UPDATE crawl_work_units SET status = 'done', result = %s, error = NULL, updated_at = NOW()
+        WHERE id = %s AND lease_owner = %s AND status = 'leased'
+        """,
+        (json.dumps(pages), unit_id, owner)
+    )
+    completed = cursor.rowcount == 1
+    conn.commit()
+    cursor.close()
+    return completed
+
+
+def fail_unit(conn, unit_id, owner, error, max_attempts):
+    """실패한 작업 단위를 다시 대기열에 넣습니다. 시도 횟수를 모두 쓰면 'failed'로 남깁니다."""
+    cursor = get_cursor(conn)
+    cursor.execute(
+        """
+        UPDATE crawl_work_units
+        SET status = CASE WHEN attempts >= %s THEN 'failed' ELSE 'pending' END,
+            error = %s, lease_owner = NULL, lease_expires_at = NULL, updated_at = NOW()
+        WHERE id = %s AND lease_owner = %s AND status = 'leased'
+        """,
+        (max_attempts, str(error), unit_id, owner)
+    )
+    conn.commit()
+    cursor.close()
+
+
+def batch_progress(conn, batch_id, max_attempts):
+    """
+    배치의 상태별 작업 단위 수. 임대가 만료된 채 시도 횟수를 모두 쓴 작업 단위는 'failed'로 정리합니다.
+    """
+    cursor = get_cursor(conn)
+    cursor.execute(
+        """
+        UPDATE crawl_work_units SET status = 'failed', error = COALESCE(error, 'lease expired'), updated_at = NOW()
+        WHERE batch_id = %s AND status = 'leased' AND lease_expires_at < NOW() AND attempts >= %s
+        """,
+        (batch_id, max_attempts)
+    )
+    cursor.execute(
+        "SELECT status, COUNT(*) AS count FROM crawl_work_units WHERE batch_id = %s GROUP BY status",
+        (batch_id,)
+    )
+    progress = {row['status']: row['count'] for row in cursor.fetchall()}
+    conn.commit()
+    cursor.close()
+    return progress
+
+
+def load_unit_results(conn, batch_id, source):
+    """
+    소스의 작업 단위 결과를 (완료된 (listing, pages) 목록, 실패한 작업 단위 목록)으로 반환합니다.
+    pages는 [{'page', 'items'}, ...]이며 listing/page 순서로 정렬됩니다.
+    """
+    cursor = get_cursor(conn)
+    cursor.execute(
+        """
+        SELECT listing, page_start, page_end, status, attempts, error, result
+        FROM crawl_work_units WHERE batch_id = %s AND source = %s
+        ORDER BY listing, page_start
+        """,
+        (batch_id, source)
+    )
+    done, failed = [], []
+    for row in cursor.fetchall():
+        if row['status'] == 'done':
+            done.append((row['listing'], row['result']))
+        else:
+            failed.append({
+                'listing': row['listing'], 'page': row['page_start'], 'page_end': row['page_end'],
+                'error': row['error'] or row['status'], 'attempts': row['attempts'],
+            })
+    cursor.close()
+    return done, failed
+
+
+def requeue_failed_units(conn, batch_id):
+    """
+    시도 횟수를 모두 써 'failed'로 남은 작업 단위를 다시 대기열에 넣습니다. (완료된 결과는 그대로 둠)
+    다음 worker 실행이 실패한 범위만 다시 수집하고, 그 뒤 reduce를 다시 실행하면 됩니다.
+    Returns: 다시 넣은 작업 단위 수
+    """
+    cursor = get_cursor(conn)
+    cursor.execute(
+        """
+        UPDATE crawl_work_units
+        SET status = 'pending', attempts = 0, lease_owner = NULL, lease_expires_at = NULL, updated_at = NOW()
+        WHERE batch_id = %s AND status = 'failed'
+        """,
+        (batch_id,)
+    )
+    requeued = cursor.rowcount
+    conn.commit()
+    cursor.close()
+    return requeued
+
+
+def close_batch(conn, batch_id):
+    """모든 소스의 reduce가 성공한 배치를 닫고, 더 이상 필요 없는 작업 단위 결과를 비웁니다."""
+    cursor = get_cursor(conn)
+    cursor.execute("UPDATE crawl_batches SET status = 'reduced', reduced_at = NOW() WHERE id = %s", (batch_id,))
+    cursor.execute("UPDATE crawl_work_units SET result = NULL WHERE batch_id = %s", (batch_id,))
+    conn.commit()
+    cursor.close()
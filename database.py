@@ -2,47 +2,591 @@
 
 import psycopg2
 import psycopg2.extras
-from flask import g
+import psycopg2.pool
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_UNKNOWN
+from flask import g, has_request_context, request
+import datetime
+import itertools
 import os
+import re
 import sys
+import threading
+import time
+from urllib.parse import urlsplit
 
-def _create_connection():
+import config
+
+def content_hash_sql(content_type, title, status, meta):
+    """
+    contents 행의 지문(content_hash)을 계산하는 SQL 식입니다.
+    생성 컬럼 정의와 크롤러 동기화(스테이징 행과 비교)가 같은 식을 사용해야 해시가 일치합니다.
+    """
+    return (
+        f"md5({content_type} || chr(31) || {title} || chr(31) || {status} || chr(31) || "
+        f"COALESCE(({meta})::text, ''))"
+    )
+
+def ensure_monthly_partitions(cursor, table, months_ahead=1, start=None):
+    """
+    월 단위 RANGE 파티션 테이블(table)에 이번 달(또는 start가 속한 달)부터 months_ahead개월 뒤까지의
+    파티션을 만듭니다. 파티션 이름은 '{table}_YYYY_MM'입니다.
+    """
+    start = start or datetime.date.today()
+    year, month = start.year, start.month
+    for _ in range(months_ahead + 1):
+        next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {table}_{year:04d}_{month:02d} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{year:04d}-{month:02d}-01') TO ('{next_year:04d}-{next_month:02d}-01')"
+        )
+        year, month = next_year, next_month
+
+def drop_expired_partitions(cursor, table, keep_months, today=None):
+    """
+    ensure_monthly_partitions로 만든 '{table}_YYYY_MM' 파티션 중 이번 달보다 keep_months개월 넘게 지난 것을 삭제합니다.
+    Returns: 삭제한 파티션 이름 목록
     """
-    환경 변수를 기반으로 새로운 데이터베이스 연결을 생성합니다.
+    today = today or datetime.date.today()
+    cutoff = today.year * 12 + today.month - 1 - keep_months
+    cursor.execute(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = to_regclass(%s)",
+        (table,)
+    )
+    dropped = []
+    for (name,) in [tuple(row) for row in cursor.fetchall()]:
+        match = re.fullmatch(rf"{re.escape(table)}_(\d{{4}})_(\d{{2}})", name)
+        if match and int(match.group(1)) * 12 + int(match.group(2)) - 1 < cutoff:
+            cursor.execute(f"DROP TABLE IF EXISTS {name}")
+            dropped.append(name)
+    return sorted(dropped)
+
+# contents는 source로 LIST 파티션됨. 크롤러별 동기화/VACUUM/REINDEX가 자기 파티션만 건드리도록 하기 위함
+# (여기 없는 source도 동기화 시 ensure_source_partition으로 파티션이 자동 추가됨)
+CONTENT_SOURCES = ('naver_webtoon', 'kakaopage')
+
+def is_partitioned_table(cursor, table):
+    """table(search_path 기준)이 파티션 테이블이면 True"""
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", (table,))
+    row = cursor.fetchone()
+    return bool(row) and row[0] == 'p'
+
+def has_column(cursor, table, column):
+    """table(search_path 기준)에 column이 있으면 True"""
+    cursor.execute(
+        "SELECT 1 FROM pg_attribute WHERE attrelid = to_regclass(%s) AND attname = %s AND NOT attisdropped",
+        (table, column)
+    )
+    return cursor.fetchone() is not None
+
+# 크롤러 실행 이력/보고서용 테이블과 시퀀스 (setup_database_standalone이 생성)
+RUN_HISTORY_RELATIONS = ('crawl_run_history', 'crawl_run_daily_rollups', 'crawl_run_id_seq')
+
+def missing_relations(cursor, names):
+    """names 중 없는 테이블/시퀀스 이름 목록"""
+    cursor.execute(
+        "SELECT name FROM unnest(%s::text[]) AS name WHERE to_regclass(name) IS NULL",
+        (list(names),)
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+def missing_crawler_schema(cursor):
+    """
+    크롤러 실행에 필요하지만 아직 없는 스키마 항목 목록. (비어 있으면 실행 가능)
+    setup_database_standalone()(init_db.py)과 마이그레이션(python -m migrations.run)이 만듭니다.
+    """
+    missing = missing_relations(cursor, (*RUN_HISTORY_RELATIONS, 'content_status_history'))
+    if not has_column(cursor, 'contents', 'content_hash'):
+        missing.append('contents.content_hash')
+    return missing
+
+def source_partition_name(source, table='contents'):
+    """source의 파티션 이름 ('{table}_{source}'). 식별자로 쓰이므로 소문자/숫자/밑줄만 허용합니다."""
+    if not re.fullmatch(r'[a-z0-9_]+', source or ''):
+        raise ValueError(f"파티션 이름으로 쓸 수 없는 source입니다: {source!r}")
+    return f"{table}_{source}"
+
+def ensure_source_partition(cursor, source, table='contents'):
+    """
+    contents의 source 파티션이 없으면 만들고, source의 행을 직접 쓸 테이블 이름(파티션)을 반환합니다.
+    마이그레이션(v3) 전의 일반 테이블이면 파티션을 만들지 않고 table을 그대로 반환합니다.
+    """
+    if not is_partitioned_table(cursor, table):
+        return table
+    partition = source_partition_name(source, table)
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {partition} PARTITION OF {table} FOR VALUES IN (%s)", (source,))
+    return partition
+
+def create_contents_table(cursor):
+    """
+    source로 LIST 파티션된 contents 테이블과 CONTENT_SOURCES 파티션을 만듭니다.
+    파티션 키(source)가 기본 키에 포함되어 있어 (content_id, source) 기본 키를 그대로 유지할 수 있습니다.
+    """
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS contents (
+        content_id TEXT NOT NULL,
+        source TEXT NOT NULL,
+        content_type TEXT NOT NULL,
+        title TEXT NOT NULL,
+        status TEXT NOT NULL,
+        meta JSONB,
+        content_hash TEXT GENERATED ALWAYS AS ({content_hash_sql('content_type', 'title', 'status', 'meta')}) STORED,
+        PRIMARY KEY (content_id, source)
+    ) PARTITION BY LIST (source)""")
+    for source in CONTENT_SOURCES:
+        ensure_source_partition(cursor, source)
+
+def ensure_title_search_index(cursor):
+    """검색용 pg_trgm 확장과 contents.title GIN 인덱스 (파티션 테이블이면 모든 파티션에 생성됨)"""
+    print("LOG: [DB Setup] Enabling 'pg_trgm' extension...")
+    cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+
+    print("LOG: [DB Setup] Creating GIN index on contents.title...")
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_contents_title_trgm
+        ON contents
+        USING gin (title gin_trgm_ops);
+    """)
+    print("LOG: [DB Setup] 'pg_trgm' setup complete.")
+
+def get_catalog_generation(cursor):
+    """카탈로그(contents) 세대 번호. 크롤러가 동기화로 행을 바꿀 때마다 1씩 증가합니다."""
+    cursor.execute("SELECT generation FROM catalog_generation")
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+def bump_catalog_generation(cursor):
+    """
+    세대 번호를 올려 API 응답 캐시의 이전 세대 항목을 무효화합니다. 커밋은 호출한 쪽에서 합니다.
+    세대 행을 잠그므로 같은 트랜잭션의 스냅샷 게시(crawlers/snapshots.py)는 한 번에 하나씩 실행됩니다.
+    Returns: 새 세대 번호
+    """
+    cursor.execute("UPDATE catalog_generation SET generation = generation + 1, updated_at = NOW() RETURNING generation")
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+# /api/contents/* 목록 조회용 인덱스 (services/catalog.py의 쿼리와 짝을 이룸): (이름, 인덱스 정의)
+# - 상태별 부분 인덱스: content_type 필터 + title 순 키셋 페이지를 인덱스 순서대로 읽음.
+#   응답의 meta(크기 제한 없는 JSONB)는 힙에서 읽음. INCLUDE하면 인덱스가 커지고 btree 항목 한도(~2.7kB)를
+#   넘는 행은 INSERT/UPDATE가 실패하므로 포함하지 않음. 휴재 페이지는 연재중/휴재 인덱스를 같이 사용
+# - 요일 GIN 인덱스: 연재중/휴재 작품의 meta->'attributes'->'weekdays' @> '["mon"]' 포함 검색
+CONTENT_INDEXES = [
+    ("idx_contents_ongoing_list",
+     "(content_type, title, content_id) WHERE status IN ('연재중', '휴재')"),
+    ("idx_contents_completed_list",
+     "(content_type, title, content_id) WHERE status = '완결'"),
+    ("idx_contents_weekdays",
+     "USING gin ((meta->'attributes'->'weekdays') jsonb_path_ops) WHERE status IN ('연재중', '휴재')"),
+]
+
+# 이전 정의(meta INCLUDE, 휴재 전용 인덱스)의 인덱스. 마이그레이션 v5가 새 인덱스를 만든 뒤 삭제
+LEGACY_CONTENT_INDEXES = ('idx_contents_ongoing_title', 'idx_contents_hiatus_title', 'idx_contents_completed_title')
+
+def ensure_content_indexes(cursor):
+    """
+    CONTENT_INDEXES를 모두 생성합니다. (이미 있으면 건너뜀)
+    일반 CREATE INDEX라 만드는 동안 contents(모든 파티션)에 쓰기가 막히므로, 새로 만든 테이블이나
+    이미 잠근 테이블에만 사용하세요. 운영 중인 테이블은 build_content_indexes_concurrently를 사용합니다.
+    """
+    for name, definition in CONTENT_INDEXES:
+        print(f"LOG: [DB Setup] Creating index '{name}'...")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON contents {definition}")
+
+def missing_content_indexes(cursor):
+    """contents에 아직 없는 CONTENT_INDEXES 이름 목록"""
+    cursor.execute(
+        "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = 'contents'"
+    )
+    existing = {row[0] for row in cursor.fetchall()}
+    return [name for name, _ in CONTENT_INDEXES if name not in existing]
+
+def _drop_invalid_index(cursor, name):
+    """CONCURRENTLY 빌드가 중단되어 남은 INVALID 인덱스를 지웁니다. (IF NOT EXISTS가 건너뛰지 않도록)"""
+    cursor.execute(
+        "SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)", (name,)
+    )
+    row = cursor.fetchone()
+    if row and row[0]:
+        print(f"LOG: [DB Setup] 중단된 빌드로 남은 INVALID 인덱스 '{name}'를 삭제합니다...")
+        cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+def build_content_indexes_concurrently(conn):
+    """
+    CONTENT_INDEXES를 쓰기를 막지 않고(CREATE INDEX CONCURRENTLY) 만듭니다. conn은 autocommit이어야 합니다.
+    파티션 테이블은 CONCURRENTLY를 지원하지 않으므로 부모에는 ON ONLY로 빈 인덱스를 만들고,
+    파티션마다 CONCURRENTLY로 만든 인덱스를 ATTACH합니다. (모두 붙으면 부모 인덱스가 유효해짐)
+    """
+    cursor = conn.cursor()
+    partitioned = is_partitioned_table(cursor, 'contents')
+    partitions = []
+    if partitioned:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass('contents') ORDER BY c.relname"
+        )
+        partitions = [row[0] for row in cursor.fetchall()]
+
+    for name, definition in CONTENT_INDEXES:
+        print(f"LOG: [DB Setup] Creating index '{name}' concurrently...")
+        if not partitioned:
+            _drop_invalid_index(cursor, name)
+            cursor.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON contents {definition}")
+            continue
+        cursor.execute("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)", (name,))
+        row = cursor.fetchone()
+        if row and row[0]:
+            continue
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY contents {definition}")
+        for partition in partitions:
+            # 이전 실행에서 이미 붙인 파티션은 건너뜀
+            cursor.execute(
+                "SELECT 1 FROM pg_inherits i JOIN pg_index x ON x.indexrelid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass(%s) AND x.indrelid = to_regclass(%s)",
+                (name, partition)
+            )
+            if cursor.fetchone() is not None:
+                continue
+            partition_index = f"{partition}_{name.removeprefix('idx_contents_')}_idx"
+            _drop_invalid_index(cursor, partition_index)
+            cursor.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition_index} ON {partition} {definition}")
+            cursor.execute(f"ALTER INDEX {name} ATTACH PARTITION {partition_index}")
+    cursor.close()
+
+def _connection_kwargs():
+    """
+    환경 변수를 기반으로 psycopg2.connect 인자를 만듭니다.
     DATABASE_URL이 있으면 우선 사용하고, 없으면 개별 변수를 사용합니다.
     """
     database_url = os.environ.get('DATABASE_URL')
     if database_url:
-        return psycopg2.connect(database_url)
+        return {'dsn': database_url}
 
     # 로컬 개발 환경을 위한 개별 변수 확인
     required_vars = ['DB_NAME', 'DB_USER', 'DB_PASSWORD', 'DB_HOST', 'DB_PORT']
     if not all(os.environ.get(var) for var in required_vars):
         raise ValueError("로컬 개발을 위해서는 DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT 환경 변수가 모두 필요합니다.")
 
-    return psycopg2.connect(
-        dbname=os.environ.get('DB_NAME'),
-        user=os.environ.get('DB_USER'),
-        password=os.environ.get('DB_PASSWORD'),
-        host=os.environ.get('DB_HOST'),
-        port=os.environ.get('DB_PORT')
-    )
+    return {
+        'dbname': os.environ.get('DB_NAME'),
+        'user': os.environ.get('DB_USER'),
+        'password': os.environ.get('DB_PASSWORD'),
+        'host': os.environ.get('DB_HOST'),
+        'port': os.environ.get('DB_PORT'),
+    }
+
+READ_PRIMARY_COOKIE = 'db_read_primary'
+
+def _create_connection(**extra):
+    """환경 변수를 기반으로 새로운 데이터베이스 연결을 생성합니다."""
+    return psycopg2.connect(**_connection_kwargs(), **extra)
+
+
+class ConnectionPool:
+    """
+    Flask API용 스레드 안전 연결 풀입니다. (gunicorn 워커 프로세스마다 하나)
+
+    - 연결이 모두 사용 중이면 timeout초까지 기다린 뒤 psycopg2.pool.PoolError를 발생시킵니다.
+    - max_lifetime보다 오래된 연결은 꺼내거나 반납할 때 폐기해 서버 측 메모리 증가/장애 조치 후 연결을 정리합니다.
+    - healthcheck_idle초 이상 쉬었던 연결은 꺼낼 때 SELECT 1로 확인하고, 끊긴 연결은 새로 만듭니다.
+    - 반납 시 열린 트랜잭션은 롤백해 다음 요청에 상태가 넘어가지 않게 합니다.
+    """
+
+    def __init__(self, minconn, maxconn, timeout, max_lifetime, healthcheck_idle, connect):
+        self.pid = os.getpid()
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.healthcheck_idle = healthcheck_idle
+        self._connect = connect
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._idle = []      # [(conn, created_at, last_used)] - 최근 반납된 연결부터 재사용 (LIFO)
+        self._in_use = {}    # id(conn) -> created_at
+        self._stats = {
+            'checkouts': 0, 'created': 0, 'reused': 0, 'expired': 0, 'unhealthy': 0,
+            'timeouts': 0, 'wait_seconds': 0.0,
+        }
+        now = time.monotonic()
+        for _ in range(min(minconn, maxconn)):
+            self._idle.append((self._new_connection(), now, now))
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _new_connection(self):
+        conn = self._connect()
+        self._count('created')
+        return conn
+
+    def _expired(self, created_at, now):
+        return self.max_lifetime > 0 and now - created_at >= self.max_lifetime
+
+    @staticmethod
+    def _discard(conn):
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    @staticmethod
+    def _healthy(conn):
+        if conn.closed or conn.info.transaction_status == TRANSACTION_STATUS_UNKNOWN:
+            return False
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def getconn(self):
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._stats['timeouts'] += 1
+            raise psycopg2.pool.PoolError(f"DB 연결 풀 대기 시간 초과 ({self.maxconn}개 모두 사용 중)")
+        try:
+            while True:
+                with self._lock:
+                    entry = self._idle.pop() if self._idle else None
+                now = time.monotonic()
+                if entry is None:
+                    conn, created_at = self._new_connection(), now
+                    break
+                conn, created_at, last_used = entry
+                if self._expired(created_at, now):
+                    self._discard(conn)
+                    self._count('expired')
+                    continue
+                if conn.closed or (now - last_used >= self.healthcheck_idle and not self._healthy(conn)):
+                    self._discard(conn)
+                    self._count('unhealthy')
+                    continue
+                self._count('reused')
+                break
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._in_use[id(conn)] = created_at
+            self._stats['checkouts'] += 1
+            self._stats['wait_seconds'] += now - started
+        return conn
+
+    def putconn(self, conn):
+        with self._lock:
+            created_at = self._in_use.pop(id(conn), None)
+        if created_at is None:
+            self._discard(conn)  # 이 풀에서 꺼낸 연결이 아님
+            return
+        try:
+            now = time.monotonic()
+            if conn.closed or self._expired(created_at, now):
+                self._discard(conn)
+                return
+            if conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    self._discard(conn)
+                    return
+            with self._lock:
+                self._idle.append((conn, created_at, now))
+        finally:
+            self._slots.release()
+
+    def closeall(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _, _ in idle:
+            self._discard(conn)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats, in_use=len(self._in_use), idle=len(self._idle), max=self.maxconn, pid=self.pid)
+        stats['wait_ms_total'] = round(stats.pop('wait_seconds') * 1000, 1)
+        return stats
+
+
+_pools = {}
+_pool_lock = threading.Lock()
+# fork로 물려받은 부모 프로세스의 풀. 닫으면 부모와 공유하는 소켓이 끊기므로 참조만 유지하고 사용하지 않음
+_inherited_pools = []
+
+def _session_kwargs(connect_kwargs):
+    extra = {}
+    # PgBouncer는 알 수 없는 시작 파라미터(options)를 거부하고 세션 설정도 트랜잭션 사이에 유지되지 않음
+    if config.DB_STATEMENT_TIMEOUT_MS and not config.DB_PGBOUNCER:
+        extra['options'] = f"-c statement_timeout={config.DB_STATEMENT_TIMEOUT_MS}"
+    return {**connect_kwargs, **extra}
+
+def _get_pool(name, connect_kwargs):
+    """name('primary' 또는 복제본 DSN)별 현재 프로세스의 연결 풀 (fork된 프로세스에서는 새 풀을 생성)"""
+    with _pool_lock:
+        pool = _pools.get(name)
+        if pool is not None and pool.pid != os.getpid():
+            _inherited_pools.append(pool)
+            pool = None
+        if pool is None:
+            kwargs = _session_kwargs(connect_kwargs)
+            pool = _pools[name] = ConnectionPool(
+                config.DB_POOL_MIN, config.DB_POOL_MAX, config.DB_POOL_TIMEOUT,
+                config.DB_POOL_MAX_LIFETIME, config.DB_POOL_HEALTHCHECK_IDLE,
+                connect=lambda: psycopg2.connect(**kwargs),
+            )
+        return pool
+
+def get_pool():
+    """현재 프로세스의 primary 연결 풀을 반환합니다."""
+    return _get_pool('primary', _connection_kwargs())
+
+def _checkout(name, connect_kwargs):
+    if config.DB_POOL_ENABLED:
+        return _get_pool(name, connect_kwargs).getconn()
+    return psycopg2.connect(**_session_kwargs(connect_kwargs))
+
+def _checkin(name, conn):
+    if config.DB_POOL_ENABLED:
+        _get_pool(name, {}).putconn(conn)
+    else:
+        conn.close()
+
+def _replica_label(dsn):
+    """통계/로그용 복제본 이름 (비밀번호가 노출되지 않도록 host:port만 사용)"""
+    parts = urlsplit(dsn)
+    return f"{parts.hostname}:{parts.port or 5432}" if parts.hostname else 'replica'
+
+def pool_stats():
+    """현재 프로세스의 연결 풀 통계 {'primary': ..., 'replicas': {host:port: ...}}. 풀을 쓰지 않으면 None."""
+    if not config.DB_POOL_ENABLED:
+        return None
+    pid = os.getpid()
+    with _pool_lock:
+        pools = {name: pool for name, pool in _pools.items() if pool.pid == pid}
+    stats = {'primary': pools['primary'].stats() if 'primary' in pools else None, 'replicas': {}}
+    for dsn in config.DB_REPLICA_URLS:
+        label = _replica_label(dsn)
+        health = _replica_health(dsn)
+        stats['replicas'][label] = dict(
+            pools[dsn].stats() if dsn in pools else {},
+            down=health['down_until'] > time.monotonic(), lag_seconds=health['lag_seconds'], failovers=health['failovers'],
+        )
+    return stats
 
 def get_db():
-    """Application Context 내에서 유일한 DB 연결을 가져옵니다."""
+    """
+    Application Context 내에서 유일한 primary DB 연결을 가져옵니다. (DB_POOL_ENABLED면 연결 풀에서 대여)
+    쓰기와 쓰기 직후의 읽기는 이 연결을 사용합니다.
+    """
     if 'db' not in g:
-        g.db = _create_connection()
+        g.db = _checkout('primary', _connection_kwargs())
     return g.db
 
+
+# --- 읽기 복제본 라우팅 ---
+# 복제본별 상태: 연결 실패나 복제 지연 초과 시 down_until까지 라우팅에서 제외
+_replica_state = {}
+_replica_cursor = itertools.count()
+
+def _replica_health(dsn):
+    state = _replica_state.setdefault(dsn, {'down_until': 0.0, 'lag_checked_at': 0.0, 'lag_seconds': None, 'failovers': 0})
+    return state
+
+def _mark_replica_down(dsn, reason):
+    state = _replica_health(dsn)
+    state['down_until'] = time.monotonic() + config.DB_REPLICA_RETRY_SECONDS
+    state['failovers'] += 1
+    print(f"경고: [DB] 읽기 복제본 {_replica_label(dsn)} 제외 ({config.DB_REPLICA_RETRY_SECONDS:.0f}초): {reason}", file=sys.stderr)
+
+def _replica_lag_ok(dsn, conn):
+    """DB_REPLICA_MAX_LAG_SECONDS가 설정되어 있으면 주기적으로 복제 지연을 확인합니다."""
+    if config.DB_REPLICA_MAX_LAG_SECONDS <= 0:
+        return True
+    state = _replica_health(dsn)
+    now = time.monotonic()
+    if now - state['lag_checked_at'] >= config.DB_REPLICA_LAG_CHECK_SECONDS:
+        cursor = conn.cursor()
+        # primary에서는 NULL → 0, 쓰기가 없어 재생이 멈춘 복제본도 지연으로 보일 수 있으므로 수신 위치가 재생 위치와 같으면 0
+        cursor.execute("""
+            SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                        ELSE COALESCE(EXTRACT(EPOCH FROM NOW() - pg_last_xact_replay_timestamp()), 0) END
+        """)
+        state['lag_seconds'] = float(cursor.fetchone()[0] or 0)
+        state['lag_checked_at'] = now
+        cursor.close()
+        conn.rollback()
+    return state['lag_seconds'] is None or state['lag_seconds'] <= config.DB_REPLICA_MAX_LAG_SECONDS
+
+def _read_primary_requested():
+    """이번 요청의 읽기를 primary로 보내야 하는지 (read-your-writes)"""
+    if not has_request_context():
+        return False
+    return request.headers.get('X-Read-Primary') == '1' or READ_PRIMARY_COOKIE in request.cookies
+
+def get_read_db():
+    """
+    읽기 전용 조회용 연결을 가져옵니다.
+    DB_REPLICA_URLS가 있으면 정상 상태의 복제본을 라운드 로빈으로 고르고, 모두 사용할 수 없으면 primary를 사용합니다.
+    이번 요청에서 이미 primary 연결을 열었거나(쓰기 후 읽기), 최근 쓰기 쿠키/X-Read-Primary 헤더가 있으면 primary를 사용합니다.
+    """
+    if 'read_db' in g:
+        return g.read_db
+    replicas = config.DB_REPLICA_URLS
+    if not replicas or 'db' in g or _read_primary_requested():
+        return get_db()
+
+    start = next(_replica_cursor)
+    now = time.monotonic()
+    for offset in range(len(replicas)):
+        dsn = replicas[(start + offset) % len(replicas)]
+        if _replica_health(dsn)['down_until'] > now:
+            continue
+        try:
+            conn = _checkout(dsn, {'dsn': dsn})
+        except (psycopg2.OperationalError, psycopg2.pool.PoolError) as e:
+            _mark_replica_down(dsn, e)
+            continue
+        try:
+            lag_ok = _replica_lag_ok(dsn, conn)
+        except psycopg2.Error as e:
+            _checkin(dsn, conn)
+            _mark_replica_down(dsn, e)
+            continue
+        if not lag_ok:
+            _checkin(dsn, conn)
+            _mark_replica_down(dsn, f"복제 지연 {_replica_health(dsn)['lag_seconds']:.1f}초")
+            continue
+        g.read_db, g.read_db_name = conn, dsn
+        return conn
+    return get_db()
+
+def mark_write():
+    """
+    쓰기를 커밋한 요청에서 호출합니다. 응답에 짧은 수명의 쿠키를 붙여, 같은 클라이언트의 다음 읽기가
+    복제 지연 동안 방금 쓴 데이터를 볼 수 있도록 primary로 라우팅합니다. (remember_write 참고)
+    """
+    g.wrote = True
+
+def remember_write(response):
+    """after_request 훅: mark_write()가 호출된 요청의 응답에 read-your-writes 쿠키를 설정합니다."""
+    if g.get('wrote') and config.DB_REPLICA_URLS:
+        response.set_cookie(READ_PRIMARY_COOKIE, '1', max_age=config.DB_READ_PRIMARY_AFTER_WRITE_SECONDS, httponly=True)
+    return response
+
 def get_cursor(db):
     """지정된 DB 연결로부터 DictCursor를 반환합니다."""
     return db.cursor(cursor_factory=psycopg2.extras.DictCursor)
 
 def close_db(exception=None):
-    """요청(request)이 끝나면 자동으로 호출되어 DB 연결을 닫습니다."""
+    """요청(request)이 끝나면 자동으로 호출되어 DB 연결을 풀에 반납(풀을 쓰지 않으면 닫기)합니다."""
+    read_db, read_db_name = g.pop('read_db', None), g.pop('read_db_name', None)
+    if read_db is not None:
+        _checkin(read_db_name, read_db)
     db = g.pop('db', None)
     if db is not None:
-        db.close()
+        _checkin('primary', db)
 
 def create_standalone_connection():
     """Flask 컨텍스트 없이 독립적인 DB 연결을 생성합니다."""
@@ -62,18 +606,23 @@ def setup_database_standalone():
         # cursor.execute("DROP TABLE IF EXISTS contents;")
         # print("LOG: [DB Setup] Tables dropped.")
 
-        print("LOG: [DB Setup] Creating 'contents' table...")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS contents (
-            content_id TEXT NOT NULL,
-            source TEXT NOT NULL,
-            content_type TEXT NOT NULL,
-            title TEXT NOT NULL,
-            status TEXT NOT NULL,
-            meta JSONB,
-            PRIMARY KEY (content_id, source)
-        )""")
-        print("LOG: [DB Setup] 'contents' table created or already exists.")
+        print("LOG: [DB Setup] Creating 'contents' table (partitioned by source)...")
+        cursor.execute("SELECT to_regclass('contents') IS NULL AS missing")
+        contents_created = cursor.fetchone()['missing']
+        create_contents_table(cursor)
+        if is_partitioned_table(cursor, 'contents'):
+            print("LOG: [DB Setup] 'contents' table created or already exists.")
+        else:
+            print("경고: [DB Setup] 기존 'contents'가 파티션 테이블이 아닙니다. "
+                  "python -m migrations.run으로 전환하세요.")
+
+        # 동기화 시 바뀐 행만 쓰기 위한 내용 지문. 기존 테이블에 추가하면 테이블 전체를 다시 쓰므로
+        # (ACCESS EXCLUSIVE 잠금) 여기서는 확인만 하고, 추가는 마이그레이션(v1)으로 함
+        if has_column(cursor, 'contents', 'content_hash'):
+            print("LOG: [DB Setup] 'content_hash' column exists.")
+        else:
+            print("경고: [DB Setup] 'contents'에 'content_hash' 컬럼이 없습니다. "
+                  "python -m migrations.run으로 추가하세요.")
 
         print("LOG: [DB Setup] Creating 'subscriptions' table...")
         cursor.execute("""
@@ -86,29 +635,181 @@ def setup_database_standalone():
         )""")
         print("LOG: [DB Setup] 'subscriptions' table created or already exists.")
 
-        # === 🚨 [신규] 통합 보고서 저장을 위한 테이블 생성 ===
-        print("LOG: [DB Setup] Creating 'daily_crawler_reports' table...")
+        # === 크롤러 실행 이력 (보고서 발송 후에도 보관, 월 단위 파티션) ===
+        print("LOG: [DB Setup] Creating 'crawl_run_history' table...")
         cursor.execute("""
-        CREATE TABLE IF NOT EXISTS daily_crawler_reports (
-            id SERIAL PRIMARY KEY,
+        CREATE TABLE IF NOT EXISTS crawl_run_history (
+            crawl_run_id BIGINT NOT NULL,
             crawler_name TEXT NOT NULL,
             status TEXT NOT NULL,
+            duration DOUBLE PRECISION,
+            pages INTEGER NOT NULL DEFAULT 0,
+            rows_written INTEGER NOT NULL DEFAULT 0,
             report_data JSONB NOT NULL,
-            created_at TIMESTAMP DEFAULT NOW()
+            reported_at TIMESTAMP,
+            created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (crawl_run_id, created_at)
+        ) PARTITION BY RANGE (created_at)""")
+        # 아직 보고서로 발송되지 않은 실행 / 크롤러별 최근 실행 조회용
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_crawl_run_history_pending ON crawl_run_history (created_at) WHERE reported_at IS NULL;")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_crawl_run_history_crawler ON crawl_run_history (crawler_name, created_at);")
+        ensure_monthly_partitions(cursor, 'crawl_run_history')
+        print("LOG: [DB Setup] 'crawl_run_history' table created or already exists.")
+
+        # 일별 집계 (원본 이력 파티션이 보관 기간으로 삭제되어도 추세 비교용으로 남음)
+        print("LOG: [DB Setup] Creating 'crawl_run_daily_rollups' table...")
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS crawl_run_daily_rollups (
+            day DATE NOT NULL,
+            crawler_name TEXT NOT NULL,
+            runs INTEGER NOT NULL,
+            failures INTEGER NOT NULL,
+            p50_duration DOUBLE PRECISION,
+            p95_duration DOUBLE PRECISION,
+            pages BIGINT NOT NULL,
+            rows_written BIGINT NOT NULL,
+            updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (crawler_name, day)
         )""")
-        print("LOG: [DB Setup] 'daily_crawler_reports' table created or already exists.")
+        print("LOG: [DB Setup] 'crawl_run_daily_rollups' table created or already exists.")
         # ================================================
 
-        print("LOG: [DB Setup] Enabling 'pg_trgm' extension...")
-        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+        # API 응답 캐시 무효화용 카탈로그 세대 번호 (행 하나)
+        print("LOG: [DB Setup] Creating 'catalog_generation' table...")
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS catalog_generation (
+            id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+            generation BIGINT NOT NULL DEFAULT 1,
+            updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+        )""")
+        cursor.execute("INSERT INTO catalog_generation (id) VALUES (TRUE) ON CONFLICT (id) DO NOTHING")
+        print("LOG: [DB Setup] 'catalog_generation' table created or already exists.")
 
-        print("LOG: [DB Setup] Creating GIN index on contents.title...")
+        # 크롤러가 게시하는 미리 직렬화/압축된 목록 응답 (crawlers/snapshots.py)
+        print("LOG: [DB Setup] Creating 'catalog_snapshots' table...")
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_contents_title_trgm
-            ON contents
-            USING gin (title gin_trgm_ops);
+        CREATE TABLE IF NOT EXISTS catalog_snapshots (
+            snapshot_key TEXT PRIMARY KEY,
+            content_type TEXT NOT NULL,
+            generation BIGINT NOT NULL,
+            etag TEXT NOT NULL,
+            body BYTEA NOT NULL,
+            body_gzip BYTEA NOT NULL,
+            body_br BYTEA,
+            created_at TIMESTAMP NOT NULL DEFAULT NOW()
+        )""")
+        # 이미 압축된 본문을 TOAST가 다시 압축하지 않도록 함
+        cursor.execute("""
+        ALTER TABLE catalog_snapshots
+            ALTER COLUMN body_gzip SET STORAGE EXTERNAL,
+            ALTER COLUMN body_br SET STORAGE EXTERNAL
         """)
-        print("LOG: [DB Setup] 'pg_trgm' setup complete.")
+        print("LOG: [DB Setup] 'catalog_snapshots' table created or already exists.")
+
+        print("LOG: [DB Setup] Creating 'crawler_watermarks' table...")
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS crawler_watermarks (
+            source TEXT PRIMARY KEY,
+            last_run_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            last_full_sweep_at TIMESTAMP,
+            last_mode TEXT NOT NULL,
+            pages_fetched INTEGER NOT NULL DEFAULT 0,
+            stopped_at_page INTEGER
+        )""")
+        print("LOG: [DB Setup] 'crawler_watermarks' table created or already exists.")
+
+        print("LOG: [DB Setup] Creating 'crawl_checkpoints' tables...")
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS crawl_checkpoints (
+            id SERIAL PRIMARY KEY,
+            source TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'running',
+            failed_pages JSONB,
+            started_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+        )""")
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS crawl_checkpoint_pages (
+            checkpoint_id INTEGER NOT NULL REFERENCES crawl_checkpoints(id) ON DELETE CASCADE,
+            listing TEXT NOT NULL,
+            page INTEGER NOT NULL,
+            payload JSONB NOT NULL,
+            fetched_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (checkpoint_id, listing, page)
+        )""")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_crawl_checkpoints_source ON crawl_checkpoints (source, status);")
+        print("LOG: [DB Setup] 'crawl_checkpoints' tables created or already exist.")
+
+        print("LOG: [DB Setup] Creating 'crawl_work_units' tables...")
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS crawl_batches (
+            id SERIAL PRIMARY KEY,
+            status TEXT NOT NULL DEFAULT 'planned',
+            created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            reduced_at TIMESTAMP
+        )""")
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS crawl_work_units (
+            id SERIAL PRIMARY KEY,
+            batch_id INTEGER NOT NULL REFERENCES crawl_batches(id) ON DELETE CASCADE,
+            source TEXT NOT NULL,
+            listing TEXT NOT NULL,
+            page_start INTEGER NOT NULL,
+            page_end INTEGER NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            lease_owner TEXT,
+            lease_expires_at TIMESTAMP,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            result JSONB,
+            error TEXT,
+            updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+        )""")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_crawl_work_units_claim ON crawl_work_units (batch_id, status, id);")
+        print("LOG: [DB Setup] 'crawl_work_units' tables created or already exist.")
+
+        # 작품 상태 변화(신규/휴재/연재 재개/완결/완결 해제) 이력. 월 단위로 파티션을 나눠 오래된 달은 통째로 정리
+        print("LOG: [DB Setup] Creating 'content_status_history' table...")
+        cursor.execute("CREATE SEQUENCE IF NOT EXISTS crawl_run_id_seq")
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS content_status_history (
+            id BIGSERIAL,
+            crawl_run_id BIGINT NOT NULL,
+            source TEXT NOT NULL,
+            content_id TEXT NOT NULL,
+            transition TEXT NOT NULL,
+            old_status TEXT,
+            new_status TEXT NOT NULL,
+            title TEXT NOT NULL,
+            changed_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            notified_at TIMESTAMP,
+            PRIMARY KEY (id, changed_at)
+        ) PARTITION BY RANGE (changed_at)""")
+        if not has_column(cursor, 'content_status_history', 'notified_at'):
+            # 완결 알림 발송 시각. 컬럼 추가 전의 완결 이력은 이미 알림을 보낸 것으로 간주 (재발송 방지)
+            cursor.execute("ALTER TABLE content_status_history ADD COLUMN notified_at TIMESTAMP")
+            cursor.execute("UPDATE content_status_history SET notified_at = changed_at WHERE transition = 'completed'")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_content_status_history_changed ON content_status_history (changed_at, id);")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_content_status_history_run ON content_status_history (crawl_run_id);")
+        # 아직 알림을 보내지 못한 완결 이력 (다음 실행에서 재시도)
+        cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_content_status_history_unnotified ON content_status_history (source, id)
+        WHERE transition = 'completed' AND notified_at IS NULL;""")
+        ensure_monthly_partitions(cursor, 'content_status_history')
+        print("LOG: [DB Setup] 'content_status_history' table created or already exists.")
+
+        ensure_title_search_index(cursor)
+
+        # 빈 새 테이블에만 바로 만들고, 기존 테이블은 쓰기를 막지 않도록 마이그레이션(v5)이 CONCURRENTLY로 만듦
+        if contents_created:
+            ensure_content_indexes(cursor)
+            print("LOG: [DB Setup] Content list indexes created.")
+        else:
+            missing_indexes = missing_content_indexes(cursor)
+            if missing_indexes:
+                print(f"경고: [DB Setup] 목록 조회 인덱스 {missing_indexes}가 없습니다. "
+                      "python -m migrations.run으로 추가하세요.")
+            else:
+                print("LOG: [DB Setup] Content list indexes already exist.")
 
         print("LOG: [DB Setup] Committing changes...")
         conn.commit()
@@ -0,0 +1,239 @@
+# migrations/framework.py
+"""
+배치 단위로 나눠 실행하고 중단된 지점부터 이어서 실행할 수 있는 마이그레이션 프레임워크입니다.
+
+- schema_versions: 마이그레이션 버전별 상태(running/applied), 이어하기 키(resume_key), 처리 행 수를 기록
+- BatchedMigration: 이름 있는 서버 측 커서로 키셋(기본 키 순) 배치를 읽어 배치마다 커밋.
+  진행 상황도 같은 트랜잭션에서 schema_versions에 기록하므로, 중단되면 마지막으로 커밋된 배치 다음부터 다시 시작
+- Migration: 한 트랜잭션으로 끝나는 DDL 마이그레이션 (적용 여부만 기록)
+- dry-run: 아무 것도 쓰지 않고 버전별 상태와 EXPLAIN 기준 예상 처리 행 수만 출력
+여러 프로세스가 동시에 실행하지 않도록 advisory lock을 잡습니다.
+"""
+import argparse
+import json
+import sys
+import time
+from abc import ABC, abstractmethod
+
+import psycopg2.extras
+from dotenv import load_dotenv
+
+from database import create_standalone_connection, get_cursor
+
+# 마이그레이션 실행기 전용 advisory lock 키 (임의의 고정값)
+MIGRATION_LOCK_KEY = 7302114
+
+SCHEMA_VERSIONS_DDL = """
+CREATE TABLE IF NOT EXISTS schema_versions (
+    version INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    status TEXT NOT NULL,
+    resume_key JSONB,
+    rows_done BIGINT NOT NULL DEFAULT 0,
+    started_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    applied_at TIMESTAMP
+)"""
+
+
+class Migration(ABC):
+    """한 번에 적용되는 마이그레이션. apply는 변경 사항을 직접 커밋합니다."""
+    version = None
+    description = ''
+
+    def estimate(self, cursor, state):
+        """처리할 예상 행 수 (모르면 None)"""
+        return None
+
+    @abstractmethod
+    def apply(self, conn, state, options):
+        """마이그레이션을 적용하고 처리한 행 수(모르면 None)를 반환합니다."""
+
+
+class BatchedMigration(Migration):
+    """
+    table을 key_columns 순서로 batch_size행씩 읽어 process_batch로 처리합니다.
+    - where: 처리 대상 행 조건 (SQL). 이미 변환된 행을 걸러 재실행해도 안전하도록 작성
+    - process_batch(cursor, rows): 배치를 반영하고 변경한 행 수를 반환 (커밋은 실행기가 함)
+    key_columns는 인덱스(기본 키)와 같은 순서여야 배치마다 인덱스 범위 스캔이 됩니다.
+    """
+    table = None
+    key_columns = ()
+    columns = ()
+    where = 'TRUE'
+
+    def _keyset_sql(self, resume_key, limit=None):
+        key_list = ', '.join(self.key_columns)
+        select_list = ', '.join(dict.fromkeys(self.key_columns + self.columns))
+        sql = f"SELECT {select_list} FROM {self.table} WHERE ({self.where})"
+        params = []
+        if resume_key is not None:
+            sql += f" AND ({key_list}) > ({', '.join(['%s'] * len(self.key_columns))})"
+            params.extend(resume_key)
+        sql += f" ORDER BY {key_list}"
+        if limit is not None:
+            sql += " LIMIT %s"
+            params.append(limit)
+        return sql, params
+
+    def estimate(self, cursor, state):
+        sql, params = self._keyset_sql(state['resume_key'])
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        return int(cursor.fetchone()[0][0]['Plan']['Plan Rows'])
+
+    @abstractmethod
+    def process_batch(self, cursor, rows):
+        """배치를 반영하고 변경한 행 수를 반환합니다."""
+
+    def apply(self, conn, state, options):
+        resume_key, rows_done = state['resume_key'], state['rows_done']
+        batch_number = 0
+        while True:
+            sql, params = self._keyset_sql(resume_key, options['batch_size'])
+            # 이름 있는 커서는 서버 측 커서라 배치 전체를 한 번에 클라이언트로 가져오지 않음
+            reader = conn.cursor(name=f"migration_v{self.version}_{batch_number}",
+                                 cursor_factory=psycopg2.extras.DictCursor)
+            reader.itersize = min(options['batch_size'], 2000)
+            reader.execute(sql, params)
+            rows = list(reader)
+            reader.close()
+            if not rows:
+                break
+
+            cursor = get_cursor(conn)
+            changed = self.process_batch(cursor, rows)
+            resume_key = [rows[-1][column] for column in self.key_columns]
+            rows_done += len(rows)
+            save_progress(cursor, self.version, resume_key, rows_done)
+            conn.commit()
+            cursor.close()
+
+            batch_number += 1
+            print(f"LOG: [Migration v{self.version}] 배치 {batch_number}: {len(rows)}행 확인, {changed}행 변경 "
+                  f"(누적 {rows_done}행, 다음 키 {resume_key})")
+            if options['throttle']:
+                time.sleep(options['throttle'])
+        return rows_done
+
+
+def ensure_schema_versions(conn):
+    cursor = conn.cursor()
+    cursor.execute(SCHEMA_VERSIONS_DDL)
+    conn.commit()
+    cursor.close()
+
+
+def load_state(cursor, version):
+    cursor.execute("SELECT status, resume_key, rows_done FROM schema_versions WHERE version = %s", (version,))
+    row = cursor.fetchone()
+    if not row:
+        return {'status': None, 'resume_key': None, 'rows_done': 0}
+    return {'status': row['status'], 'resume_key': row['resume_key'], 'rows_done': row['rows_done']}
+
+
+def save_progress(cursor, version, resume_key, rows_done):
+    cursor.execute(
+        "UPDATE schema_versions SET resume_key = %s, rows_done = %s, updated_at = NOW() WHERE version = %s",
+        (json.dumps(resume_key), rows_done, version)
+    )
+
+
+def _mark_running(conn, migration):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        INSERT INTO schema_versions (version, description, status) VALUES (%s, %s, 'running')
+        ON CONFLICT (version) DO UPDATE SET status = 'running', updated_at = NOW()
+        """,
+        (migration.version, migration.description)
+    )
+    conn.commit()
+    cursor.close()
+
+
+def _mark_applied(conn, migration):
+    cursor = conn.cursor()
+    cursor.execute(
+        "UPDATE schema_versions SET status = 'applied', applied_at = NOW(), updated_at = NOW() WHERE version = %s",
+        (migration.version,)
+    )
+    conn.commit()
+    cursor.close()
+
+
+def run_migrations(migrations, batch_size=1000, throttle=0.0, dry_run=False):
+    """
+    적용되지 않은 마이그레이션을 버전 순서로 실행합니다.
+    Returns: 이번에 적용(dry-run이면 대상)된 버전 목록
+    """
+    options = {'batch_size': batch_size, 'throttle': throttle}
+    conn = create_standalone_connection()
+    done = []
+    try:
+        ensure_schema_versions(conn)
+        cursor = get_cursor(conn)
+        cursor.execute("SELECT pg_try_advisory_lock(%s) AS locked", (MIGRATION_LOCK_KEY,))
+        if not cursor.fetchone()['locked']:
+            raise RuntimeError("다른 마이그레이션이 실행 중입니다.")
+        conn.commit()
+
+        for migration in sorted(migrations, key=lambda m: m.version):
+            state = load_state(cursor, migration.version)
+            conn.commit()
+            label = f"v{migration.version} ({migration.description})"
+            if state['status'] == 'applied':
+                print(f"LOG: [Migration] {label}: 이미 적용됨, 건너뜁니다.")
+                continue
+
+            if dry_run:
+                estimate = migration.estimate(cursor, state)
+                conn.rollback()
+                resume = f", {state['rows_done']}행 처리 후 키 {state['resume_key']}부터 이어서" if state['resume_key'] else ""
+                print(f"LOG: [Migration] {label}: 미적용{resume}. "
+                      f"예상 대상 {'알 수 없음' if estimate is None else f'약 {estimate}행'} (dry-run)")
+                done.append(migration.version)
+                continue
+
+            if state['status'] == 'running':
+                print(f"LOG: [Migration] {label}: 중단된 실행을 {state['rows_done']}행 처리 지점부터 이어서 실행합니다.")
+            else:
+                print(f"LOG: [Migration] {label}: 실행합니다.")
+            _mark_running(conn, migration)
+            started = time.monotonic()
+            rows = migration.apply(conn, state, options)
+            _mark_applied(conn, migration)
+            print(f"LOG: [Migration] {label}: 적용 완료 ({rows if rows is not None else '-'}행, "
+                  f"{time.monotonic() - started:.1f}초)")
+            done.append(migration.version)
+        cursor.close()
+        return done
+    except Exception as e:
+        conn.rollback()
+        print(f"FATAL: [Migration] 오류가 발생했습니다: {e}", file=sys.stderr)
+        raise
+    finally:
+        conn.close()
+        print("LOG: [Migration] 데이터베이스 연결을 닫았습니다.")
+
+
+def main(migrations, argv=None):
+    """마이그레이션 스크립트 공용 CLI (--dry-run, --batch-size, --throttle)"""
+    parser = argparse.ArgumentParser(description='배치 단위 마이그레이션 실행')
+    parser.add_argument('--dry-run', action='store_true', help='쓰지 않고 예상 대상 행 수만 출력')
+    parser.add_argument('--batch-size', type=int, default=1000, help='배치당 행 수 (배치마다 커밋)')
+    parser.add_argument('--throttle', type=float, default=0.0, help='배치 사이에 쉬는 시간(초)')
+    args = parser.parse_args(argv)
+
+    print("==========================================")
+    print("  마이그레이션 실행기 시작됨")
+    print("==========================================")
+    load_dotenv()
+    try:
+        run_migrations(migrations, args.batch_size, args.throttle, args.dry_run)
+        print("\n[SUCCESS] 마이그레이션이 성공적으로 완료되었습니다.")
+        print("==========================================")
+        sys.exit(0)
+    except Exception:
+        print("\n[FATAL] 마이그레이션이 실패했습니다.", file=sys.stderr)
+        print("==========================================")
+        sys.exit(1)
@@ -0,0 +1,28 @@
+# migrations/run.py
+"""
+적용되지 않은 마이그레이션을 버전 순서로 모두 실행합니다. (적용 기록은 schema_versions)
+
+사용법 (프로젝트 루트에서):
+    python -m migrations.run --dry-run
+    python -m migrations.run --batch-size 2000 --throttle 0.1
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from migrations import (
+    v1_content_hash, v2_meta_structure, v3_partition_contents, v4_crawl_run_history, v5_content_list_indexes,
+)
+from migrations.framework import main
+
+MIGRATIONS = [
+    v1_content_hash.MIGRATION,
+    v2_meta_structure.MIGRATION,
+    v3_partition_contents.MIGRATION,
+    v4_crawl_run_history.MIGRATION,
+    v5_content_list_indexes.MIGRATION,
+]
+
+if __name__ == "__main__":
+    main(MIGRATIONS)
@@ -0,0 +1,50 @@
+# migrations/v1_content_hash.py
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가하여 프로젝트 모듈을 임포트할 수 있도록 함
+# 이 스크립트는 프로젝트 루트 디렉토리에서 실행된다고 가정합니다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import content_hash_sql, get_cursor, has_column
+from migrations.framework import Migration, main
+
+
+class ContentHashMigration(Migration):
+    """
+    기존 contents 테이블에 동기화용 내용 지문(content_hash) 생성 컬럼을 추가합니다.
+    STORED 생성 컬럼을 추가하면 테이블 전체를 다시 쓰는 동안 contents에 ACCESS EXCLUSIVE 잠금을 잡아
+    읽기/쓰기가 모두 막히므로, 크롤러가 돌지 않는 시간에 실행하세요.
+    (새로 만드는 contents는 create_contents_table이 처음부터 이 컬럼을 포함하므로 건너뜀)
+    """
+    version = 1
+    description = 'contents에 content_hash 생성 컬럼 추가'
+
+    def estimate(self, cursor, state):
+        if has_column(cursor, 'contents', 'content_hash'):
+            return 0
+        cursor.execute("EXPLAIN (FORMAT JSON) SELECT * FROM contents")
+        return int(cursor.fetchone()[0][0]['Plan']['Plan Rows'])
+
+    def apply(self, conn, state, options):
+        cursor = get_cursor(conn)
+        if has_column(cursor, 'contents', 'content_hash'):
+            print("LOG: [Migration] contents에 content_hash 컬럼이 이미 있습니다. 마이그레이션할 내용이 없습니다.")
+            return 0
+
+        print("LOG: [Migration] content_hash 컬럼을 추가합니다 (테이블 재작성)...")
+        cursor.execute(f"""
+            ALTER TABLE contents ADD COLUMN content_hash TEXT
+                GENERATED ALWAYS AS ({content_hash_sql('content_type', 'title', 'status', 'meta')}) STORED
+        """)
+        cursor.execute("SELECT COUNT(*) AS count FROM contents")
+        rows = cursor.fetchone()['count']
+        conn.commit()
+        cursor.close()
+        return rows
+
+
+MIGRATION = ContentHashMigration()
+
+if __name__ == "__main__":
+    main([MIGRATION])
@@ -0,0 +1,88 @@
+# migrations/v3_partition_contents.py
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가하여 프로젝트 모듈을 임포트할 수 있도록 함
+# 이 스크립트는 프로젝트 루트 디렉토리에서 실행된다고 가정합니다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import (
+    create_contents_table, ensure_content_indexes, ensure_source_partition,
+    ensure_title_search_index, get_cursor, is_partitioned_table,
+)
+from migrations.framework import Migration, main
+
+OLD_TABLE = 'contents_v2_heap'
+
+
+class PartitionContentsMigration(Migration):
+    """
+    일반 테이블인 contents를 source로 LIST 파티션된 테이블로 전환합니다.
+    - 기존 테이블과 인덱스 이름을 OLD_TABLE 쪽으로 바꾼 뒤, 같은 이름으로 파티션 테이블을 만들고 데이터를 복사
+    - 기존 데이터의 모든 source에 파티션을 만들고, (content_id, source) 기본 키와 목록/검색 인덱스를 다시 생성
+    - 행 수가 일치하면 기존 테이블을 삭제. 모든 작업은 한 트랜잭션이라 실패하면 원래 상태로 롤백됨
+    복사하는 동안 contents에 ACCESS EXCLUSIVE 잠금을 잡으므로 크롤러가 돌지 않는 시간에 실행하세요.
+    """
+    version = 3
+    description = 'contents를 source LIST 파티션으로 전환'
+
+    def estimate(self, cursor, state):
+        if is_partitioned_table(cursor, 'contents'):
+            return 0
+        cursor.execute("EXPLAIN (FORMAT JSON) SELECT * FROM contents")
+        return int(cursor.fetchone()[0][0]['Plan']['Plan Rows'])
+
+    def apply(self, conn, state, options):
+        cursor = get_cursor(conn)
+
+        if is_partitioned_table(cursor, 'contents'):
+            print("LOG: [Migration] contents가 이미 파티션 테이블입니다. 마이그레이션할 내용이 없습니다.")
+            return 0
+
+        cursor.execute("LOCK TABLE contents IN ACCESS EXCLUSIVE MODE")
+        cursor.execute("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = 'contents'")
+        old_indexes = [row['indexname'] for row in cursor.fetchall()]
+        had_trgm_index = 'idx_contents_title_trgm' in old_indexes
+
+        # 새 테이블이 같은 인덱스 이름을 쓸 수 있도록 기존 테이블/인덱스 이름을 먼저 바꿈
+        print(f"LOG: [Migration] 기존 테이블을 '{OLD_TABLE}'로 이름을 바꿉니다 (인덱스 {len(old_indexes)}개)...")
+        cursor.execute(f"ALTER TABLE contents RENAME TO {OLD_TABLE}")
+        for index_name in old_indexes:
+            cursor.execute(f"ALTER INDEX {index_name} RENAME TO {index_name}_v2")
+
+        print("LOG: [Migration] source로 파티션된 contents 테이블을 생성합니다...")
+        create_contents_table(cursor)
+        cursor.execute(f"SELECT DISTINCT source FROM {OLD_TABLE}")
+        for row in cursor.fetchall():
+            ensure_source_partition(cursor, row['source'])
+
+        print("LOG: [Migration] 데이터를 복사합니다...")
+        cursor.execute(f"""
+            INSERT INTO contents (content_id, source, content_type, title, status, meta)
+            SELECT content_id, source, content_type, title, status, meta FROM {OLD_TABLE}
+        """)
+        copied = cursor.rowcount
+        cursor.execute(f"SELECT COUNT(*) AS count FROM {OLD_TABLE}")
+        expected = cursor.fetchone()['count']
+        if copied != expected:
+            raise RuntimeError(f"복사된 행 수({copied})가 기존 테이블({expected})과 다릅니다.")
+        print(f"LOG: [Migration] {copied}개 행을 복사했습니다.")
+
+        # 인덱스는 데이터 복사 후에 만들어야 행마다 인덱스를 갱신하지 않음
+        if had_trgm_index:
+            ensure_title_search_index(cursor)
+        ensure_content_indexes(cursor)
+
+        cursor.execute(f"DROP TABLE {OLD_TABLE}")
+        # 자동 ANALYZE는 파티션 부모 테이블의 통계를 만들지 않으므로 직접 실행
+        cursor.execute("ANALYZE contents")
+
+        conn.commit()
+        cursor.close()
+        return copied
+
+
+MIGRATION = PartitionContentsMigration()
+
+if __name__ == "__main__":
+    main([MIGRATION])
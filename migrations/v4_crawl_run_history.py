@@ -0,0 +1,76 @@
+# migrations/v4_crawl_run_history.py
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가하여 프로젝트 모듈을 임포트할 수 있도록 함
+# 이 스크립트는 프로젝트 루트 디렉토리에서 실행된다고 가정합니다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import ensure_monthly_partitions, get_cursor
+from crawlers.run_history import HISTORY_TABLE, refresh_daily_rollups
+from migrations.framework import Migration, main
+
+
+class CrawlRunHistoryMigration(Migration):
+    """
+    보고서 발송 후 TRUNCATE되던 daily_crawler_reports의 행(아직 발송되지 않은 실행, reported_at NULL)을
+    crawl_run_history로 옮기고 테이블을 삭제합니다.
+    crawl_run_history는 setup_database_standalone(init_db.py)이 먼저 만들어 두어야 합니다.
+    """
+    version = 4
+    description = '크롤러 보고서를 crawl_run_history로 이전'
+    legacy_table = 'daily_crawler_reports'
+
+    def _legacy_exists(self, cursor):
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL AS exists", (self.legacy_table,))
+        return cursor.fetchone()['exists']
+
+    def estimate(self, cursor, state):
+        if not self._legacy_exists(cursor):
+            return 0
+        cursor.execute(f"SELECT COUNT(*) AS count FROM {self.legacy_table}")
+        return cursor.fetchone()['count']
+
+    def apply(self, conn, state, options):
+        cursor = get_cursor(conn)
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL AS exists", (HISTORY_TABLE,))
+        if not cursor.fetchone()['exists']:
+            raise RuntimeError(f"'{HISTORY_TABLE}' 테이블이 없습니다. init_db.py를 먼저 실행하세요.")
+
+        moved = 0
+        if self._legacy_exists(cursor):
+            table = self.legacy_table
+            cursor.execute(f"SELECT DISTINCT date_trunc('month', created_at)::date AS month FROM {table} WHERE created_at IS NOT NULL")
+            for row in cursor.fetchall():
+                ensure_monthly_partitions(cursor, HISTORY_TABLE, months_ahead=0, start=row['month'])
+            cursor.execute(
+                f"""
+                INSERT INTO {HISTORY_TABLE}
+                    (crawl_run_id, crawler_name, status, duration, pages, rows_written, report_data, reported_at, created_at)
+                SELECT COALESCE((report_data->>'crawl_run_id')::bigint, nextval('crawl_run_id_seq')), crawler_name,
+                       COALESCE(report_data->>'status', '성공'), (report_data->>'duration')::double precision,
+                       COALESCE((SELECT SUM((p.value->>'fetched')::int)
+                                 FROM jsonb_each(report_data->'telemetry'->'pages') AS p), 0),
+                       COALESCE((report_data->>'rows_written')::int, 0), report_data, NULL,
+                       COALESCE(created_at, NOW())
+                FROM {table}
+                ON CONFLICT DO NOTHING
+                """
+            )
+            moved = cursor.rowcount
+            print(f"LOG: [Migration] '{table}'에서 {moved}개 행을 옮겼습니다.")
+
+        cursor.execute(f"SELECT DISTINCT created_at::date AS day FROM {HISTORY_TABLE}")
+        for row in cursor.fetchall():
+            refresh_daily_rollups(cursor, row['day'])
+
+        cursor.execute(f"DROP TABLE IF EXISTS {self.legacy_table}")
+        conn.commit()
+        cursor.close()
+        return moved
+
+
+MIGRATION = CrawlRunHistoryMigration()
+
+if __name__ == "__main__":
+    main([MIGRATION])
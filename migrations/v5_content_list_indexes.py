@@ -0,0 +1,62 @@
+# migrations/v5_content_list_indexes.py
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가하여 프로젝트 모듈을 임포트할 수 있도록 함
+# 이 스크립트는 프로젝트 루트 디렉토리에서 실행된다고 가정합니다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import (
+    LEGACY_CONTENT_INDEXES, build_content_indexes_concurrently, get_cursor, is_partitioned_table,
+    missing_content_indexes,
+)
+from migrations.framework import Migration, main
+
+
+class ContentListIndexesMigration(Migration):
+    """
+    목록 조회 인덱스(CONTENT_INDEXES)를 CREATE INDEX CONCURRENTLY로 만들고, 이전 정의의 인덱스
+    (meta를 INCLUDE한 인덱스, 연재중/휴재 인덱스와 겹치는 휴재 전용 인덱스)를 삭제합니다.
+    인덱스를 만드는 동안에도 크롤러 동기화(쓰기)가 막히지 않습니다.
+    중단되면 남은 INVALID 인덱스를 지우고 다시 만들므로 그대로 다시 실행하면 됩니다.
+    """
+    version = 5
+    description = '목록 조회 인덱스 재생성 (meta INCLUDE 제거, CONCURRENTLY)'
+
+    def _legacy_indexes(self, cursor):
+        cursor.execute(
+            "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND indexname = ANY(%s)",
+            (list(LEGACY_CONTENT_INDEXES),)
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def estimate(self, cursor, state):
+        cursor.execute("EXPLAIN (FORMAT JSON) SELECT * FROM contents")
+        return int(cursor.fetchone()[0][0]['Plan']['Plan Rows'])
+
+    def apply(self, conn, state, options):
+        # CREATE/DROP INDEX CONCURRENTLY는 트랜잭션 안에서 실행할 수 없음
+        conn.autocommit = True
+        try:
+            cursor = get_cursor(conn)
+            missing = missing_content_indexes(cursor)
+            if missing:
+                print(f"LOG: [Migration] 목록 조회 인덱스 {missing}를 CONCURRENTLY로 만듭니다...")
+            build_content_indexes_concurrently(conn)
+
+            partitioned = is_partitioned_table(cursor, 'contents')
+            for name in self._legacy_indexes(cursor):
+                print(f"LOG: [Migration] 이전 인덱스 '{name}'를 삭제합니다...")
+                # 파티션 인덱스는 CONCURRENTLY로 지울 수 없음 (카탈로그만 바꾸므로 잠금은 짧음)
+                cursor.execute(f"DROP INDEX {'' if partitioned else 'CONCURRENTLY '}IF EXISTS {name}")
+            cursor.execute("ANALYZE contents")
+            cursor.close()
+        finally:
+            conn.autocommit = False
+        return None
+
+
+MIGRATION = ContentListIndexesMigration()
+
+if __name__ == "__main__":
+    main([MIGRATION])
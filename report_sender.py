@@ -1,12 +1,90 @@
 # report_sender.py
 import os
 import sys
-import json
 from datetime import datetime
 from dotenv import load_dotenv
-from database import create_standalone_connection, get_cursor
+import config
+from database import RUN_HISTORY_RELATIONS, create_standalone_connection, get_cursor, missing_relations
+from crawlers.run_history import crawl_trends, fetch_previous_reports, fetch_unreported_runs, mark_reported, rotate_run_history
 from services.email import get_email_service
 
+def _with_previous(current, previous, fmt="{}"):
+    """'현재값 (이전 값)' 형태의 문자열. 이전 값이 없으면 현재값만."""
+    text = fmt.format(current)
+    if previous is None:
+        return text
+    return f"{text} (이전 {fmt.format(previous)})"
+
+def _format_bytes(num_bytes):
+    return f"{(num_bytes or 0) / 2**20:.1f}MB"
+
+def _format_telemetry(data, previous_data):
+    """report_data['telemetry']를 직전 실행 값과 나란히 보여주는 본문 줄 목록을 만듭니다."""
+    telemetry = data.get('telemetry')
+    if not telemetry:
+        return []
+    previous = (previous_data or {}).get('telemetry') or {}
+    totals, prev_totals = telemetry['totals'], previous.get('totals', {})
+    lines = [
+        f"  - HTTP 요청: {_with_previous(totals['requests'], prev_totals.get('requests'), '{}회')}, "
+        f"재시도: {_with_previous(totals['retries'], prev_totals.get('retries'), '{}회')}, "
+        f"오류 응답: {_with_previous(totals['errors'], prev_totals.get('errors'), '{}회')}, "
+        f"수신: {_format_bytes(totals['bytes'])}"
+        + (f" (이전 {_format_bytes(prev_totals['bytes'])})" if 'bytes' in prev_totals else "")
+    ]
+    if totals.get('hedges'):
+        hedging = data.get('hedging') or {}
+        lines.append(
+            f"  - 헤지 요청: {_with_previous(totals['hedges'], prev_totals.get('hedges'), '{}회')} "
+            f"(먼저 도착 {totals['hedge_wins']}회"
+            + (f", 예산 초과 {hedging['denied']}회" if hedging.get('denied') else "") + ")"
+        )
+    prev_endpoints = previous.get('endpoints', {})
+    for endpoint, stats in telemetry['endpoints'].items():
+        prev = prev_endpoints.get(endpoint, {})
+        latency, prev_latency = stats['latency_ms'], prev.get('latency_ms', {})
+        lines.append(
+            f"    · {endpoint}: {_with_previous(stats['requests'], prev.get('requests'), '{}회')} | "
+            f"p50 {_with_previous(latency['p50'], prev_latency.get('p50'), '{}ms')} | "
+            f"p90 {_with_previous(latency['p90'], prev_latency.get('p90'), '{}ms')} | "
+            f"p99 {_with_previous(latency['p99'], prev_latency.get('p99'), '{}ms')} | "
+            f"재시도 {_with_previous(stats['retries'], prev.get('retries'), '{}회')}"
+        )
+    prev_pages = previous.get('pages', {})
+    if telemetry.get('pages'):
+        pages = ", ".join(
+            f"{stage} {_with_previous(counts['fetched'], prev_pages.get(stage, {}).get('fetched'))}"
+            + (f" (+체크포인트 {counts['from_checkpoint']})" if counts.get('from_checkpoint') else "")
+            for stage, counts in telemetry['pages'].items()
+        )
+        lines.append(f"  - 단계별 페이지: {pages}")
+    return lines
+
+def _format_trends(trends):
+    """실행 시간 추세 섹션. 직전 기준선보다 느린 실행은 ⚠️로 표시합니다. Returns: (본문 줄 목록, 느린 실행 수)"""
+    if not trends:
+        return [], 0
+    lines = [f"\n--- 📈 실행 시간 추세 (직전 {config.CRAWL_TREND_BASELINE_DAYS}일 p50 기준) ---"]
+    slow_count = 0
+    for name, entry in trends.items():
+        for run in entry['runs']:
+            if run['baseline'] is None:
+                lines.append(f"  · {name} run #{run['crawl_run_id']}: 기준선 없음 "
+                             f"(집계 {run['baseline_days']}일, 최소 {config.CRAWL_TREND_MIN_DAYS}일 필요)")
+            elif run['ratio'] is None:
+                lines.append(f"  · {name} run #{run['crawl_run_id']}: 성공하지 않은 실행이라 비교하지 않음 (기준 {run['baseline']:.1f}초)")
+            else:
+                slow_count += run['slow']
+                lines.append(f"  {'⚠️' if run['slow'] else '·'} {name} run #{run['crawl_run_id']}: {run['duration']:.1f}초 "
+                             f"- 기준 {run['baseline']:.1f}초의 {run['ratio']:.1f}배"
+                             + (" (느려짐)" if run['slow'] else ""))
+        for day in entry['daily']:
+            p50 = '-' if day['p50_duration'] is None else f"{day['p50_duration']:.1f}초"
+            p95 = '-' if day['p95_duration'] is None else f"{day['p95_duration']:.1f}초"
+            lines.append(f"      {day['day']:%m-%d} 실행 {day['runs']}회 (실패 {day['failures']}) | p50 {p50} / p95 {p95} | "
+                         f"페이지 {day['pages']} | 쓰기 {day['rows_written']}행")
+    return lines, slow_count
+
 def send_consolidated_report():
     load_dotenv()
     admin_email = os.getenv('ADMIN_EMAIL')
@@ -25,9 +103,20 @@ def send_consolidated_report():
         conn = create_standalone_connection()
         cursor = get_cursor(conn)
 
-        print("LOG: 일일 크롤러 보고서를 DB에서 조회합니다...")
-        cursor.execute("SELECT id, crawler_name, status, report_data FROM daily_crawler_reports")
-        reports = cursor.fetchall()
+        missing = missing_relations(conn.cursor(), RUN_HISTORY_RELATIONS)
+        if missing:
+            print(f"FATAL: DB에 {', '.join(missing)}이(가) 없습니다. "
+                  "python init_db.py와 python -m migrations.run을 먼저 실행하세요.", file=sys.stderr)
+            sys.exit(1)
+
+        # 다음 달 파티션 준비 / 보관 기간이 지난 이력 파티션 삭제
+        dropped = rotate_run_history(cursor)
+        conn.commit()
+        if dropped:
+            print(f"LOG: 보관 기간이 지난 실행 이력 파티션을 삭제했습니다: {', '.join(dropped)}")
+
+        print("LOG: 발송되지 않은 크롤러 실행 이력을 DB에서 조회합니다...")
+        reports = fetch_unreported_runs(cursor)
 
         if not reports:
             print("LOG: 발송할 보고서가 없습니다. 종료합니다.")
@@ -35,6 +124,9 @@ def send_consolidated_report():
 
         print(f"LOG: {len(reports)}개의 크롤러 보고서를 취합합니다.")
 
+        # 크롤러별로 직전에 발송된 실행 결과 (비교용)
+        previous_reports = fetch_previous_reports(cursor, reports[0]['created_at'])
+
         # --- 1. 이메일 본문 생성 ---
         overall_status_icon = "✅"
         overall_status_text = "성공"
@@ -48,36 +140,59 @@ def send_consolidated_report():
             if status == '실패':
                 overall_status_icon = "❌"
                 overall_status_text = "실패"
+            elif status == '부분 완료' and overall_status_text != "실패":
+                overall_status_icon = "⚠️"
+                overall_status_text = "부분 완료"
 
             body_lines.append(f"\n--- 🤖 {name} ({status}) ---")
+            previous = previous_reports.get(name)
 
             if status == '성공':
-                body_lines.append(f"  - 실행 시간: {data.get('duration', 0):.2f}초")
-                body_lines.append(f"  - 신규 등록: {data.get('new_webtoons', 0)}개")
+                body_lines.append(f"  - 실행 시간: {_with_previous(data.get('duration', 0), (previous or {}).get('duration'), '{:.2f}초')}")
+                body_lines.append(f"  - 신규 등록: {data.get('new_contents', data.get('new_webtoons', 0))}개")
                 body_lines.append(f"  - 완결 알림: {data.get('total_notified', 0)}명")
                 body_lines.append(f"  - 완결 내역: {len(data.get('completed_details', []))}건")
+                if data.get('transitions'):
+                    labels = {'new': '신규', 'hiatus': '휴재 전환', 'resumed': '연재 재개', 'completed': '완결', 'unfinished': '완결 해제'}
+                    changes = ", ".join(f"{labels.get(k, k)} {v}건" for k, v in sorted(data['transitions'].items()))
+                    body_lines.append(f"  - 상태 변화 (run #{data.get('crawl_run_id')}): {changes}")
+                if data.get('stage_timings'):
+                    stages = ", ".join(f"{t['stage']} {t['duration']:.1f}초" for t in data['stage_timings'])
+                    body_lines.append(f"  - 단계별 소요: {stages}")
+                body_lines.extend(_format_telemetry(data, previous))
+                if data.get('checkpoint', {}).get('resumed'):
+                    body_lines.append(f"  - 이전 실행 이어서 수집: 저장된 페이지 {data['checkpoint']['reused_pages']}개 재사용")
+            elif status == '부분 완료':
+                failed = ", ".join(f"{f['listing']} {f['page']}p" for f in data.get('failed_pages', []))
+                body_lines.append(f"  - 실행 시간: {data.get('duration', 0):.2f}초")
+                body_lines.append(f"  - 수집 실패 페이지: {failed} (DB 동기화 생략, 다음 실행에서 이어서 수집)")
+                body_lines.extend(_format_telemetry(data, previous))
             else:
                 body_lines.append(f"  - 오류: {data.get('error_message', '알 수 없는 오류')}")
 
+        trend_lines, slow_count = _format_trends(crawl_trends(cursor, reports))
+        body_lines.extend(trend_lines)
+
         body = "\n".join(body_lines)
         now = datetime.now().strftime("%Y-%m-%d")
         subject = f"{overall_status_icon} [{overall_status_text}] 일일 통합 보고서 ({now})"
+        if slow_count:
+            subject += f" - 실행 시간 증가 {slow_count}건"
 
         # --- 2. 이메일 발송 ---
         print(f"LOG: 관리자({admin_email})에게 통합 보고서를 발송합니다...")
         success = email_service.send_mail(admin_email, subject, body)
 
-        # [수정] 이메일 발송 실패 시, 즉시 예외를 발생시켜 TRUNCATE를 막음
+        # 이메일 발송 실패 시, 즉시 예외를 발생시켜 발송 완료로 표시하지 않음 (다음 실행에서 다시 발송)
         if not success:
-            raise Exception("이메일 발송에 실패했습니다 (send_mail이 False 반환). 보고서 DB를 TRUNCATE하지 않습니다.")
+            raise Exception("이메일 발송에 실패했습니다 (send_mail이 False 반환). 실행 이력을 발송 완료로 표시하지 않습니다.")
 
         print("LOG: 통합 보고서 발송 완료.")
 
-        # --- 3. (중요) 발송 '성공' 시에만 테이블 비우기 ---
-        print("LOG: 'daily_crawler_reports' 테이블을 비웁니다 (TRUNCATE)...")
-        cursor.execute("TRUNCATE TABLE daily_crawler_reports;")
+        # --- 3. 발송 '성공' 시에만 발송 완료로 표시 (이력은 보관 기간 동안 유지) ---
+        mark_reported(cursor, reports)
         conn.commit()
-        print("LOG: 테이블 비우기 완료.")
+        print(f"LOG: {len(reports)}개 실행 이력을 발송 완료로 표시했습니다.")
 
     except Exception as e:
         print(f"FATAL: 통합 보고서 발송기 실행 중 치명적 오류 발생: {e}", file=sys.stderr)
@@ -1,12 +1,20 @@
 # run_all_crawlers.py
 import asyncio
+import os
 import time
 import traceback
-import json
 import sys
+import multiprocessing
+import socket
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dotenv import load_dotenv
 
-from database import create_standalone_connection, get_cursor
+import config
+from database import create_standalone_connection, missing_crawler_schema
+from crawlers import work_queue
+from crawlers.run_history import record_crawl_run
+from crawlers.concurrency import AdaptiveConcurrencyController
+from crawlers.http_session import create_client_session
 from crawlers.naver_webtoon_crawler import NaverWebtoonCrawler
 from crawlers.kakaopage_crawler import KakaopageCrawler
 
@@ -20,58 +28,297 @@ ALL_CRAWLERS = [
 ]
 # ----------------------------------------------------------------------
 
-async def run_one_crawler(crawler_class, db_conn):
+def save_crawler_report(crawler_display_name, report):
+    """크롤러 하나의 실행 결과를 crawl_run_history에 저장합니다. (블로킹)"""
+    report_conn = None
+    try:
+        # 보고서 저장을 위해 DB 연결이 끊어졌을 경우를 대비해 새로운 연결 생성
+        report_conn = create_standalone_connection()
+        crawl_run_id = record_crawl_run(report_conn, crawler_display_name, report)
+        print(f"LOG: [{crawler_display_name}]의 실행 결과를 DB에 성공적으로 저장했습니다. (run #{crawl_run_id})")
+    except Exception as report_e:
+        print(f"FATAL: [{crawler_display_name}]의 보고서를 DB에 저장하는 데 실패했습니다: {report_e}", file=sys.stderr)
+    finally:
+        if report_conn:
+            report_conn.close()
+
+async def run_one_crawler(crawler_class, controller=None, session=None, executor=None, action=None):
     """
     단일 크롤러 인스턴스를 생성하고 실행한 뒤, 그 결과를 DB에 보고합니다.
+    크롤러마다 전용 DB 연결을 사용하며, 블로킹 DB/알림 작업은 `executor` 스레드 풀에서 실행되므로
+    한 크롤러의 DB 동기화와 다른 크롤러의 네트워크 수집이 실제로 겹쳐서 진행됩니다.
+    action(crawler, db_conn)을 주면 run_daily_check 대신 실행합니다. (분산 수집의 reduce 단계)
+    Returns: 저장한 보고서 (report['status']: 성공/부분 완료/실패)
     """
-    crawler_instance = crawler_class()
+    crawler_instance = crawler_class(controller=controller, session=session, executor=executor)
     crawler_display_name = crawler_instance.source_name.replace('_', ' ').title()
+    loop = asyncio.get_running_loop()
 
     print(f"\n--- [{crawler_display_name}] 크롤러 작업 시작 ---")
 
     report = {'status': '성공'}
     crawler_start_time = time.time()
 
+    db_conn = None
     try:
-        # 메인 DB 연결을 크롤러의 run_daily_check에 전달
-        new_contents, completed_details, total_notified = await crawler_instance.run_daily_check(db_conn)
+        # 트랜잭션이 다른 크롤러와 섞이지 않도록 크롤러 전용 DB 연결 생성
+        db_conn = await loop.run_in_executor(executor, create_standalone_connection)
+        if action is None:
+            new_contents, completed_details, total_notified = await crawler_instance.run_daily_check(db_conn)
+        else:
+            new_contents, completed_details, total_notified = await action(crawler_instance, db_conn)
         report.update({
             'new_contents': new_contents,
             'completed_details': completed_details,
             'total_notified': total_notified
         })
+        if crawler_instance.page_failures:
+            # 일부 페이지가 최종 실패: DB 동기화 없이 체크포인트만 남김 (다음 실행에서 이어서 수집)
+            report['status'] = '부분 완료'
+            report['failed_pages'] = crawler_instance.page_failures
     except Exception as e:
         print(f"FATAL: [{crawler_display_name}] 크롤러 실행 중 치명적 오류 발생: {e}", file=sys.stderr)
         report['status'] = '실패'
         report['error_message'] = traceback.format_exc()
     finally:
+        if db_conn:
+            db_conn.close()
+
         report['duration'] = time.time() - crawler_start_time
+        # 호스트별 동시성 한도/관측 RTT (크롤링 튜닝용)
+        report['http_hosts'] = crawler_instance.controller.stats()
+        # 단계별(load_db_state, fetch, notify, sync ...) 실행 시각과 소요 시간
+        report['stage_timings'] = crawler_instance.stage_timings
+        # 엔드포인트별 요청 수/지연 분위수/재시도/수신 바이트, 단계별 페이지 수
+        report['telemetry'] = crawler_instance.telemetry.summary()
+        if crawler_instance.hedging.enabled:
+            # 헤지 요청 수/먼저 도착한 횟수/예산 초과로 보내지 않은 횟수
+            report['hedging'] = crawler_instance.hedging.stats()
+        if crawler_instance.crawl_run_id is not None:
+            # content_status_history의 실행 id와 상태 변화 건수
+            report['crawl_run_id'] = crawler_instance.crawl_run_id
+            report['transitions'] = crawler_instance.transitions
+            report['rows_written'] = crawler_instance.rows_written
+        checkpoint = crawler_instance.checkpoint
+        if checkpoint is not None:
+            report['checkpoint'] = {'id': checkpoint.checkpoint_id, 'resumed': checkpoint.resumed, 'reused_pages': checkpoint.reused_pages}
 
         # 각 크롤러의 실행 결과를 DB에 저장
-        report_conn = None
+        await loop.run_in_executor(executor, save_crawler_report, crawler_display_name, report)
+    return report
+
+async def _run_isolated_crawler(crawler_class):
+    """워커 프로세스 안에서 자체 DB 연결, HTTP 세션, 동시성 컨트롤러로 크롤러 하나를 실행합니다."""
+    with ThreadPoolExecutor(max_workers=config.CRAWLER_DB_THREADS, thread_name_prefix='crawler-io') as executor:
+        async with create_client_session() as session:
+            await run_one_crawler(crawler_class, AdaptiveConcurrencyController(), session, executor)
+
+def run_crawler_in_process(crawler_class):
+    """
+    ProcessPoolExecutor 워커의 진입점입니다. (모듈 최상위 함수여야 pickle 가능)
+    크롤러마다 독립된 이벤트 루프를 사용하므로, 한 크롤러의 동기식 DB/SMTP 작업이
+    다른 크롤러를 멈추지 않습니다. 실행 결과는 run_one_crawler가 crawl_run_history에 저장합니다.
+    """
+    load_dotenv()
+    asyncio.run(_run_isolated_crawler(crawler_class))
+
+async def run_crawlers_in_processes(crawler_classes, workers):
+    """등록된 크롤러를 최대 `workers`개의 워커 프로세스에 나누어 실행합니다."""
+    loop = asyncio.get_running_loop()
+    # 실행 중인 이벤트 루프/DB 연결을 fork로 복제하지 않도록 spawn 방식 사용
+    mp_context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+        futures = [loop.run_in_executor(pool, run_crawler_in_process, crawler_class) for crawler_class in crawler_classes]
+        return await asyncio.gather(*futures, return_exceptions=True)
+
+async def run_crawlers_in_event_loop(crawler_classes):
+    """
+    등록된 크롤러를 하나의 이벤트 루프에서 HTTP 세션/컨트롤러를 공유하며 실행합니다.
+    DB/알림 단계는 공용 스레드 풀에서 실행되어 다른 크롤러의 수집을 막지 않습니다.
+    """
+    # 모든 크롤러가 공유할 호스트별 동시성 컨트롤러
+    controller = AdaptiveConcurrencyController()
+
+    with ThreadPoolExecutor(max_workers=config.CRAWLER_DB_THREADS, thread_name_prefix='crawler-io') as executor:
+        # 모든 크롤러와 수집 단계가 공유할 HTTP 연결 풀 (호스트당 연결 수립 비용을 한 번만 지불)
+        async with create_client_session() as session:
+            # 실행할 작업(task) 리스트 생성
+            tasks = []
+            for crawler_class in crawler_classes:
+                tasks.append(run_one_crawler(crawler_class, controller, session, executor))
+
+            # asyncio.gather로 모든 크롤러를 동시에 실행
+            # return_exceptions=True로 설정하여 하나가 실패해도 다른 크롤러는 계속 실행
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+def _worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+async def _resolve_batch_id(conn, executor):
+    loop = asyncio.get_running_loop()
+    batch_id = config.CRAWLER_BATCH_ID or await loop.run_in_executor(executor, work_queue.latest_open_batch, conn)
+    if not batch_id:
+        raise RuntimeError("처리할 크롤링 배치가 없습니다. CRAWLER_ROLE=plan으로 먼저 작업 단위를 등록하세요.")
+    return batch_id
+
+async def plan_crawl_batch(crawler_classes):
+    """[plan] 새 배치를 만들고 크롤러별 작업 단위(source, listing, 페이지 범위)를 crawl_work_units에 등록합니다."""
+    loop = asyncio.get_running_loop()
+    conn = await loop.run_in_executor(None, create_standalone_connection)
+    try:
+        batch_id = await loop.run_in_executor(None, work_queue.create_batch, conn)
+        async with create_client_session() as session:
+            for crawler_class in crawler_classes:
+                crawler = crawler_class(session=session)
+                units = await crawler.plan_work_units(session)
+                await loop.run_in_executor(None, work_queue.enqueue_units, conn, batch_id, crawler.source_name, units)
+                print(f"LOG: [{crawler.source_name}] 작업 단위 {len(units)}개 등록 (배치 #{batch_id})")
+    finally:
+        conn.close()
+    return batch_id
+
+async def _process_work_unit(crawler, session, conn, queue_executor, unit, owner):
+    """임대한 작업 단위 하나를 수집해 결과를 기록합니다. 수집하는 동안 주기적으로 임대를 연장합니다."""
+    loop = asyncio.get_running_loop()
+    label = f"#{unit['id']} {unit['source']} {unit['listing']} {unit['page_start']}-{unit['page_end']}"
+
+    async def keep_lease():
+        while True:
+            await asyncio.sleep(config.CRAWLER_WORK_LEASE_SECONDS / 3)
+            renewed = await loop.run_in_executor(
+                queue_executor, work_queue.renew_lease, conn, unit['id'], owner, config.CRAWLER_WORK_LEASE_SECONDS)
+            if not renewed:
+                print(f"WARNING: 작업 단위 {label}의 임대를 잃었습니다.", file=sys.stderr)
+                return
+
+    heartbeat = asyncio.ensure_future(keep_lease())
+    try:
+        pages = await crawler.fetch_work_unit(session, unit['listing'], unit['page_start'], unit['page_end'])
+    except Exception as e:
+        print(f"❌ 작업 단위 {label} 수집 실패 (시도 {unit['attempts']}회): {e}")
+        await loop.run_in_executor(
+            queue_executor, work_queue.fail_unit, conn, unit['id'], owner, e, config.CRAWLER_WORK_MAX_ATTEMPTS)
+        return
+    finally:
+        heartbeat.cancel()
+
+    completed = await loop.run_in_executor(queue_executor, work_queue.complete_unit, conn, unit['id'], owner, pages)
+    if completed:
+        print(f"LOG: 작업 단위 {label} 완료 ({len(pages)} 페이지)")
+    else:
+        print(f"WARNING: 작업 단위 {label}는 다른 워커가 다시 가져가 결과를 버립니다.", file=sys.stderr)
+
+async def run_crawl_worker(crawler_classes):
+    """
+    [worker] 배치의 작업 단위를 SKIP LOCKED로 임대해 수집합니다.
+    여러 머신/작업에서 동시에 실행할 수 있으며, 남은 작업 단위가 없으면 종료합니다.
+    """
+    loop = asyncio.get_running_loop()
+    owner = _worker_name()
+    controller = AdaptiveConcurrencyController()
+    crawlers = {}
+    # 작업 큐 연결은 하나를 순차적으로 사용 (같은 연결로 트랜잭션이 섞이지 않도록)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='work-queue') as queue_executor:
+        conn = await loop.run_in_executor(queue_executor, create_standalone_connection)
+        try:
+            batch_id = await _resolve_batch_id(conn, queue_executor)
+            print(f"LOG: 워커 {owner}가 배치 #{batch_id}의 작업 단위를 처리합니다. (동시 {config.CRAWLER_WORKER_CONCURRENCY}개)")
+            async with create_client_session() as session:
+                for crawler_class in crawler_classes:
+                    crawler = crawler_class(controller=controller, session=session)
+                    crawlers[crawler.source_name] = crawler
+
+                async def worker_loop():
+                    while True:
+                        unit = await loop.run_in_executor(
+                            queue_executor, work_queue.claim_unit, conn, batch_id, owner,
+                            config.CRAWLER_WORK_LEASE_SECONDS, config.CRAWLER_WORK_MAX_ATTEMPTS)
+                        if unit is None:
+                            progress = await loop.run_in_executor(
+                                queue_executor, work_queue.batch_progress, conn, batch_id, config.CRAWLER_WORK_MAX_ATTEMPTS)
+                            if not progress.get('pending') and not progress.get('leased'):
+                                return
+                            # 다른 워커가 처리 중: 임대가 만료되면 다시 가져갈 수 있도록 잠시 후 재시도
+                            await asyncio.sleep(min(5, config.CRAWLER_WORK_LEASE_SECONDS))
+                            continue
+                        await _process_work_unit(crawlers[unit['source']], session, conn, queue_executor, unit, owner)
+
+                await asyncio.gather(*[worker_loop() for _ in range(config.CRAWLER_WORKER_CONCURRENCY)])
+        finally:
+            conn.close()
+
+    for crawler in crawlers.values():
+        totals = crawler.telemetry.summary()['totals']
+        print(
+            f"LOG: [{crawler.source_name}] 워커 {owner} 요청 {totals['requests']}회, 재시도 {totals['retries']}회, "
+            f"헤지 {totals['hedges']}회 (먼저 도착 {totals['hedge_wins']}회)"
+        )
+
+async def reduce_crawl_batch(crawler_classes):
+    """
+    [reduce] 배치의 모든 작업 단위가 끝나기를 기다린 뒤, 크롤러별로 결과를 모아
+    상태 분류/알림/DB 동기화를 수행하고 보고서를 저장합니다.
+    """
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=config.CRAWLER_DB_THREADS, thread_name_prefix='crawler-io') as executor:
+        conn = await loop.run_in_executor(executor, create_standalone_connection)
         try:
-            # 보고서 저장을 위해 DB 연결이 끊어졌을 경우를 대비해 새로운 연결 생성
-            report_conn = create_standalone_connection()
-            report_cursor = get_cursor(report_conn)
-            report_cursor.execute(
-                """
-                INSERT INTO daily_crawler_reports (crawler_name, status, report_data)
-                VALUES (%s, %s, %s)
-                """,
-                (crawler_display_name, report['status'], json.dumps(report))
-            )
-            report_conn.commit()
-            report_cursor.close()
-            print(f"LOG: [{crawler_display_name}]의 실행 결과를 DB에 성공적으로 저장했습니다.")
-        except Exception as report_e:
-            print(f"FATAL: [{crawler_display_name}]의 보고서를 DB에 저장하는 데 실패했습니다: {report_e}", file=sys.stderr)
+            batch_id = await _resolve_batch_id(conn, executor)
+            deadline = time.time() + config.CRAWLER_REDUCE_TIMEOUT_SECONDS
+            while True:
+                progress = await loop.run_in_executor(
+                    executor, work_queue.batch_progress, conn, batch_id, config.CRAWLER_WORK_MAX_ATTEMPTS)
+                if not progress.get('pending') and not progress.get('leased'):
+                    break
+                if time.time() >= deadline:
+                    print(f"WARNING: 배치 #{batch_id}의 작업 단위가 제한 시간 안에 끝나지 않았습니다: {progress}", file=sys.stderr)
+                    break
+                await asyncio.sleep(10)
+            print(f"LOG: 배치 #{batch_id} 결과 취합을 시작합니다. {progress}")
+
+            reduced_all = True
+            for crawler_class in crawler_classes:
+                source = crawler_class().source_name
+                done, failed = await loop.run_in_executor(executor, work_queue.load_unit_results, conn, batch_id, source)
+                report = await run_one_crawler(
+                    crawler_class, executor=executor,
+                    action=lambda crawler, db_conn, done=done, failed=failed: crawler.run_reduce(db_conn, done, failed))
+                if failed or report['status'] != '성공':
+                    reduced_all = False
+
+            if reduced_all:
+                await loop.run_in_executor(executor, work_queue.close_batch, conn, batch_id)
+            else:
+                # 완료된 작업 단위 결과는 남겨 두고 실패한 범위만 다시 수집한 뒤 reduce를 다시 실행할 수 있도록 함
+                requeued = await loop.run_in_executor(executor, work_queue.requeue_failed_units, conn, batch_id)
+                print(f"WARNING: 배치 #{batch_id}를 닫지 않습니다. 실패한 작업 단위 {requeued}개를 다시 대기열에 넣었습니다. "
+                      f"worker 실행 후 reduce를 다시 실행하세요.", file=sys.stderr)
         finally:
-            if report_conn:
-                report_conn.close()
+            conn.close()
+
+def check_crawler_schema():
+    """
+    DB 스키마가 준비되지 않았으면 크롤링을 시작하기 전에 종료합니다.
+    (배포 순서: python init_db.py -> python -m migrations.run -> run_all_crawlers.py)
+    """
+    conn = create_standalone_connection()
+    try:
+        cursor = conn.cursor()
+        missing = missing_crawler_schema(cursor)
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+    if missing:
+        print(f"FATAL: DB 스키마에 {', '.join(missing)}이(가) 없습니다. "
+              "python init_db.py와 python -m migrations.run을 먼저 실행하세요.", file=sys.stderr)
+        sys.exit(1)
 
 async def main():
     """
     등록된 모든 크롤러를 병렬로 실행하고, 각 크롤러의 실행 결과를 DB에 저장합니다.
+    CRAWLER_EXECUTION_MODE=process이면 크롤러마다 독립된 워커 프로세스에서 실행합니다.
+    CRAWLER_ROLE=plan/worker/reduce이면 crawl_work_units 작업 큐로 여러 러너에 나눠서 수집합니다.
     """
     start_time = time.time()
     print("==========================================")
@@ -79,20 +326,25 @@ async def main():
     print("==========================================")
 
     load_dotenv()
+    check_crawler_schema()
 
-    db_conn = None
     try:
-        # 모든 크롤러가 공유할 메인 DB 연결을 생성
-        db_conn = create_standalone_connection()
-
-        # 실행할 작업(task) 리스트 생성
-        tasks = []
-        for crawler_class in ALL_CRAWLERS:
-            tasks.append(run_one_crawler(crawler_class, db_conn))
+        if config.CRAWLER_ROLE == 'plan':
+            await plan_crawl_batch(ALL_CRAWLERS)
+            return
+        if config.CRAWLER_ROLE == 'worker':
+            await run_crawl_worker(ALL_CRAWLERS)
+            return
+        if config.CRAWLER_ROLE == 'reduce':
+            await reduce_crawl_batch(ALL_CRAWLERS)
+            return
 
-        # asyncio.gather로 모든 크롤러를 동시에 실행
-        # return_exceptions=True로 설정하여 하나가 실패해도 다른 크롤러는 계속 실행
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        if config.CRAWLER_EXECUTION_MODE == 'process':
+            workers = config.CRAWLER_WORKERS or max(1, min(len(ALL_CRAWLERS), os.cpu_count() or 1))
+            print(f"LOG: 프로세스 병렬 모드로 실행합니다. (워커 {workers}개)")
+            results = await run_crawlers_in_processes(ALL_CRAWLERS, workers)
+        else:
+            results = await run_crawlers_in_event_loop(ALL_CRAWLERS)
 
         # (선택 사항) gather 실행 결과에서 예외가 있었는지 확인
         for result in results:
@@ -100,10 +352,6 @@ async def main():
                 print(f"WARNING: 크롤러 작업 중 일부가 gather 레벨에서 예외를 반환했습니다: {result}", file=sys.stderr)
 
     finally:
-        if db_conn:
-            # 메인 DB 연결 닫기
-            db_conn.close()
-
         total_duration = time.time() - start_time
         print("\n==========================================")
         print(f"  통합 크롤러 실행 완료 (총 소요 시간: {total_duration:.2f}초)")
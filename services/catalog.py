@@ -0,0 +1,147 @@
+# services/catalog.py
+"""
+/api/contents 목록 응답(payload)을 만드는 공용 함수입니다.
+
+Flask 뷰(views/contents.py)의 실시간 조회와 크롤러의 스냅샷 게시(crawlers/snapshots.py)가
+같은 쿼리/그룹화 코드를 사용해 두 경로의 응답 내용이 항상 같도록 합니다.
+"""
+import hashlib
+import json
+from urllib.parse import urlencode
+
+# /api/contents/ongoing 응답의 요일 그룹 (순서 유지)
+WEEKDAY_GROUPS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun', 'daily')
+
+# /api/contents/hiatus, /completed 한 페이지의 작품 수
+STATUS_PAGE_SIZE = 100
+
+# 상태별 페이지 엔드포인트 -> contents.status
+PAGED_STATUSES = {'hiatus': '휴재', 'completed': '완결'}
+
+def process_row(row):
+    """
+    DB에서 읽어온 row를 처리합니다.
+    meta 필드가 None이면 빈 dict로 보장합니다.
+    """
+    row_dict = dict(row)
+    if row_dict.get('meta') is None:
+        row_dict['meta'] = {}
+
+    # psycopg2가 JSONB를 dict로 자동 변환하므로,
+    # isinstance(..., str) 및 json.loads()가 더 이상 필요하지 않습니다.
+
+    return row_dict
+
+def ongoing_query(content_type):
+    """
+    연재중/휴재 목록 조회 SQL과 파라미터. (인덱스: idx_contents_ongoing_list)
+    """
+    return (
+        "SELECT content_id, title, status, meta, source FROM contents WHERE content_type = %s AND status IN ('연재중', '휴재')",
+        [content_type]
+    )
+
+def status_page_query(status, content_type, last_title=None, per_page=STATUS_PAGE_SIZE):
+    """
+    상태별(휴재/완결) title 순 키셋 페이지 조회 SQL과 파라미터. (인덱스: idx_contents_ongoing_list / idx_contents_completed_list)
+    """
+    where_clause = "WHERE status = %s AND content_type = %s"
+    params = [status, content_type]
+    if last_title:
+        where_clause += " AND title > %s"
+        params.append(last_title)
+    return (
+        f"SELECT content_id, title, status, meta, source FROM contents {where_clause} ORDER BY title ASC LIMIT %s",
+        [*params, per_page]
+    )
+
+def build_ongoing_payload(cursor, content_type):
+    """
+    /api/contents/ongoing 응답. 웹툰은 요일별로 그룹화하고,
+    다른 콘텐츠 타입은 목록을 그대로 반환합니다.
+    """
+    cursor.execute(*ongoing_query(content_type))
+    all_contents = [process_row(row) for row in cursor.fetchall()]
+
+    # 콘텐츠 타입에 따라 분기
+    if content_type != 'webtoon':
+        # 다른 콘텐츠 타입의 경우, 그룹화하지 않고 목록 그대로 반환 (향후 확장 가능)
+        return all_contents
+
+    # 웹툰인 경우, 요일별로 그룹화
+    grouped_by_day = {key: [] for key in WEEKDAY_GROUPS}
+    for content in all_contents:
+        # 변경된 meta 구조에 맞게 'attributes'에서 'weekdays'를 가져옴
+        day_list = content.get('meta', {}).get('attributes', {}).get('weekdays', [])
+        for day_eng in day_list:
+            if day_eng in grouped_by_day:
+                grouped_by_day[day_eng].append(content)
+    return grouped_by_day
+
+def build_status_page_payload(cursor, status, content_type, last_title=None, per_page=STATUS_PAGE_SIZE):
+    """/api/contents/hiatus, /completed 한 페이지 응답 {'contents', 'next_cursor'}"""
+    cursor.execute(*status_page_query(status, content_type, last_title, per_page))
+    results = [process_row(row) for row in cursor.fetchall()]
+
+    next_cursor = None
+    if len(results) == per_page:
+        next_cursor = results[-1]['title']
+
+    return {
+        'contents': results,
+        'next_cursor': next_cursor
+    }
+
+def encode_payload(payload):
+    """
+    목록 응답 본문. 실시간 조회와 스냅샷이 같은 인코더를 써야 같은 데이터에 같은 바이트/ETag가 나옵니다.
+    키를 정렬한 압축 JSON이며, 한글은 이스케이프하지 않아 본문이 더 작습니다.
+    """
+    return json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+def payload_etag(body):
+    """본문의 sha256 (strong ETag 값)"""
+    return hashlib.sha256(body).hexdigest()
+
+def snapshot_key(endpoint, content_type, **params):
+    """스냅샷 이름. 값이 없는 파라미터는 빼고 이름순으로 붙입니다. 예: 'completed?last_title=...&type=webtoon'"""
+    query = {'type': content_type, **{name: value for name, value in params.items() if value}}
+    return f"{endpoint}?{urlencode(sorted(query.items()))}"
+
+# 압축 방식 -> catalog_snapshots 본문 컬럼
+SNAPSHOT_BODY_COLUMNS = {'br': 'body_br', 'gzip': 'body_gzip'}
+
+def load_catalog_snapshot_etag(cursor, key, encodings=()):
+    """
+    게시된 스냅샷의 ETag와 보낼 압축 방식만 읽습니다. (본문은 읽지 않음)
+    encodings(선호 순) 중 저장된 첫 압축본을, 없으면 압축하지 않은 본문(None)을 고릅니다.
+    Returns: (etag, 압축 방식 또는 None) / 스냅샷이 없으면 None
+    """
+    candidates = [encoding for encoding in encodings if encoding in SNAPSHOT_BODY_COLUMNS]
+    encoding_sql = "NULL"
+    for encoding in reversed(candidates):
+        column = SNAPSHOT_BODY_COLUMNS[encoding]
+        encoding_sql = f"CASE WHEN {column} IS NOT NULL THEN '{encoding}' ELSE {encoding_sql} END"
+    cursor.execute(
+        f"SELECT etag, {encoding_sql} AS encoding FROM catalog_snapshots WHERE snapshot_key = %s",
+        (key,)
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return row['etag'], row['encoding']
+
+def load_catalog_snapshot_body(cursor, key, etag, encoding=None):
+    """
+    load_catalog_snapshot_etag()로 고른 스냅샷 본문(압축본)을 읽습니다.
+    그 사이 스냅샷이 다시 게시되어 ETag가 바뀌었으면 None을 반환합니다.
+    """
+    column = SNAPSHOT_BODY_COLUMNS[encoding] if encoding else 'body'
+    cursor.execute(
+        f"SELECT {column} AS body FROM catalog_snapshots WHERE snapshot_key = %s AND etag = %s",
+        (key, etag)
+    )
+    row = cursor.fetchone()
+    if row is None or row['body'] is None:
+        return None
+    return bytes(row['body'])
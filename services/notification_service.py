@@ -1,8 +1,13 @@
 # services/notification_service.py
 from .email import get_email_service
 
-def send_completion_notifications(cursor, newly_completed_ids, all_content_today, source):
-    if not newly_completed_ids:
+def send_completion_notifications(cursor, completed_records, source, on_notified=None):
+    """
+    completed_records: 새로 완결된 작품의 ContentRecord 목록 (crawlers.content_record)
+    on_notified: 작품 하나의 알림을 모든 구독자에게 보낸 뒤(구독자가 없어도) 호출되는 함수 (record를 인자로 받음).
+                 발송에 실패한 구독자가 있는 작품은 호출하지 않으므로 다음 실행에서 다시 발송됩니다.
+    """
+    if not completed_records:
         print("\n새롭게 완결된 콘텐츠가 없습니다.")
         return [], 0
 
@@ -12,12 +17,12 @@ def send_completion_notifications(cursor, newly_completed_ids, all_content_today
         print(f"❌ 이메일 서비스 초기화 실패: {e}")
         return [f"오류: {e}"], 0
 
-    print(f"\n🔥 새로운 완결 콘텐츠 {len(newly_completed_ids)}개 발견! 알림 발송을 시작합니다.")
+    print(f"\n🔥 새로운 완결 콘텐츠 {len(completed_records)}개 발견! 알림 발송을 시작합니다.")
     completed_details, total_notified_users = [], 0
 
-    for content_id in newly_completed_ids:
-        content_data = all_content_today.get(content_id, {})
-        title = content_data.get('titleName', f'ID {content_id}')
+    for record in completed_records:
+        content_id = record.content_id
+        title = record.title or f'ID {content_id}'
 
         cursor.execute("SELECT email FROM subscriptions WHERE content_id = %s AND source = %s", (content_id, source))
         subscribers = [row['email'] for row in cursor.fetchall()]
@@ -25,15 +30,22 @@ def send_completion_notifications(cursor, newly_completed_ids, all_content_today
         print(f"--- '{title}'(ID:{content_id}) 완결 알림 발송 대상: {len(subscribers)}명 ---")
         if not subscribers:
             completed_details.append(f"- '{title}' (ID:{content_id}) : 구독자 없음")
+            if on_notified:
+                on_notified(record)
             continue
 
         subject = f"콘텐츠 완결 알림: '{title}'가 완결되었습니다!"
         body = f"안녕하세요! Ending Signal입니다.\n\n회원님께서 구독하신 콘텐츠 '{title}'가 완결되었습니다.\n지금 바로 정주행을 시작해보세요!\n\n감사합니다."
 
-        for email in subscribers:
-            email_service.send_mail(email, subject, body)
+        sent = sum(1 for email in subscribers if email_service.send_mail(email, subject, body))
 
-        total_notified_users += len(subscribers)
+        total_notified_users += sent
+        if sent < len(subscribers):
+            completed_details.append(
+                f"- '{title}' (ID:{content_id}) : {sent}/{len(subscribers)}명에게 알림 발송 (실패분은 다음 실행에서 재발송)")
+            continue
         completed_details.append(f"- '{title}' (ID:{content_id}) : {len(subscribers)}명에게 알림 발송")
+        if on_notified:
+            on_notified(record)
 
     return completed_details, total_notified_users
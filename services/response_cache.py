@@ -0,0 +1,155 @@
+# services/response_cache.py
+"""
+/api/contents 목록 응답의 프로세스 내 캐시입니다.
+
+카탈로그는 크롤러가 하루 한 번 동기화할 때만 바뀌므로, 직렬화된 JSON 응답 본문을
+(엔드포인트, 쿼리 파라미터, 카탈로그 세대 번호) 키로 보관합니다.
+- 세대 번호(catalog_generation)는 크롤러가 동기화 커밋 후 올리며, 워커는 최대
+  API_CACHE_GENERATION_CHECK_SECONDS마다 DB에서 다시 읽습니다. TTL 없이 세대가 바뀔 때만 무효화됩니다.
+- 세대가 바뀌면 이전 세대 항목을 즉시 지우고, 항목 수/본문 바이트 한도를 넘으면 가장 오래 안 쓰인 항목부터 버립니다.
+- gunicorn 워커 프로세스마다 별도의 캐시를 가집니다. (통계는 /api/status의 response_cache)
+"""
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, make_response, request
+
+import config
+from database import get_catalog_generation, get_cursor, get_read_db
+
+
+class ResponseCache:
+    """항목 수와 본문 바이트 합계로 크기가 제한되는 스레드 안전 LRU 캐시"""
+
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (bytes, headers) (최근 사용이 뒤쪽)
+        self._bytes = 0
+        self._endpoints = {}            # endpoint -> {'hits', 'misses'}
+        self._stats = {'evictions': 0, 'invalidations': 0, 'oversized': 0}
+
+    def _count(self, endpoint, field):
+        counts = self._endpoints.setdefault(endpoint, {'hits': 0, 'misses': 0})
+        counts[field] += 1
+
+    def get(self, key):
+        """Returns: (본문, 응답 헤더) 또는 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._count(key[0], 'misses')
+                return None
+            self._entries.move_to_end(key)
+            self._count(key[0], 'hits')
+            return entry
+
+    def put(self, key, body, headers=None):
+        with self._lock:
+            if len(body) > self.max_bytes:
+                self._stats['oversized'] += 1
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous[0])
+            self._entries[key] = (body, headers or {})
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._stats['evictions'] += 1
+
+    def invalidate_before(self, generation):
+        """generation보다 오래된 세대의 항목을 모두 지웁니다. (키의 마지막 요소가 세대 번호)"""
+        with self._lock:
+            stale = [key for key in self._entries if key[-1] < generation]
+            for key in stale:
+                self._bytes -= len(self._entries.pop(key)[0])
+            self._stats['invalidations'] += len(stale)
+
+    def stats(self):
+        with self._lock:
+            hits = sum(c['hits'] for c in self._endpoints.values())
+            misses = sum(c['misses'] for c in self._endpoints.values())
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': round(hits / (hits + misses), 4) if hits + misses else None,
+                'endpoints': {name: dict(counts) for name, counts in sorted(self._endpoints.items())},
+                **self._stats,
+                'pid': os.getpid(),
+            }
+
+
+response_cache = ResponseCache(config.API_CACHE_MAX_ENTRIES, config.API_CACHE_MAX_BYTES)
+
+_generation_lock = threading.Lock()
+_generation = {'value': None, 'checked_at': 0.0}
+
+
+def current_generation():
+    """카탈로그 세대 번호. API_CACHE_GENERATION_CHECK_SECONDS 안에서는 마지막으로 읽은 값을 재사용합니다."""
+    now = time.monotonic()
+    with _generation_lock:
+        if _generation['value'] is not None and now - _generation['checked_at'] < config.API_CACHE_GENERATION_CHECK_SECONDS:
+            return _generation['value']
+    # 응답 데이터와 같은 연결(읽기 복제본)에서 읽어야 세대와 데이터가 어긋나지 않음
+    cursor = get_cursor(get_read_db())
+    generation = get_catalog_generation(cursor)
+    cursor.close()
+    with _generation_lock:
+        changed = generation != _generation['value']
+        _generation.update(value=generation, checked_at=now)
+    if changed:
+        response_cache.invalidate_before(generation)
+    return generation
+
+
+def cache_stats():
+    """/api/status용 캐시 통계 (캐시를 끄면 None)"""
+    if not config.API_CACHE_ENABLED:
+        return None
+    return {**response_cache.stats(), 'generation': _generation['value']}
+
+
+# 캐시 항목과 함께 보관해 HIT 응답에도 그대로 붙이는 헤더 (조건부 요청 처리용)
+REPLAYED_HEADERS = ('ETag', 'Vary', 'Cache-Control')
+
+
+def cached_response(endpoint):
+    """
+    뷰의 200 JSON 응답 본문을 (endpoint, 쿼리 파라미터, 카탈로그 세대) 키로 캐시하는 데코레이터입니다.
+    ETag 등 REPLAYED_HEADERS도 함께 보관하고, HIT 응답도 If-None-Match가 같으면 304를 반환합니다.
+    스냅샷 응답(X-Snapshot)은 이미 직렬화/압축되어 있고 Accept-Encoding마다 본문이 다르므로 캐시하지 않습니다.
+    응답에는 X-Cache: HIT/MISS 헤더가 붙습니다.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if not config.API_CACHE_ENABLED:
+                return view(*args, **kwargs)
+            key = (endpoint, tuple(sorted(request.args.items(multi=True))), current_generation())
+            entry = response_cache.get(key)
+            if entry is not None:
+                body, headers = entry
+                response = current_app.response_class(body, mimetype='application/json', headers=headers)
+                response.headers['X-Cache'] = 'HIT'
+                return response.make_conditional(request)
+
+            response = make_response(view(*args, **kwargs))
+            if (response.status_code == 200 and response.is_json and 'X-Snapshot' not in response.headers
+                    and 'Content-Encoding' not in response.headers):
+                headers = {name: response.headers[name] for name in REPLAYED_HEADERS if name in response.headers}
+                response_cache.put(key, response.get_data(), headers)
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
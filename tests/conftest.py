@@ -0,0 +1,6 @@
+# tests/conftest.py
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가하여 프로젝트 모듈을 임포트할 수 있도록 함
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,123 @@
+# tests/test_base_crawler.py
+import asyncio
+
+import pytest
+
+from crawlers.base_crawler import ContentCrawler
+
+
+class StubCrawler(ContentCrawler):
+    """_fetch_pages_windowed만 확인하기 위한 최소 크롤러"""
+
+    async def fetch_all_data(self, pipeline, finished_stop_policy=None):
+        pass
+
+    async def _fetch_listing_page(self, session, listing, page):
+        pass
+
+    async def _put_listing_items(self, pipeline, listing, items):
+        pass
+
+    async def plan_work_units(self, session):
+        return []
+
+    def _resolve_status(self, flags):
+        return None
+
+
+def make_fetch(pages, delays=None, errors=()):
+    """pages: {page: items}. 없는 페이지는 빈 목록, errors의 페이지는 예외. 요청된 페이지를 기록합니다."""
+    requested = []
+
+    async def fetch_page(page):
+        requested.append(page)
+        # 뒤쪽 페이지가 먼저 도착하도록 앞쪽 페이지를 더 늦게 응답
+        await asyncio.sleep((delays or {}).get(page, 0))
+        if page in errors:
+            raise RuntimeError(f"page {page} failed")
+        return pages.get(page, [])
+
+    return fetch_page, requested
+
+
+def run_windowed(crawler, fetch_page, max_pages=10, window=3, stop_when=None):
+    delivered = []
+
+    async def on_page(page, items):
+        delivered.append((page, items))
+
+    count = asyncio.run(crawler._fetch_pages_windowed(
+        fetch_page, max_pages, window, 'finished', on_page, stop_when))
+    return count, delivered
+
+
+def test_delivers_pages_in_page_order_even_when_they_arrive_out_of_order():
+    crawler = StubCrawler('stub')
+    pages = {page: [f'item{page}'] for page in range(1, 6)}
+    fetch_page, _ = make_fetch(pages, delays={1: 0.05, 2: 0.03, 3: 0.01})
+
+    count, delivered = run_windowed(crawler, fetch_page, max_pages=5)
+
+    assert count == 5
+    assert [page for page, _ in delivered] == [1, 2, 3, 4, 5]
+    assert delivered[0] == (1, ['item1'])
+    assert crawler.page_failures == []
+
+
+def test_stops_at_first_empty_page():
+    crawler = StubCrawler('stub')
+    fetch_page, requested = make_fetch({1: ['a'], 2: ['b'], 4: ['d'], 5: ['e']})
+
+    count, delivered = run_windowed(crawler, fetch_page, max_pages=10, window=2)
+
+    assert count == 2
+    assert [page for page, _ in delivered] == [1, 2]
+    # 빈 페이지(3) 이후로는 창 크기만큼만 요청하고 더 진행하지 않음
+    assert max(requested) <= 4
+    assert crawler.page_failures == []
+
+
+def test_stops_at_first_failed_page_and_records_it():
+    crawler = StubCrawler('stub')
+    pages = {page: [page] for page in range(1, 8)}
+    fetch_page, _ = make_fetch(pages, errors={3})
+
+    count, delivered = run_windowed(crawler, fetch_page, max_pages=7, window=3)
+
+    assert count == 2
+    assert [page for page, _ in delivered] == [1, 2]
+    assert [(f['listing'], f['page']) for f in crawler.page_failures] == [('finished', 3)]
+
+
+def test_failure_after_the_last_page_is_not_recorded():
+    crawler = StubCrawler('stub')
+    fetch_page, _ = make_fetch({1: [1], 2: [2]}, delays={4: 0.01}, errors={4})
+
+    count, _ = run_windowed(crawler, fetch_page, max_pages=10, window=4)
+
+    assert count == 2
+    assert crawler.page_failures == []
+
+
+def test_stop_when_ends_collection_after_that_page():
+    crawler = StubCrawler('stub')
+    pages = {page: [page] for page in range(1, 11)}
+    fetch_page, _ = make_fetch(pages)
+
+    count, delivered = run_windowed(crawler, fetch_page, max_pages=10, window=3,
+                                    stop_when=lambda page, items: page == 4)
+
+    assert count == 4
+    assert [page for page, _ in delivered] == [1, 2, 3, 4]
+
+
+@pytest.mark.parametrize('max_pages', [1, 3])
+def test_respects_max_pages(max_pages):
+    crawler = StubCrawler('stub')
+    pages = {page: [page] for page in range(1, 20)}
+    fetch_page, requested = make_fetch(pages)
+
+    count, _ = run_windowed(crawler, fetch_page, max_pages=max_pages, window=5)
+
+    assert count == max_pages
+    assert sorted(requested) == list(range(1, max_pages + 1))
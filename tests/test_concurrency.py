@@ -0,0 +1,136 @@
+# tests/test_concurrency.py
+import asyncio
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from crawlers.concurrency import AdaptiveConcurrencyController, HostLimiter, parse_retry_after
+
+
+def make_limiter(**overrides):
+    options = dict(
+        initial_limit=4, min_limit=1, max_limit=8, latency_tolerance=1.5,
+        error_threshold=0.5, backoff_factor=0.5, max_retry_after=30,
+    )
+    options.update(overrides)
+    return HostLimiter('example.com', **options)
+
+
+class FakeResponse:
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.headers = headers or {}
+
+
+# --- AIMD ---
+
+def test_additive_increase_while_latency_is_stable():
+    limiter = make_limiter()
+    limiter._record(0.1, failed=False, throttled=False, retry_after=None)
+    assert limiter.limit == pytest.approx(4.25)
+    limiter._record(0.1, failed=False, throttled=False, retry_after=None)
+    assert limiter.limit == pytest.approx(4.25 + 1 / 4.25)
+
+
+def test_increase_is_capped_at_max_limit():
+    limiter = make_limiter(initial_limit=7, max_limit=8)
+    for _ in range(50):
+        limiter._record(0.1, failed=False, throttled=False, retry_after=None)
+    assert limiter.limit == 8
+    assert limiter.current_limit == 8
+
+
+def test_no_increase_when_latency_exceeds_tolerance():
+    limiter = make_limiter()
+    limiter._record(0.1, failed=False, throttled=False, retry_after=None)
+    grown = limiter.limit
+    limiter._record(1.0, failed=False, throttled=False, retry_after=None)
+    assert limiter.rtt_ewma > limiter.min_rtt * limiter.latency_tolerance
+    assert limiter.limit == grown
+
+
+def test_multiplicative_decrease_on_failure():
+    limiter = make_limiter(initial_limit=8)
+    limiter._record(0.1, failed=True, throttled=False, retry_after=None)
+    assert limiter.limit == 4
+
+
+def test_decrease_once_per_cooldown():
+    limiter = make_limiter(initial_limit=8)
+    limiter._record(0.1, failed=True, throttled=False, retry_after=None)
+    limiter._record(0.1, failed=True, throttled=False, retry_after=None)
+    # 동시에 실패한 요청들이 한도를 연쇄적으로 깎지 않음
+    assert limiter.limit == 4
+
+    limiter._last_decrease = time.monotonic() - 5
+    limiter._record(0.1, failed=True, throttled=False, retry_after=None)
+    assert limiter.limit == 2
+
+
+def test_decrease_stops_at_min_limit():
+    limiter = make_limiter(initial_limit=2, min_limit=2)
+    limiter._record(0.1, failed=False, throttled=True, retry_after=None)
+    assert limiter.limit == 2
+
+
+def test_throttle_blocks_new_requests_for_retry_after():
+    limiter = make_limiter()
+    limiter._record(0.1, failed=False, throttled=True, retry_after=10)
+    assert limiter.total_throttled == 1
+    assert 9 < limiter.retry_after_remaining() <= 10
+
+
+def test_retry_after_block_is_capped():
+    limiter = make_limiter(max_retry_after=5)
+    limiter._record(0.1, failed=False, throttled=True, retry_after=600)
+    assert limiter.retry_after_remaining() <= 5
+
+
+def test_request_slot_records_throttle_and_retry_after():
+    controller = AdaptiveConcurrencyController(initial_limit=4, min_limit=1, max_limit=8)
+
+    async def scenario():
+        async with controller.request('https://example.com/api?page=1') as slot:
+            slot.observe(FakeResponse(429, {'Retry-After': '3'}))
+
+    asyncio.run(scenario())
+    limiter = controller.limiter_for('https://example.com/other')
+    assert limiter.in_flight == 0
+    assert limiter.total_throttled == 1
+    assert limiter.current_limit < 4
+    assert 0 < limiter.retry_after_remaining() <= 3
+
+
+def test_limiter_is_shared_per_host():
+    controller = AdaptiveConcurrencyController(initial_limit=2, min_limit=1, max_limit=4)
+    assert controller.limiter_for('https://a.com/x') is controller.limiter_for('https://a.com/y')
+    assert controller.limiter_for('https://a.com/x') is not controller.limiter_for('https://b.com/x')
+
+
+# --- Retry-After ---
+
+@pytest.mark.parametrize('value, expected', [
+    ('45', 45.0),
+    (' 7 ', 7.0),
+    ('0', 0.0),
+    ('3600', 60.0),  # max_seconds로 제한
+])
+def test_parse_retry_after_seconds(value, expected):
+    assert parse_retry_after(value, 60) == expected
+
+
+def test_parse_retry_after_http_date():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    seconds = parse_retry_after(format_datetime(retry_at, usegmt=True), 60)
+    assert 28 <= seconds <= 30
+
+
+def test_parse_retry_after_past_date_is_zero():
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT', 60) == 0.0
+
+
+@pytest.mark.parametrize('value', [None, '', 'soon', '-5', '1.5'])
+def test_parse_retry_after_invalid(value):
+    assert parse_retry_after(value, 60) is None
@@ -0,0 +1,68 @@
+# tests/test_content_record.py
+import pytest
+
+from crawlers.content_record import ContentRecord, WEEKDAY_ORDER, decode_weekdays, encode_weekdays
+
+
+def make_record(**overrides):
+    fields = dict(
+        content_id='123', source='naver_webtoon', title='작품', authors=('작가1', '작가2'),
+        thumbnail_url='https://example.com/t.jpg', status='연재중', weekdays=encode_weekdays(['mon', 'thu']),
+    )
+    fields.update(overrides)
+    return ContentRecord(**fields)
+
+
+def test_weekday_bits_round_trip_in_canonical_order():
+    assert decode_weekdays(encode_weekdays(['sun', 'mon', 'daily'])) == ['mon', 'sun', 'daily']
+    assert decode_weekdays(encode_weekdays(WEEKDAY_ORDER)) == WEEKDAY_ORDER
+
+
+@pytest.mark.parametrize('days', [None, [], ['unknown']])
+def test_empty_or_unknown_weekdays_encode_to_zero(days):
+    assert encode_weekdays(days) == 0
+    assert decode_weekdays(0) == []
+
+
+def test_meta_has_standard_structure():
+    assert make_record().meta() == {
+        'common': {'authors': ['작가1', '작가2'], 'thumbnail_url': 'https://example.com/t.jpg'},
+        'attributes': {'weekdays': ['mon', 'thu']},
+    }
+
+
+def test_from_row_round_trips_meta():
+    record = make_record()
+    row = {'content_id': '123', 'title': '작품', 'status': '연재중', 'meta': record.meta()}
+
+    restored = ContentRecord.from_row(row, 'naver_webtoon')
+
+    assert restored.meta() == record.meta()
+    for field in ContentRecord.__slots__:
+        assert getattr(restored, field) == getattr(record, field)
+
+
+def test_from_row_prefers_flat_staging_columns():
+    row = {
+        'content_id': '9', 'title': '스테이징', 'status': '완결',
+        'authors': ['작가'], 'thumbnail_url': 'thumb', 'weekdays': ['daily'],
+        'meta': {'common': {'authors': ['다른 작가']}, 'attributes': {'weekdays': ['mon']}},
+    }
+
+    record = ContentRecord.from_row(row, 'kakaopage')
+
+    assert record.authors == ('작가',)
+    assert record.thumbnail_url == 'thumb'
+    assert record.weekday_names == ['daily']
+    assert record.source == 'kakaopage'
+
+
+def test_from_row_without_meta():
+    record = ContentRecord.from_row({'content_id': '1', 'title': '제목', 'meta': None}, 'naver_webtoon')
+    assert record.meta() == {'common': {'authors': [], 'thumbnail_url': None}, 'attributes': {'weekdays': []}}
+    assert record.status is None
+
+
+def test_slots_reject_unknown_attributes():
+    with pytest.raises(AttributeError):
+        make_record().extra = 1
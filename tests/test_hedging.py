@@ -0,0 +1,52 @@
+# tests/test_hedging.py
+import pytest
+
+from crawlers.hedging import HedgePolicy
+from crawlers.telemetry import CrawlTelemetry
+
+
+def make_policy(max_ratio=0.1, **overrides):
+    options = dict(enabled=True, percentile=95, min_samples=5, fallback_delay=500, min_delay=50)
+    options.update(overrides)
+    return HedgePolicy(max_ratio=max_ratio, **options)
+
+
+def test_budget_allows_one_hedge_before_any_requests():
+    policy = make_policy()
+    assert policy.try_acquire() is True
+    assert policy.try_acquire() is False
+    assert policy.stats() == {'requests': 0, 'hedges': 1, 'wins': 0, 'denied': 1}
+
+
+def test_budget_grows_with_request_count():
+    policy = make_policy(max_ratio=0.1)
+    policy.requests = 100
+    granted = sum(policy.try_acquire() for _ in range(20))
+    # max_ratio * requests + 1
+    assert granted == 11
+    assert policy.hedges == 11
+    assert policy.denied == 9
+
+
+def test_zero_ratio_allows_only_one_hedge():
+    policy = make_policy(max_ratio=0)
+    policy.requests = 1000
+    assert [policy.try_acquire() for _ in range(3)] == [True, False, False]
+
+
+def test_delay_uses_fallback_until_enough_samples():
+    policy = make_policy(min_samples=5)
+    telemetry = CrawlTelemetry()
+    for _ in range(4):
+        telemetry.record_request('api', 0.2, ok=True)
+    assert policy.delay_for(telemetry, 'api') == pytest.approx(0.5)
+
+
+def test_delay_follows_observed_percentile_with_floor():
+    policy = make_policy(min_samples=5, min_delay=50)
+    telemetry = CrawlTelemetry()
+    for _ in range(20):
+        telemetry.record_request('slow', 0.3, ok=True)
+        telemetry.record_request('fast', 0.001, ok=True)
+    assert policy.delay_for(telemetry, 'slow') == pytest.approx(0.3)
+    assert policy.delay_for(telemetry, 'fast') == pytest.approx(0.05)
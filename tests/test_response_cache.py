@@ -0,0 +1,126 @@
+# tests/test_response_cache.py
+import pytest
+
+import config
+from services import response_cache as cache_module
+from services.response_cache import ResponseCache
+
+
+def key(endpoint, generation, args=()):
+    return (endpoint, tuple(args), generation)
+
+
+# --- LRU ---
+
+def test_get_returns_body_and_headers():
+    cache = ResponseCache(max_entries=10, max_bytes=1000)
+    cache.put(key('ongoing', 1), b'body', {'ETag': '"x"'})
+    assert cache.get(key('ongoing', 1)) == (b'body', {'ETag': '"x"'})
+    assert cache.get(key('ongoing', 2)) is None
+
+
+def test_evicts_least_recently_used_entry():
+    cache = ResponseCache(max_entries=2, max_bytes=1000)
+    cache.put(key('a', 1), b'a')
+    cache.put(key('b', 1), b'b')
+    cache.get(key('a', 1))  # a를 최근 사용으로
+    cache.put(key('c', 1), b'c')
+
+    assert cache.get(key('b', 1)) is None
+    assert cache.get(key('a', 1)) is not None
+    assert cache.get(key('c', 1)) is not None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_evicts_by_total_bytes():
+    cache = ResponseCache(max_entries=10, max_bytes=10)
+    cache.put(key('a', 1), b'x' * 6)
+    cache.put(key('b', 1), b'y' * 6)
+
+    assert cache.get(key('a', 1)) is None
+    assert cache.stats()['bytes'] == 6
+
+
+def test_oversized_body_is_not_cached():
+    cache = ResponseCache(max_entries=10, max_bytes=4)
+    cache.put(key('a', 1), b'too large')
+    assert cache.get(key('a', 1)) is None
+    assert cache.stats()['oversized'] == 1
+
+
+def test_replacing_entry_keeps_byte_count():
+    cache = ResponseCache(max_entries=10, max_bytes=100)
+    cache.put(key('a', 1), b'12345')
+    cache.put(key('a', 1), b'12')
+    assert cache.stats()['bytes'] == 2
+    assert cache.stats()['entries'] == 1
+
+
+def test_stats_count_hits_and_misses_per_endpoint():
+    cache = ResponseCache(max_entries=10, max_bytes=100)
+    cache.put(key('a', 1), b'a')
+    cache.get(key('a', 1))
+    cache.get(key('a', 1))
+    cache.get(key('b', 1))
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (2, 1)
+    assert stats['endpoints'] == {'a': {'hits': 2, 'misses': 0}, 'b': {'hits': 0, 'misses': 1}}
+    assert stats['hit_rate'] == pytest.approx(2 / 3, abs=1e-4)
+
+
+# --- 세대 무효화 ---
+
+def test_invalidate_before_drops_older_generations_only():
+    cache = ResponseCache(max_entries=10, max_bytes=100)
+    cache.put(key('a', 1), b'old')
+    cache.put(key('b', 2), b'current')
+    cache.put(key('c', 3), b'newer')
+
+    cache.invalidate_before(2)
+
+    assert cache.get(key('a', 1)) is None
+    assert cache.get(key('b', 2)) == (b'current', {})
+    assert cache.get(key('c', 3)) == (b'newer', {})
+    assert cache.stats()['invalidations'] == 1
+    assert cache.stats()['bytes'] == len(b'current') + len(b'newer')
+
+
+@pytest.fixture
+def fake_generation(monkeypatch):
+    """DB 대신 state['generation']을 카탈로그 세대로 읽도록 바꿉니다."""
+    state = {'generation': 1, 'reads': 0}
+
+    def read_generation(cursor):
+        state['reads'] += 1
+        return state['generation']
+
+    class FakeCursor:
+        def close(self):
+            pass
+
+    monkeypatch.setattr(cache_module, 'get_read_db', lambda: None)
+    monkeypatch.setattr(cache_module, 'get_cursor', lambda conn: FakeCursor())
+    monkeypatch.setattr(cache_module, 'get_catalog_generation', read_generation)
+    monkeypatch.setattr(cache_module, 'response_cache', ResponseCache(10, 1000))
+    monkeypatch.setattr(cache_module, '_generation', {'value': None, 'checked_at': 0.0})
+    monkeypatch.setattr(config, 'API_CACHE_GENERATION_CHECK_SECONDS', 0)
+    return state
+
+
+def test_generation_change_invalidates_cached_responses(fake_generation):
+    cache = cache_module.response_cache
+    assert cache_module.current_generation() == 1
+    cache.put(key('ongoing', 1), b'v1')
+
+    fake_generation['generation'] = 2
+    assert cache_module.current_generation() == 2
+    assert cache.get(key('ongoing', 1)) is None
+
+
+def test_generation_is_reused_within_check_interval(fake_generation, monkeypatch):
+    monkeypatch.setattr(config, 'API_CACHE_GENERATION_CHECK_SECONDS', 60)
+    assert cache_module.current_generation() == 1
+    fake_generation['generation'] = 2
+    assert cache_module.current_generation() == 1
+    assert fake_generation['reads'] == 1
@@ -0,0 +1,77 @@
+# tests/test_watermark.py
+import pytest
+
+import config
+from crawlers.watermark import IncrementalStopPolicy, is_full_sweep_due
+
+
+def is_known(item, known_ids):
+    return item in known_ids
+
+
+def make_policy(stop_after_pages=2, incremental=True):
+    return IncrementalStopPolicy({'a', 'b', 'c', 'd'}, is_known, stop_after_pages, incremental=incremental)
+
+
+# --- IncrementalStopPolicy ---
+
+def test_stops_after_consecutive_known_pages():
+    policy = make_policy(stop_after_pages=2)
+    assert policy(1, ['new', 'a']) is False
+    assert policy(2, ['a', 'b']) is False
+    assert policy(3, ['c', 'd']) is True
+    assert policy.stopped_at_page == 3
+    assert policy.pages_seen == 3
+
+
+def test_streak_resets_on_page_with_unknown_item():
+    policy = make_policy(stop_after_pages=2)
+    assert policy(1, ['a']) is False
+    assert policy(2, ['b', 'new']) is False
+    assert policy.known_streak == 0
+    assert policy(3, ['c']) is False
+    assert policy(4, ['d']) is True
+    assert policy.stopped_at_page == 4
+
+
+def test_full_sweep_never_stops_but_keeps_stats():
+    policy = make_policy(stop_after_pages=1, incremental=False)
+    for page in range(1, 5):
+        assert policy(page, ['a']) is False
+    assert policy.known_streak == 4
+    assert policy.pages_seen == 4
+    assert policy.stopped_at_page is None
+
+
+def test_stop_after_one_page():
+    policy = make_policy(stop_after_pages=1)
+    assert policy(1, ['a', 'b']) is True
+    assert policy.stopped_at_page == 1
+
+
+# --- is_full_sweep_due ---
+
+@pytest.fixture
+def incremental_config(monkeypatch):
+    monkeypatch.setattr(config, 'CRAWLER_INCREMENTAL', True)
+    monkeypatch.setattr(config, 'CRAWLER_FORCE_FULL_SWEEP', False)
+
+
+def test_full_sweep_due_without_watermark(incremental_config):
+    assert is_full_sweep_due(None) is True
+    assert is_full_sweep_due({'last_full_sweep_at': None, 'full_sweep_overdue': None}) is True
+
+
+def test_full_sweep_due_follows_sql_overdue_flag(incremental_config):
+    assert is_full_sweep_due({'last_full_sweep_at': 'ts', 'full_sweep_overdue': True}) is True
+    assert is_full_sweep_due({'last_full_sweep_at': 'ts', 'full_sweep_overdue': False}) is False
+
+
+def test_full_sweep_forced_by_config(monkeypatch):
+    monkeypatch.setattr(config, 'CRAWLER_INCREMENTAL', True)
+    monkeypatch.setattr(config, 'CRAWLER_FORCE_FULL_SWEEP', True)
+    assert is_full_sweep_due({'last_full_sweep_at': 'ts', 'full_sweep_overdue': False}) is True
+
+    monkeypatch.setattr(config, 'CRAWLER_INCREMENTAL', False)
+    monkeypatch.setattr(config, 'CRAWLER_FORCE_FULL_SWEEP', False)
+    assert is_full_sweep_due({'last_full_sweep_at': 'ts', 'full_sweep_overdue': False}) is True
@@ -0,0 +1,40 @@
+# tests/test_work_queue.py
+import pytest
+
+from crawlers.work_queue import split_page_range
+
+
+def test_splits_into_equal_units():
+    assert split_page_range('finished', 1, 6, 2) == [('finished', 1, 2), ('finished', 3, 4), ('finished', 5, 6)]
+
+
+def test_last_unit_is_truncated_at_last_page():
+    assert split_page_range('finished', 1, 7, 3) == [('finished', 1, 3), ('finished', 4, 6), ('finished', 7, 7)]
+
+
+def test_single_page_range():
+    assert split_page_range('finished', 5, 5, 10) == [('finished', 5, 5)]
+
+
+def test_unit_larger_than_range():
+    assert split_page_range('finished', 1, 3, 10) == [('finished', 1, 3)]
+
+
+def test_range_not_starting_at_first_page():
+    assert split_page_range('finished', 11, 15, 2) == [('finished', 11, 12), ('finished', 13, 14), ('finished', 15, 15)]
+
+
+@pytest.mark.parametrize('unit_pages', [0, -3])
+def test_non_positive_unit_size_falls_back_to_one_page(unit_pages):
+    assert split_page_range('finished', 1, 3, unit_pages) == [('finished', 1, 1), ('finished', 2, 2), ('finished', 3, 3)]
+
+
+def test_empty_range():
+    assert split_page_range('finished', 4, 3, 2) == []
+
+
+@pytest.mark.parametrize('first, last, unit', [(1, 100, 7), (3, 50, 5), (1, 1, 1)])
+def test_units_cover_range_exactly_once(first, last, unit):
+    units = split_page_range('finished', first, last, unit)
+    pages = [page for _, start, end in units for page in range(start, end + 1)]
+    assert pages == list(range(first, last + 1))
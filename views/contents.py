@@ -1,25 +1,69 @@
 # views/contents.py
 
-from flask import Blueprint, jsonify, request
-from database import get_db, get_cursor
-import math
-import json
+from flask import Blueprint, current_app, jsonify, request
+import config
+from database import get_read_db, get_cursor
+from services.catalog import (
+    PAGED_STATUSES, build_ongoing_payload, build_status_page_payload, encode_payload,
+    load_catalog_snapshot_body, load_catalog_snapshot_etag, payload_etag, process_row, snapshot_key,
+)
+from services.response_cache import cached_response
+from datetime import datetime, timezone
 
 contents_bp = Blueprint('contents', __name__)
 
-def process_row(row):
+def _accepted_encodings():
+    """Accept-Encoding에서 스냅샷으로 보낼 수 있는 압축 방식 (선호 순: br, gzip)"""
+    return [encoding for encoding in ('br', 'gzip') if request.accept_encodings[encoding]]
+
+def _response_etag(etag, encoding=None):
+    """응답 ETag 값. 압축 방식마다 본문이 다르므로 ETag도 다름"""
+    return f"{etag}-{encoding}" if encoding else etag
+
+def _catalog_response(body, etag, encoding=None):
     """
-    DB에서 읽어온 row를 처리합니다.
-    meta 필드가 None이면 빈 dict로 보장합니다.
+    목록 응답. 스냅샷과 실시간 조회가 같은 헤더를 쓰므로 같은 데이터면 같은 본문/ETag가 나옵니다.
+    ETag는 본문 sha256의 strong ETag이고 압축 방식마다 다르며, If-None-Match가 같으면 304를 반환합니다.
     """
-    row_dict = dict(row)
-    if row_dict.get('meta') is None:
-        row_dict['meta'] = {}
-
-    # psycopg2가 JSONB를 dict로 자동 변환하므로,
-    # isinstance(..., str) 및 json.loads()가 더 이상 필요하지 않습니다.
+    response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(_response_etag(etag, encoding))
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    # 캐시해 두되 매번 ETag로 재검증 (세대가 바뀌면 ETag도 바뀜)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+def _payload_response(payload):
+    """실시간으로 조회한 payload를 스냅샷과 같은 인코더로 직렬화해 응답합니다."""
+    body = encode_payload(payload)
+    return _catalog_response(body, payload_etag(body))
+
+def _snapshot_response(key):
+    """
+    크롤러가 게시한 스냅샷이 있으면 저장된 바이트를 그대로 응답합니다. (없으면 None -> 실시간 조회)
+    ETag를 먼저 읽어 If-None-Match와 같으면 본문을 읽지 않고 304를 반환합니다.
+    """
+    if not config.CATALOG_SNAPSHOTS_ENABLED:
+        return None
+    cursor = get_cursor(get_read_db())
+    snapshot = load_catalog_snapshot_etag(cursor, key, _accepted_encodings())
+    if snapshot is None:
+        cursor.close()
+        return None
+
+    etag, encoding = snapshot
+    if request.if_none_match.contains(_response_etag(etag, encoding)):
+        body = b''
+    else:
+        body = load_catalog_snapshot_body(cursor, key, etag, encoding)
+    cursor.close()
+    if body is None:
+        return None
 
-    return row_dict
+    response = _catalog_response(body, etag, encoding)
+    response.headers['X-Snapshot'] = key
+    return response
 
 @contents_bp.route('/api/contents/search', methods=['GET'])
 def search_contents():
@@ -30,7 +74,7 @@ def search_contents():
     if not query:
         return jsonify([])
 
-    conn = get_db()
+    conn = get_read_db()
     cursor = get_cursor(conn)
 
     cursor.execute(
@@ -48,102 +92,119 @@ def search_contents():
     cursor.close()
     return jsonify(results)
 
-
 @contents_bp.route('/api/contents/ongoing', methods=['GET'])
+@cached_response('ongoing')
 def get_ongoing_contents():
     """요일별 연재중인 콘텐츠 목록을 그룹화하여 반환합니다."""
     content_type = request.args.get('type', 'webtoon')
 
-    conn = get_db()
-    cursor = get_cursor(conn)
-
-    cursor.execute(
-        "SELECT content_id, title, status, meta, source FROM contents WHERE content_type = %s AND (status = '연재중' OR status = '휴재')",
-        (content_type,)
-    )
+    snapshot = _snapshot_response(snapshot_key('ongoing', content_type))
+    if snapshot is not None:
+        return snapshot
 
-    all_contents = [process_row(row) for row in cursor.fetchall()]
+    conn = get_read_db()
+    cursor = get_cursor(conn)
+    payload = build_ongoing_payload(cursor, content_type)
     cursor.close()
+    return _payload_response(payload)
 
-    # 콘텐츠 타입에 따라 분기
-    if content_type == 'webtoon':
-        # 웹툰인 경우, 요일별로 그룹화
-        grouped_by_day = { 'mon': [], 'tue': [], 'wed': [], 'thu': [], 'fri': [], 'sat': [], 'sun': [], 'daily': [] }
-        for content in all_contents:
-            # 변경된 meta 구조에 맞게 'attributes'에서 'weekdays'를 가져옴
-            day_list = content.get('meta', {}).get('attributes', {}).get('weekdays', [])
-            for day_eng in day_list:
-                if day_eng in grouped_by_day:
-                    grouped_by_day[day_eng].append(content)
-        return jsonify(grouped_by_day)
-    else:
-        # 다른 콘텐츠 타입의 경우, 그룹화하지 않고 목록 그대로 반환 (향후 확장 가능)
-        return jsonify(all_contents)
-
-@contents_bp.route('/api/contents/hiatus', methods=['GET'])
-def get_hiatus_contents():
-    """[페이지네이션] 휴재중인 콘텐츠 전체 목록을 페이지별로 반환합니다."""
+def _status_page(endpoint):
+    """[페이지네이션] 휴재/완결 목록의 한 페이지 (스냅샷이 없으면 실시간 조회)"""
     last_title = request.args.get('last_title')
-    per_page = 100
     content_type = request.args.get('type', 'webtoon')
 
-    conn = get_db()
-    cursor = get_cursor(conn)
-
-    query_params = [content_type]
-    where_clause = "WHERE status = '휴재' AND content_type = %s"
-
-    if last_title:
-        where_clause += " AND title > %s"
-        query_params.append(last_title)
+    snapshot = _snapshot_response(snapshot_key(endpoint, content_type, last_title=last_title))
+    if snapshot is not None:
+        return snapshot
 
-    cursor.execute(
-        f"SELECT content_id, title, status, meta, source FROM contents {where_clause} ORDER BY title ASC LIMIT %s",
-        (*query_params, per_page)
-    )
-
-    results = [process_row(row) for row in cursor.fetchall()]
+    conn = get_read_db()
+    cursor = get_cursor(conn)
+    payload = build_status_page_payload(cursor, PAGED_STATUSES[endpoint], content_type, last_title)
     cursor.close()
+    return _payload_response(payload)
 
-    next_cursor = None
-    if len(results) == per_page:
-        next_cursor = results[-1]['title']
-
-    return jsonify({
-        'contents': results,
-        'next_cursor': next_cursor
-    })
+@contents_bp.route('/api/contents/hiatus', methods=['GET'])
+@cached_response('hiatus')
+def get_hiatus_contents():
+    """[페이지네이션] 휴재중인 콘텐츠 전체 목록을 페이지별로 반환합니다."""
+    return _status_page('hiatus')
 
 @contents_bp.route('/api/contents/completed', methods=['GET'])
+@cached_response('completed')
 def get_completed_contents():
     """[페이지네이션] 완결된 콘텐츠 전체 목록을 페이지별로 반환합니다."""
-    last_title = request.args.get('last_title')
-    per_page = 100
-    content_type = request.args.get('type', 'webtoon')
+    return _status_page('completed')
 
-    conn = get_db()
+def _parse_since(value):
+    """
+    ISO 8601 시각을 UTC 기준 aware datetime으로 바꿉니다. (형식이 틀리면 ValueError)
+    Python 3.10의 fromisoformat은 'Z'를 받지 않으므로 '+00:00'으로 바꾸고, 시간대가 없으면 UTC로 봅니다.
+    """
+    if value[-1:] in ('Z', 'z'):
+        value = value[:-1] + '+00:00'
+    since_at = datetime.fromisoformat(value)
+    if since_at.tzinfo is None:
+        since_at = since_at.replace(tzinfo=timezone.utc)
+    return since_at
+
+@contents_bp.route('/api/contents/changes', methods=['GET'])
+def get_content_changes():
+    """
+    [페이지네이션] since 이후의 작품 상태 변화(content_status_history)를 오래된 순으로 반환합니다.
+    클라이언트는 전체 목록 대신 변화분만 받아 로컬 상태를 갱신할 수 있습니다.
+    - since: ISO 8601 시각 (필수). 예: 2024-05-01T00:00:00Z, 2024-05-01T09:00:00+09:00
+      시간대를 생략하면 UTC로 해석합니다. 응답의 changed_at도 시간대를 포함하므로 그대로 since로 쓸 수 있습니다.
+    - last_id: 이전 페이지의 next_cursor
+    - source, transition: 선택 필터 (transition: new | hiatus | resumed | completed | unfinished)
+    """
+    since = request.args.get('since', '').strip()
+    last_id = request.args.get('last_id', type=int)
+    source = request.args.get('source')
+    transition = request.args.get('transition')
+    per_page = 500
+
+    try:
+        since_at = _parse_since(since)
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'since는 ISO 8601 형식의 시각이어야 합니다. (예: 2024-05-01T00:00:00Z)'}), 400
+
+    conn = get_read_db()
     cursor = get_cursor(conn)
 
-    query_params = [content_type]
-    where_clause = "WHERE status = '완결' AND content_type = %s"
-
-    if last_title:
-        where_clause += " AND title > %s"
-        query_params.append(last_title)
+    query_params = [since_at]
+    # changed_at 조건으로 since 이전 달의 파티션은 조회하지 않음
+    where_clause = "WHERE changed_at >= %s"
+    if last_id is not None:
+        where_clause += " AND id > %s"
+        query_params.append(last_id)
+    if source:
+        where_clause += " AND source = %s"
+        query_params.append(source)
+    if transition:
+        where_clause += " AND transition = %s"
+        query_params.append(transition)
 
     cursor.execute(
-        f"SELECT content_id, title, status, meta, source FROM contents {where_clause} ORDER BY title ASC LIMIT %s",
+        f"""
+        SELECT id, crawl_run_id, source, content_id, title, transition, old_status, new_status,
+               changed_at::timestamptz AS changed_at
+        FROM content_status_history {where_clause}
+        ORDER BY id ASC LIMIT %s
+        """,
         (*query_params, per_page)
     )
 
-    results = [process_row(row) for row in cursor.fetchall()]
+    results = [dict(row) for row in cursor.fetchall()]
     cursor.close()
+    for row in results:
+        # UTC 'Z' 형식 (쿼리 문자열에서 '+'가 공백으로 바뀌지 않도록)
+        row['changed_at'] = row['changed_at'].astimezone(timezone.utc).isoformat().replace('+00:00', 'Z')
 
     next_cursor = None
     if len(results) == per_page:
-        next_cursor = results[-1]['title']
+        next_cursor = results[-1]['id']
 
     return jsonify({
-        'contents': results,
+        'changes': results,
         'next_cursor': next_cursor
     })
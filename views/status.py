@@ -1,7 +1,8 @@
 # views/status.py
 
 from flask import Blueprint, jsonify
-from database import get_db, get_cursor
+from database import get_read_db, get_cursor, pool_stats
+from services.response_cache import cache_stats
 
 status_bp = Blueprint('status', __name__)
 
@@ -11,7 +12,7 @@ def get_status():
     Returns the current status of the application and database.
     """
     try:
-        conn = get_db()
+        conn = get_read_db()
         cursor = get_cursor(conn)
         cursor.execute("SELECT COUNT(*) as count FROM contents")
         content_count = cursor.fetchone()['count']
@@ -19,7 +20,11 @@ def get_status():
 
         return jsonify({
             'status': 'ok',
-            'content_count': content_count
+            'content_count': content_count,
+            # 이 워커 프로세스의 DB 연결 풀 통계 (풀 미사용 시 null)
+            'db_pool': pool_stats(),
+            # 이 워커 프로세스의 /api/contents 응답 캐시 적중률/메모리 (캐시 미사용 시 null)
+            'response_cache': cache_stats()
         })
     except Exception as e:
         return jsonify({
@@ -3,7 +3,7 @@
 import re
 import psycopg2
 from flask import Blueprint, jsonify, request
-from database import get_db, get_cursor
+from database import get_db, get_cursor, mark_write
 
 subscriptions_bp = Blueprint('subscriptions', __name__)
 
@@ -45,6 +45,8 @@ def subscribe():
         )
         conn.commit()
         cursor.close()
+        # 복제 지연 동안에도 이 클라이언트의 다음 조회가 방금 쓴 구독을 볼 수 있도록 primary로 읽게 함
+        mark_write()
         return jsonify({'status': 'success', 'message': f'ID {content_id} ({source}) 구독 완료!'})
     except psycopg2.Error as e:
         conn.rollback()  # 오류 발생 시 롤백 추가